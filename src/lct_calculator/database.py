@@ -1,12 +1,337 @@
+import ast
+import hashlib
+import json
+import os
+import re
 import sqlite3
+import threading
+import unicodedata
 import logging
+from datetime import datetime
 from pathlib import Path
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple, Union
+
+import numpy as np
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 
+# Diretório de dados gravável (fora do pacote, para funcionar em instalações somente leitura)
+VARIAVEL_DIRETORIO_DADOS = "LCT_CALCULATOR_DATA_DIR"
+
+
+def diretorio_dados_padrao() -> Path:
+    """Retorna o diretório de dados: $LCT_CALCULATOR_DATA_DIR ou ~/.lct_calculator."""
+    return Path(os.environ.get(VARIAVEL_DIRETORIO_DADOS, Path.home() / ".lct_calculator"))
+
+
 # Definindo o caminho do banco de dados
-DATABASE_PATH = Path(__file__).parent / "lct_calculator.db"
+DATABASE_PATH = diretorio_dados_padrao() / "lct_calculator.db"
+
+# Chaves dos relatórios dos calculadores usadas para preencher as colunas numéricas
+# da tabela fundacoes (as variações de grafia existem entre os calculadores).
+CHAVES_VOLUME_CONCRETO = ("Volume de Concreto (m³)", "Volume de concreto (m³)")
+CHAVES_RUPTURA_SOLO = ("Ruptura do Solo",)
+CHAVES_QUANTIDADE_BARRAS = (
+    "Armadura - Quantidade de Barras",
+    "Armadura Longitudinal - Quantidade de Barras",
+    "Número de barras de aço",
+)
+CHAVES_DIAMETRO_BARRAS = (
+    "Armadura - Diâmetro das Barras (mm)",
+    "Armadura Longitudinal - Diâmetro das Barras (mm)",
+)
+
+# Colunas numéricas derivadas do resultado, na ordem em que são gravadas
+COLUNAS_METRICAS = ("fck", "volume_concreto", "ruptura_solo", "quantidade_barras", "diametro_barras")
+
+# Todas as colunas da tabela fundacoes, aceitas em iterar_calculos
+COLUNAS_FUNDACOES = ("id", "tipo", "dados_entrada", "resultado", "data_calculo") + COLUNAS_METRICAS + ("hash_resultado",)
+
+# Colunas padrão dos relatórios de cálculos
+COLUNAS_CALCULOS = ("id", "tipo", "dados_entrada", "resultado", "data_calculo")
+
+# Colunas aceitas como agrupamento em agregar_calculos
+COLUNAS_AGRUPAVEIS = ("tipo", "fck", "diametro_barras", "ruptura_solo")
+
+# Colunas do arquivo colunar e seus dtypes NumPy. Nulos viram NaN/NaT; em ruptura_solo, -1.
+# "tipo" é gravado como código inteiro, com as categorias listadas no manifesto.
+COLUNAS_ARQUIVO = {
+    "id": "int64",
+    "tipo": "int32",
+    "data_calculo": "datetime64[s]",
+    "fck": "float64",
+    "volume_concreto": "float64",
+    "ruptura_solo": "int8",
+    "quantidade_barras": "float64",
+    "diametro_barras": "float64",
+}
+NOME_MANIFESTO = "manifest.json"
+
+VERSAO_ARQUIVO = 1
+
+
+def para_dict(valor: Union[str, Dict[str, Any], None]) -> Dict[str, Any]:
+    """Interpreta dados gravados como texto (JSON ou repr de dicionário) como dicionário."""
+    if isinstance(valor, dict):
+        return valor
+    if not valor:
+        return {}
+    for interpretar in (json.loads, ast.literal_eval):
+        try:
+            dados = interpretar(valor)
+        except (ValueError, SyntaxError):
+            continue
+        if isinstance(dados, dict):
+            return dados
+    return {}
+
+
+def primeiro_valor(dados: Dict[str, Any], chaves: Sequence[str]) -> Optional[float]:
+    """Retorna o primeiro valor numérico encontrado entre as chaves informadas."""
+    for chave in chaves:
+        valor = dados.get(chave)
+        if isinstance(valor, (int, float)):
+            return float(valor)
+    return None
+
+
+def extrair_metricas(dados_entrada: Union[str, Dict[str, Any]], resultado: Union[str, Dict[str, Any]]) -> Tuple:
+    """
+    Extrai as métricas numéricas de um cálculo para as colunas agregáveis da tabela fundacoes.
+
+    :param dados_entrada: Dados de entrada do cálculo (dicionário ou texto).
+    :param resultado: Relatório gerado pelo calculador (dicionário ou texto).
+    :return: Tupla na ordem de COLUNAS_METRICAS.
+    """
+    entrada = para_dict(dados_entrada)
+    relatorio = para_dict(resultado)
+    fck = entrada.get("fck")
+    ruptura = relatorio.get(CHAVES_RUPTURA_SOLO[0])
+    return (
+        float(fck) if isinstance(fck, (int, float)) else None,
+        primeiro_valor(relatorio, CHAVES_VOLUME_CONCRETO),
+        int(ruptura) if isinstance(ruptura, bool) else None,
+        primeiro_valor(relatorio, CHAVES_QUANTIDADE_BARRAS),
+        primeiro_valor(relatorio, CHAVES_DIAMETRO_BARRAS),
+    )
+
+
+class ArquivoColunar:
+    """
+    Arquivo colunar de resultados aberto em modo somente leitura.
+    Cada coluna é um np.memmap sobre o respectivo .npy, sem cópia para a memória.
+    """
+
+    def __init__(self, diretorio: Union[str, Path]):
+        """
+        Abre um arquivo colunar exportado por DatabaseService.exportar_colunar.
+        :param diretorio: Diretório contendo o manifesto e os arquivos .npy.
+        """
+        self.diretorio = Path(diretorio)
+        with open(self.diretorio / NOME_MANIFESTO, encoding="utf-8") as arquivo:
+            self.manifesto = json.load(arquivo)
+        if self.manifesto.get("versao") != VERSAO_ARQUIVO:
+            raise ValueError(f"Versão de arquivo colunar não suportada: {self.manifesto.get('versao')}")
+        self.categorias_tipo: List[str] = self.manifesto["categorias"]["tipo"]
+        self.colunas: Dict[str, np.ndarray] = {
+            nome: np.load(self.diretorio / info["arquivo"], mmap_mode="r")
+            for nome, info in self.manifesto["colunas"].items()
+        }
+
+    def __len__(self) -> int:
+        return self.manifesto["linhas"]
+
+    def __getitem__(self, coluna: str) -> np.ndarray:
+        return self.colunas[coluna]
+
+    def tipos(self) -> np.ndarray:
+        """Decodifica a coluna tipo para um array de textos (materializa a coluna)."""
+        return np.asarray(self.categorias_tipo, dtype=object)[self.colunas["tipo"]]
+
+
+# Tabelas copiadas incrementalmente nos snapshots de leitura: linhas novas pelo id crescente;
+# alterações e remoções pelo registro em alteracoes_linhas, mantido por gatilhos
+TABELAS_INCREMENTAIS = ("fundacoes", "relatorios")
+
+
+class SnapshotLeitura:
+    """
+    Cópia somente leitura do banco de dados em memória, para filtros e ordenações interativos
+    que não disputam bloqueios com gravações em lote nem acessam o disco.
+
+    A carga inicial usa a API de backup do SQLite; atualizar() traz, das tabelas em
+    TABELAS_INCREMENTAIS, as linhas novas (id > último id visto) e as linhas alteradas ou
+    removidas desde a última carga (registradas em alteracoes_linhas por DatabaseService).
+    """
+
+    def __init__(self, db_path):
+        """
+        Cria o snapshot e carrega o banco de dados em memória.
+        :param db_path: Caminho do banco de dados em disco.
+        """
+        self.db_path = db_path
+        self.conn = sqlite3.connect(":memory:", check_same_thread=False)
+        self.ultimos_ids: Dict[str, int] = {}
+        self.ultima_alteracao = 0
+        self._trava = threading.Lock()
+        self.recarregar()
+
+    def recarregar(self):
+        """Recarrega o banco inteiro para a memória (API de backup)"""
+        with self._trava:
+            disco = sqlite3.connect(self.db_path)
+            try:
+                self.conn.execute("PRAGMA query_only = 0")
+                disco.backup(self.conn)
+                self.ultimos_ids = {
+                    tabela: self.conn.execute(f"SELECT COALESCE(MAX(id), 0) FROM {tabela}").fetchone()[0]
+                    for tabela in TABELAS_INCREMENTAIS
+                }
+                self.ultima_alteracao = self.conn.execute(
+                    "SELECT COALESCE(MAX(seq), 0) FROM alteracoes_linhas"
+                ).fetchone()[0]
+            finally:
+                self.conn.execute("PRAGMA query_only = 1")
+                disco.close()
+        logging.info(f"Snapshot de leitura carregado de {self.db_path}.")
+
+    def atualizar(self, tamanho_bloco: int = 10000) -> int:
+        """
+        Copia para a memória as linhas inseridas, alteradas ou removidas no disco desde a última
+        carga. As linhas alteradas são removidas e reinseridas na cópia, de modo que os gatilhos
+        de resumo também rodam nela e mantêm os resumos coerentes.
+        :param tamanho_bloco: Quantidade de linhas lidas do disco por vez.
+        :return: Quantidade de linhas copiadas ou removidas.
+        """
+        copiadas = 0
+        with self._trava:
+            disco = sqlite3.connect(self.db_path, isolation_level=None)
+            try:
+                # Uma única transação de leitura: registro de alterações e linhas do mesmo estado
+                disco.execute("BEGIN")
+                self.conn.execute("PRAGMA query_only = 0")
+                with self.conn:
+                    alteracoes = disco.execute(
+                        "SELECT tabela, linha_id, seq FROM alteracoes_linhas WHERE seq > ? ORDER BY seq",
+                        (self.ultima_alteracao,),
+                    ).fetchall()
+                    for tabela in TABELAS_INCREMENTAIS:
+                        ids = [linha_id for nome, linha_id, _ in alteracoes
+                               if nome == tabela and linha_id <= self.ultimos_ids[tabela]]
+                        for inicio in range(0, len(ids), tamanho_bloco):
+                            copiadas += self._recopiar(disco, tabela, ids[inicio:inicio + tamanho_bloco])
+                    if alteracoes:
+                        self.ultima_alteracao = alteracoes[-1][2]
+
+                    for tabela in TABELAS_INCREMENTAIS:
+                        cursor = disco.execute(
+                            f"SELECT * FROM {tabela} WHERE id > ? ORDER BY id", (self.ultimos_ids[tabela],)
+                        )
+                        marcadores = ", ".join("?" for _ in cursor.description)
+                        while True:
+                            linhas = cursor.fetchmany(tamanho_bloco)
+                            if not linhas:
+                                break
+                            self.conn.executemany(f"INSERT INTO {tabela} VALUES ({marcadores})", linhas)
+                            self.ultimos_ids[tabela] = linhas[-1][0]
+                            copiadas += len(linhas)
+            finally:
+                self.conn.execute("PRAGMA query_only = 1")
+                disco.close()
+        return copiadas
+
+    def _recopiar(self, disco: sqlite3.Connection, tabela: str, ids: Sequence[int]) -> int:
+        """Substitui na cópia em memória as linhas indicadas pela versão atual do disco (ou as remove)"""
+        marcadores_ids = ", ".join("?" for _ in ids)
+        self.conn.execute(f"DELETE FROM {tabela} WHERE id IN ({marcadores_ids})", ids)
+        cursor = disco.execute(f"SELECT * FROM {tabela} WHERE id IN ({marcadores_ids})", ids)
+        marcadores = ", ".join("?" for _ in cursor.description)
+        self.conn.executemany(f"INSERT INTO {tabela} VALUES ({marcadores})", cursor)
+        return len(ids)
+
+    def consultar(self, sql: str, parametros: Sequence[Any] = ()) -> List[Tuple]:
+        """Executa uma consulta de leitura na cópia em memória"""
+        with self._trava:
+            return self.conn.execute(sql, parametros).fetchall()
+
+    def close(self):
+        """Descarta a cópia em memória"""
+        self.conn.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+
+def calcular_hash_resultado(tipo: str, dados_entrada: Union[str, Dict[str, Any]],
+                            resultado: Union[str, Dict[str, Any]]) -> str:
+    """
+    Calcula o hash de conteúdo de um cálculo (SHA-256 do JSON canônico de tipo, entrada e resultado).
+    Dicionários e seus equivalentes em texto produzem o mesmo hash.
+    """
+    canonico = json.dumps(
+        [tipo, para_dict(dados_entrada) or dados_entrada, para_dict(resultado) or resultado],
+        sort_keys=True, ensure_ascii=False, default=str,
+    )
+    return hashlib.sha256(canonico.encode("utf-8")).hexdigest()
+
+
+def _serializar(valor: Union[str, Dict[str, Any]]) -> str:
+    """Serializa dicionários em JSON; textos são gravados como recebidos."""
+    if isinstance(valor, str):
+        return valor
+    return json.dumps(valor, ensure_ascii=False)
+
+
+def garantir_esquema_sincronizacao(cursor):
+    """
+    Prepara as tabelas de sincronização BIM: sincronizacao_bim é o histórico (somente inserções)
+    e sincronizacao_bim_atual guarda o status corrente, com uma linha por fundação. Também garante
+    as colunas de hash usadas na sincronização delta. Nenhuma linha existente é removida: a
+    migração só cria tabelas, colunas e índices e copia o último status de cada fundação.
+    """
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sincronizacao_bim (
+            id INTEGER PRIMARY KEY AUTOINCREMENT,
+            fundacao_id INTEGER,
+            status TEXT NOT NULL,
+            sincronizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+            hash_sincronizado TEXT,
+            FOREIGN KEY(fundacao_id) REFERENCES fundacoes(id)
+        )
+    """)
+    colunas_fundacoes = {linha[1] for linha in cursor.execute("PRAGMA table_info(fundacoes)")}
+    if "hash_resultado" not in colunas_fundacoes:
+        cursor.execute("ALTER TABLE fundacoes ADD COLUMN hash_resultado TEXT")
+    colunas_sincronizacao = {linha[1] for linha in cursor.execute("PRAGMA table_info(sincronizacao_bim)")}
+    if "hash_sincronizado" not in colunas_sincronizacao:
+        cursor.execute("ALTER TABLE sincronizacao_bim ADD COLUMN hash_sincronizado TEXT")
+
+    cursor.execute("""
+        CREATE TABLE IF NOT EXISTS sincronizacao_bim_atual (
+            fundacao_id INTEGER PRIMARY KEY,
+            status TEXT NOT NULL,
+            sincronizado_em TIMESTAMP,
+            hash_sincronizado TEXT,
+            FOREIGN KEY(fundacao_id) REFERENCES fundacoes(id)
+        )
+    """)
+    cursor.execute(
+        "CREATE INDEX IF NOT EXISTS idx_sincronizacao_bim_historico ON sincronizacao_bim(fundacao_id, id)"
+    )
+
+    # Bancos anteriores à tabela de status corrente: popula a partir do histórico uma única vez
+    atual_vazia = cursor.execute("SELECT 1 FROM sincronizacao_bim_atual LIMIT 1").fetchone() is None
+    if atual_vazia and cursor.execute("SELECT 1 FROM sincronizacao_bim LIMIT 1").fetchone():
+        cursor.execute("""
+            INSERT INTO sincronizacao_bim_atual (fundacao_id, status, sincronizado_em, hash_sincronizado)
+            SELECT fundacao_id, status, sincronizado_em, hash_sincronizado FROM sincronizacao_bim
+            WHERE id IN (SELECT MAX(id) FROM sincronizacao_bim WHERE fundacao_id IS NOT NULL GROUP BY fundacao_id)
+        """)
+
 
 class DatabaseService:
     def __init__(self, db_path=DATABASE_PATH):
@@ -18,6 +343,8 @@ class DatabaseService:
     def connect(self):
         """Estabelece conexão com o banco de dados SQLite"""
         try:
+            if str(self.db_path) != ":memory:":
+                Path(self.db_path).parent.mkdir(parents=True, exist_ok=True)
             self.conn = sqlite3.connect(self.db_path)
             self.cursor = self.conn.cursor()
             logging.info("Conexão com o banco de dados SQLite estabelecida.")
@@ -35,7 +362,13 @@ class DatabaseService:
                     tipo TEXT NOT NULL,
                     dados_entrada TEXT NOT NULL,
                     resultado TEXT NOT NULL,
-                    data_calculo TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                    data_calculo TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    fck REAL,
+                    volume_concreto REAL,
+                    ruptura_solo INTEGER,
+                    quantidade_barras REAL,
+                    diametro_barras REAL,
+                    hash_resultado TEXT
                 );
             """)
             self.cursor.execute("""
@@ -48,14 +381,27 @@ class DatabaseService:
                 );
             """)
             self.cursor.execute("""
-                CREATE TABLE IF NOT EXISTS sincronizacao_bim (
+                CREATE TABLE IF NOT EXISTS outbox_bim (
                     id INTEGER PRIMARY KEY AUTOINCREMENT,
-                    fundacao_id INTEGER,
-                    status TEXT NOT NULL,
-                    sincronizado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                    fundacao_id INTEGER NOT NULL,
+                    payload TEXT NOT NULL,
+                    status TEXT NOT NULL DEFAULT 'pendente',
+                    tentativas INTEGER NOT NULL DEFAULT 0,
+                    proxima_tentativa REAL NOT NULL DEFAULT 0,
+                    ultimo_erro TEXT,
+                    criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
                     FOREIGN KEY(fundacao_id) REFERENCES fundacoes(id)
                 );
             """)
+            self.cursor.execute(
+                "CREATE INDEX IF NOT EXISTS idx_outbox_bim_pendente ON outbox_bim(status, proxima_tentativa)"
+            )
+            self._verificar_esquema_fundacoes()
+            self._migrar_colunas_metricas()
+            self._migrar_hash_resultado()
+            garantir_esquema_sincronizacao(self.cursor)
+            self._criar_resumos()
+            self._criar_registro_alteracoes()
             self.conn.commit()
             logging.info("Tabelas criadas com sucesso.")
         except sqlite3.Error as e:
@@ -64,22 +410,334 @@ class DatabaseService:
         finally:
             self.close()
 
-    def salvar_calculo(self, tipo, dados_entrada, resultado):
-        """Insere um novo cálculo de fundação no banco de dados"""
+    def _verificar_esquema_fundacoes(self):
+        """Recusa bancos com a tabela fundacoes do esquema antigo de sqlite_service (base, altura, esforco...)"""
+        existentes = {linha[1] for linha in self.cursor.execute("PRAGMA table_info(fundacoes)")}
+        if "dados_entrada" not in existentes:
+            raise sqlite3.DatabaseError(
+                f"A tabela fundacoes de {self.db_path} usa um esquema incompatível (sem dados_entrada); "
+                "mova ou renomeie o arquivo para que o banco seja recriado."
+            )
+
+    def _migrar_colunas_metricas(self):
+        """Adiciona as colunas de métricas a bancos criados antes delas e preenche as linhas existentes"""
+        existentes = {linha[1] for linha in self.cursor.execute("PRAGMA table_info(fundacoes)")}
+        faltantes = [coluna for coluna in COLUNAS_METRICAS if coluna not in existentes]
+        if not faltantes:
+            return
+        for coluna in faltantes:
+            tipo_sql = "INTEGER" if coluna == "ruptura_solo" else "REAL"
+            self.cursor.execute(f"ALTER TABLE fundacoes ADD COLUMN {coluna} {tipo_sql}")
+        linhas = self.cursor.execute("SELECT id, dados_entrada, resultado FROM fundacoes").fetchall()
+        self.cursor.executemany(
+            f"UPDATE fundacoes SET {', '.join(f'{c} = ?' for c in COLUNAS_METRICAS)} WHERE id = ?",
+            (extrair_metricas(entrada, resultado) + (id_,) for id_, entrada, resultado in linhas),
+        )
+        logging.info(f"Colunas de métricas adicionadas à tabela fundacoes ({len(linhas)} linhas preenchidas).")
+
+    def _migrar_hash_resultado(self):
+        """Adiciona e preenche a coluna hash_resultado em bancos criados antes dela"""
+        existentes = {linha[1] for linha in self.cursor.execute("PRAGMA table_info(fundacoes)")}
+        if "hash_resultado" in existentes:
+            return
+        self.cursor.execute("ALTER TABLE fundacoes ADD COLUMN hash_resultado TEXT")
+        linhas = self.cursor.execute("SELECT id, tipo, dados_entrada, resultado FROM fundacoes").fetchall()
+        self.cursor.executemany(
+            "UPDATE fundacoes SET hash_resultado = ? WHERE id = ?",
+            ((calcular_hash_resultado(tipo, entrada, resultado), id_) for id_, tipo, entrada, resultado in linhas),
+        )
+
+    def _criar_resumos(self):
+        """
+        Cria as tabelas de resumo (uma linha por grupo) e os gatilhos que as mantêm atualizadas
+        a cada inserção, alteração ou remoção em fundacoes.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resumo_tipo (
+                tipo TEXT PRIMARY KEY,
+                quantidade INTEGER NOT NULL DEFAULT 0,
+                volume_concreto REAL NOT NULL DEFAULT 0,
+                rupturas INTEGER NOT NULL DEFAULT 0
+            );
+        """)
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS resumo_armadura (
+                diametro_barras REAL PRIMARY KEY,
+                elementos INTEGER NOT NULL DEFAULT 0,
+                quantidade_barras REAL NOT NULL DEFAULT 0
+            );
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_fundacoes_tipo ON fundacoes(tipo)")
+
+        gatilhos_existentes = {
+            linha[0] for linha in self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        }
+        # Gatilhos escritos em função de NEW/OLD para que a alteração reaproveite os dois lados
+        somar = """
+            INSERT INTO resumo_tipo (tipo, quantidade, volume_concreto, rupturas)
+            VALUES (NEW.tipo, 1, COALESCE(NEW.volume_concreto, 0), COALESCE(NEW.ruptura_solo, 0))
+            ON CONFLICT(tipo) DO UPDATE SET
+                quantidade = quantidade + 1,
+                volume_concreto = volume_concreto + excluded.volume_concreto,
+                rupturas = rupturas + excluded.rupturas;
+            INSERT INTO resumo_armadura (diametro_barras, elementos, quantidade_barras)
+            SELECT NEW.diametro_barras, 1, COALESCE(NEW.quantidade_barras, 0)
+            WHERE NEW.diametro_barras IS NOT NULL
+            ON CONFLICT(diametro_barras) DO UPDATE SET
+                elementos = elementos + 1,
+                quantidade_barras = quantidade_barras + excluded.quantidade_barras;
+        """
+        subtrair = """
+            UPDATE resumo_tipo SET
+                quantidade = quantidade - 1,
+                volume_concreto = volume_concreto - COALESCE(OLD.volume_concreto, 0),
+                rupturas = rupturas - COALESCE(OLD.ruptura_solo, 0)
+            WHERE tipo = OLD.tipo;
+            DELETE FROM resumo_tipo WHERE tipo = OLD.tipo AND quantidade <= 0;
+            UPDATE resumo_armadura SET
+                elementos = elementos - 1,
+                quantidade_barras = quantidade_barras - COALESCE(OLD.quantidade_barras, 0)
+            WHERE diametro_barras = OLD.diametro_barras;
+            DELETE FROM resumo_armadura WHERE diametro_barras = OLD.diametro_barras AND elementos <= 0;
+        """
+        gatilhos = {
+            "trg_fundacoes_resumo_insert": f"AFTER INSERT ON fundacoes BEGIN {somar} END",
+            "trg_fundacoes_resumo_delete": f"AFTER DELETE ON fundacoes BEGIN {subtrair} END",
+            "trg_fundacoes_resumo_update": f"AFTER UPDATE ON fundacoes BEGIN {subtrair} {somar} END",
+        }
+        for nome, corpo in gatilhos.items():
+            if nome not in gatilhos_existentes:
+                self.cursor.execute(f"CREATE TRIGGER {nome} {corpo}")
+
+        # Bancos anteriores aos resumos: popula a partir do histórico uma única vez
+        if not self.cursor.execute("SELECT 1 FROM resumo_tipo LIMIT 1").fetchone():
+            self._reconstruir_resumos()
+
+    def _criar_registro_alteracoes(self):
+        """
+        Cria alteracoes_linhas, que guarda a última alteração ou remoção de cada linha das tabelas
+        em TABELAS_INCREMENTAIS (uma linha por registro alterado, com seq crescente), e os gatilhos
+        que a mantêm. SnapshotLeitura.atualizar usa seq para recopiar apenas essas linhas.
+        """
+        self.cursor.execute("""
+            CREATE TABLE IF NOT EXISTS alteracoes_linhas (
+                tabela TEXT NOT NULL,
+                linha_id INTEGER NOT NULL,
+                seq INTEGER NOT NULL,
+                PRIMARY KEY (tabela, linha_id)
+            );
+        """)
+        self.cursor.execute("CREATE INDEX IF NOT EXISTS idx_alteracoes_linhas_seq ON alteracoes_linhas(seq)")
+
+        gatilhos_existentes = {
+            linha[0] for linha in self.cursor.execute("SELECT name FROM sqlite_master WHERE type = 'trigger'")
+        }
+        for tabela in TABELAS_INCREMENTAIS:
+            registrar = f"""
+                INSERT INTO alteracoes_linhas (tabela, linha_id, seq)
+                VALUES ('{tabela}', OLD.id, (SELECT COALESCE(MAX(seq), 0) + 1 FROM alteracoes_linhas))
+                ON CONFLICT(tabela, linha_id) DO UPDATE SET seq = excluded.seq;
+            """
+            for evento in ("update", "delete"):
+                nome = f"trg_{tabela}_alteracao_{evento}"
+                if nome not in gatilhos_existentes:
+                    self.cursor.execute(
+                        f"CREATE TRIGGER {nome} AFTER {evento.upper()} ON {tabela} BEGIN {registrar} END"
+                    )
+
+    def _reconstruir_resumos(self):
+        """Recalcula as tabelas de resumo a partir da tabela fundacoes (consultas GROUP BY no SQLite)"""
+        self.cursor.execute("DELETE FROM resumo_tipo")
+        self.cursor.execute("DELETE FROM resumo_armadura")
+        self.cursor.execute("""
+            INSERT INTO resumo_tipo (tipo, quantidade, volume_concreto, rupturas)
+            SELECT tipo, COUNT(*), TOTAL(volume_concreto), TOTAL(ruptura_solo)
+            FROM fundacoes GROUP BY tipo
+        """)
+        self.cursor.execute("""
+            INSERT INTO resumo_armadura (diametro_barras, elementos, quantidade_barras)
+            SELECT diametro_barras, COUNT(*), TOTAL(quantidade_barras)
+            FROM fundacoes WHERE diametro_barras IS NOT NULL GROUP BY diametro_barras
+        """)
+
+    def reconstruir_resumos(self):
+        """Reconstrói as tabelas de resumo do projeto (útil após manutenção manual do banco)"""
         self.connect()
         try:
-            self.cursor.execute("""
-                INSERT INTO fundacoes (tipo, dados_entrada, resultado) 
-                VALUES (?, ?, ?)
-            """, (tipo, dados_entrada, resultado))
+            self._reconstruir_resumos()
+            self.conn.commit()
+            logging.info("Resumos do projeto reconstruídos.")
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao reconstruir resumos: {e}")
+            raise
+        finally:
+            self.close()
+
+    def _inserir_calculo(self, tipo, dados_entrada, resultado, sincronizar_bim=False):
+        """Insere o cálculo (e, se pedido, a mensagem da outbox BIM) na transação corrente"""
+        hash_resultado = calcular_hash_resultado(tipo, dados_entrada, resultado)
+        self.cursor.execute(f"""
+            INSERT INTO fundacoes (tipo, dados_entrada, resultado, hash_resultado, {', '.join(COLUNAS_METRICAS)})
+            VALUES (?, ?, ?, ?, {', '.join('?' for _ in COLUNAS_METRICAS)})
+        """, (
+            tipo, _serializar(dados_entrada), _serializar(resultado), hash_resultado,
+        ) + extrair_metricas(dados_entrada, resultado))
+        fundacao_id = self.cursor.lastrowid
+        if sincronizar_bim:
+            self._enfileirar_bim(fundacao_id, tipo, dados_entrada, resultado, hash_resultado)
+        return fundacao_id
+
+    def _enfileirar_bim(self, fundacao_id, tipo, dados_entrada, resultado, hash_resultado):
+        """
+        Grava a mensagem da outbox BIM de uma fundação na transação corrente. O payload leva o
+        hash do conteúdo enviado, que o worker grava como hash_sincronizado após o envio.
+        """
+        payload = {
+            "fundacao_id": fundacao_id,
+            "tipo": tipo,
+            "dados_entrada": para_dict(dados_entrada) or dados_entrada,
+            "resultado": para_dict(resultado) or resultado,
+            "hash_resultado": hash_resultado,
+        }
+        self.cursor.execute(
+            "INSERT INTO outbox_bim (fundacao_id, payload) VALUES (?, ?)",
+            (fundacao_id, json.dumps(payload, ensure_ascii=False, default=str)),
+        )
+
+    def enfileirar_bim(self, fundacao_ids: Iterable[int]) -> List[int]:
+        """
+        Grava em uma transação as mensagens da outbox BIM das fundações informadas, com o conteúdo
+        atual de cada uma. Fundações inexistentes e as que já têm uma mensagem pendente com o mesmo
+        hash são ignoradas. O status de sincronização só é gravado pelo BIMSyncWorker após o envio.
+
+        :param fundacao_ids: IDs das fundações.
+        :return: IDs das fundações enfileiradas.
+        """
+        self.connect()
+        try:
+            with self.conn:
+                pendentes = {}
+                for fundacao_id, payload in self.cursor.execute(
+                    "SELECT fundacao_id, payload FROM outbox_bim WHERE status = 'pendente'"
+                ).fetchall():
+                    pendentes.setdefault(fundacao_id, set()).add(json.loads(payload).get("hash_resultado"))
+                enfileiradas = []
+                for fundacao_id in dict.fromkeys(fundacao_ids):
+                    linha = self.cursor.execute(
+                        "SELECT tipo, dados_entrada, resultado, hash_resultado FROM fundacoes WHERE id = ?",
+                        (fundacao_id,),
+                    ).fetchone()
+                    if linha is None or linha[3] in pendentes.get(fundacao_id, ()):
+                        continue
+                    self._enfileirar_bim(fundacao_id, *linha)
+                    enfileiradas.append(fundacao_id)
+            logging.info(f"{len(enfileiradas)} fundações enfileiradas para sincronização BIM.")
+            return enfileiradas
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao enfileirar fundações para sincronização BIM: {e}")
+            raise
+        finally:
+            self.close()
+
+    def salvar_calculo(self, tipo, dados_entrada, resultado, sincronizar_bim=False):
+        """
+        Insere um novo cálculo de fundação no banco de dados.
+        Com sincronizar_bim=True, grava na mesma transação a mensagem da outbox BIM.
+        """
+        self.connect()
+        try:
+            fundacao_id = self._inserir_calculo(tipo, dados_entrada, resultado, sincronizar_bim)
             self.conn.commit()
             logging.info(f"Cálculo de {tipo} salvo com sucesso.")
+            return fundacao_id
         except sqlite3.Error as e:
             logging.error(f"Erro ao salvar cálculo: {e}")
             raise
         finally:
             self.close()
 
+    def salvar_calculos_lote(self, calculos: Iterable[Tuple[str, Any, Any]], sincronizar_bim: bool = False) -> List[int]:
+        """
+        Insere vários cálculos em uma única transação.
+
+        :param calculos: Iterável de tuplas (tipo, dados_entrada, resultado).
+        :param sincronizar_bim: Grava também as mensagens da outbox BIM na mesma transação.
+        :return: Lista com os ids gerados, na ordem de entrada.
+        """
+        self.connect()
+        try:
+            with self.conn:
+                ids = [
+                    self._inserir_calculo(tipo, dados_entrada, resultado, sincronizar_bim)
+                    for tipo, dados_entrada, resultado in calculos
+                ]
+            logging.info(f"{len(ids)} cálculos salvos em lote.")
+            return ids
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao salvar cálculos em lote: {e}")
+            raise
+        finally:
+            self.close()
+
+    def atualizar_calculo(self, fundacao_id, dados_entrada, resultado, sincronizar_bim=False):
+        """
+        Atualiza a entrada e o resultado de uma fundação já calculada (ex.: após editar o elemento),
+        recalculando as métricas e o hash de conteúdo. Os resumos são ajustados pelos gatilhos.
+        :return: True se o conteúdo mudou, False se o hash era o mesmo (nada é gravado).
+        """
+        self.connect()
+        try:
+            linha = self.cursor.execute(
+                "SELECT tipo, hash_resultado FROM fundacoes WHERE id = ?", (fundacao_id,)
+            ).fetchone()
+            if linha is None:
+                raise KeyError(f"Fundação {fundacao_id} não encontrada.")
+            tipo, hash_atual = linha
+            novo_hash = calcular_hash_resultado(tipo, dados_entrada, resultado)
+            if novo_hash == hash_atual:
+                return False
+            self.cursor.execute(f"""
+                UPDATE fundacoes SET dados_entrada = ?, resultado = ?, hash_resultado = ?,
+                    {', '.join(f'{c} = ?' for c in COLUNAS_METRICAS)}
+                WHERE id = ?
+            """, (_serializar(dados_entrada), _serializar(resultado), novo_hash)
+                + extrair_metricas(dados_entrada, resultado) + (fundacao_id,))
+            if sincronizar_bim:
+                self._enfileirar_bim(fundacao_id, tipo, dados_entrada, resultado, novo_hash)
+            self.conn.commit()
+            logging.info(f"Cálculo da fundação {fundacao_id} atualizado.")
+            return True
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao atualizar cálculo: {e}")
+            raise
+        finally:
+            self.close()
+
+    @classmethod
+    def para_projeto(cls, nome_projeto: str, diretorio_dados: Optional[Union[str, Path]] = None) -> "DatabaseService":
+        """
+        Retorna o serviço do banco de dados de um projeto, registrando-o no catálogo se necessário.
+        :param nome_projeto: Nome do projeto.
+        :param diretorio_dados: Diretório de dados (padrão: diretorio_dados_padrao()).
+        """
+        return CatalogoProjetos(diretorio_dados).abrir_projeto(nome_projeto)
+
+    def criar_snapshot(self) -> SnapshotLeitura:
+        """Cria um snapshot de leitura em memória deste banco de dados (ver SnapshotLeitura)"""
+        return SnapshotLeitura(self.db_path)
+
+    def vacuum(self):
+        """Compacta o arquivo do banco de dados (VACUUM)"""
+        self.connect()
+        try:
+            self.cursor.execute("VACUUM")
+            logging.info(f"Banco de dados {self.db_path} compactado.")
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao compactar banco de dados: {e}")
+            raise
+        finally:
+            self.close()
+
     def buscar_calculos(self, tipo=None):
         """Retorna cálculos de fundações, filtrados por tipo, se fornecido"""
         self.connect()
@@ -97,8 +755,373 @@ class DatabaseService:
         finally:
             self.close()
 
+    def iterar_calculos(self, tipo: Optional[str] = None, colunas: Sequence[str] = COLUNAS_CALCULOS,
+                        tamanho_bloco: int = 1000) -> Iterator[Tuple]:
+        """
+        Percorre os cálculos em fluxo, lendo o banco em blocos por uma conexão própria, para
+        relatórios e exportações que não devem carregar toda a tabela em memória.
+
+        :param tipo: Filtra por tipo de fundação, se fornecido.
+        :param colunas: Colunas retornadas, na ordem das tuplas (ver COLUNAS_CALCULOS).
+        :param tamanho_bloco: Quantidade de linhas lidas do SQLite por vez.
+        :return: Iterador de tuplas, em ordem de id.
+        """
+        invalidas = [coluna for coluna in colunas if coluna not in COLUNAS_FUNDACOES]
+        if invalidas:
+            raise ValueError(f"Colunas inválidas: {', '.join(invalidas)}")
+        filtro, parametros = ("WHERE tipo = ?", (tipo,)) if tipo else ("", ())
+        conexao = sqlite3.connect(self.db_path)
+        try:
+            cursor = conexao.execute(f"SELECT {', '.join(colunas)} FROM fundacoes {filtro} ORDER BY id", parametros)
+            while True:
+                linhas = cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                yield from linhas
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao percorrer cálculos: {e}")
+            raise
+        finally:
+            conexao.close()
+
+    def _consultar_dicts(self, sql, parametros=()):
+        """Executa uma consulta de leitura e retorna as linhas como dicionários"""
+        self.connect()
+        try:
+            self.cursor.execute(sql, parametros)
+            colunas = [descricao[0] for descricao in self.cursor.description]
+            return [dict(zip(colunas, linha)) for linha in self.cursor.fetchall()]
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao consultar resumo: {e}")
+            raise
+        finally:
+            self.close()
+
+    def resumo_por_tipo(self) -> List[Dict[str, Any]]:
+        """
+        Retorna, por tipo de fundação, a quantidade de elementos, o volume total de concreto
+        e o número de elementos com risco de ruptura. Lê apenas a tabela de resumo.
+        """
+        return self._consultar_dicts(
+            "SELECT tipo, quantidade, volume_concreto, rupturas FROM resumo_tipo ORDER BY tipo"
+        )
+
+    def resumo_armadura(self) -> List[Dict[str, Any]]:
+        """Retorna a quantidade total de barras por diâmetro (mm) a partir da tabela de resumo."""
+        return self._consultar_dicts(
+            "SELECT diametro_barras, elementos, quantidade_barras FROM resumo_armadura ORDER BY diametro_barras"
+        )
+
+    def resumo_projeto(self) -> Dict[str, Any]:
+        """Retorna os totais do projeto (elementos, volume de concreto e rupturas) somando os grupos."""
+        linhas = self._consultar_dicts("""
+            SELECT TOTAL(quantidade) AS quantidade, TOTAL(volume_concreto) AS volume_concreto,
+                   TOTAL(rupturas) AS rupturas
+            FROM resumo_tipo
+        """)
+        totais = linhas[0]
+        return {
+            "quantidade": int(totais["quantidade"]),
+            "volume_concreto": totais["volume_concreto"],
+            "rupturas": int(totais["rupturas"]),
+        }
+
+    def agregar_calculos(self, agrupar_por: str = "tipo", tipo: Optional[str] = None) -> List[Dict[str, Any]]:
+        """
+        Executa uma agregação GROUP BY diretamente no SQLite sobre a tabela fundacoes,
+        para agrupamentos não cobertos pelas tabelas de resumo.
+
+        :param agrupar_por: Coluna de agrupamento (uma de COLUNAS_AGRUPAVEIS).
+        :param tipo: Filtra por tipo de fundação, se fornecido.
+        :return: Lista de dicionários com as somas de cada grupo.
+        """
+        if agrupar_por not in COLUNAS_AGRUPAVEIS:
+            raise ValueError(f"Agrupamento '{agrupar_por}' não suportado. Use um de {COLUNAS_AGRUPAVEIS}.")
+        filtro, parametros = ("WHERE tipo = ?", (tipo,)) if tipo else ("", ())
+        return self._consultar_dicts(f"""
+            SELECT {agrupar_por}, COUNT(*) AS quantidade,
+                   TOTAL(volume_concreto) AS volume_concreto,
+                   TOTAL(ruptura_solo) AS rupturas,
+                   TOTAL(quantidade_barras) AS quantidade_barras
+            FROM fundacoes {filtro}
+            GROUP BY {agrupar_por}
+            ORDER BY {agrupar_por}
+        """, parametros)
+
+    def exportar_colunar(self, diretorio: Union[str, Path], tipo: Optional[str] = None,
+                         tamanho_bloco: int = 65536) -> Path:
+        """
+        Exporta as colunas numéricas dos cálculos para um arquivo colunar (um .npy por coluna
+        e um manifesto JSON), lendo o banco em blocos e gravando direto nos arquivos mapeados.
+
+        :param diretorio: Diretório de destino (criado se não existir).
+        :param tipo: Exporta apenas um tipo de fundação, se fornecido.
+        :param tamanho_bloco: Quantidade de linhas lidas do SQLite por vez.
+        :return: Caminho do diretório exportado.
+        """
+        destino = Path(diretorio)
+        destino.mkdir(parents=True, exist_ok=True)
+        filtro, parametros = ("WHERE tipo = ?", (tipo,)) if tipo else ("", ())
+        self.connect()
+        try:
+            # Contagem e leitura na mesma transação para enxergarem o mesmo estado do banco
+            self.cursor.execute("BEGIN")
+            total = self.cursor.execute(f"SELECT COUNT(*) FROM fundacoes {filtro}", parametros).fetchone()[0]
+            saidas = {
+                nome: np.lib.format.open_memmap(destino / f"{nome}.npy", mode="w+", dtype=dtype, shape=(total,))
+                for nome, dtype in COLUNAS_ARQUIVO.items()
+            }
+            categorias: Dict[str, int] = {}
+            self.cursor.execute(
+                f"SELECT {', '.join(COLUNAS_ARQUIVO)} FROM fundacoes {filtro} ORDER BY id", parametros
+            )
+            inicio = 0
+            while True:
+                linhas = self.cursor.fetchmany(tamanho_bloco)
+                if not linhas:
+                    break
+                fim = inicio + len(linhas)
+                ids, tipos, datas, fck, volume, ruptura, barras, diametro = zip(*linhas)
+                saidas["id"][inicio:fim] = ids
+                saidas["tipo"][inicio:fim] = [categorias.setdefault(t, len(categorias)) for t in tipos]
+                saidas["data_calculo"][inicio:fim] = np.array(datas, dtype="datetime64[s]")
+                saidas["fck"][inicio:fim] = np.array(fck, dtype="float64")
+                saidas["volume_concreto"][inicio:fim] = np.array(volume, dtype="float64")
+                saidas["ruptura_solo"][inicio:fim] = [-1 if r is None else r for r in ruptura]
+                saidas["quantidade_barras"][inicio:fim] = np.array(barras, dtype="float64")
+                saidas["diametro_barras"][inicio:fim] = np.array(diametro, dtype="float64")
+                inicio = fim
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao exportar arquivo colunar: {e}")
+            raise
+        finally:
+            self.close()
+
+        for saida in saidas.values():
+            saida.flush()
+        del saidas
+        # O manifesto é gravado por último: sem ele o arquivo não é considerado completo
+        manifesto = {
+            "versao": VERSAO_ARQUIVO,
+            "linhas": total,
+            "filtro_tipo": tipo,
+            "colunas": {nome: {"arquivo": f"{nome}.npy", "dtype": dtype} for nome, dtype in COLUNAS_ARQUIVO.items()},
+            "categorias": {"tipo": sorted(categorias, key=categorias.get)},
+        }
+        with open(destino / NOME_MANIFESTO, "w", encoding="utf-8") as arquivo:
+            json.dump(manifesto, arquivo, ensure_ascii=False, indent=4)
+        logging.info(f"{total} cálculos exportados para o arquivo colunar {destino}.")
+        return destino
+
+    @staticmethod
+    def abrir_colunar(diretorio: Union[str, Path]) -> ArquivoColunar:
+        """
+        Abre um arquivo colunar exportado, com acesso às colunas por memória mapeada.
+        :param diretorio: Diretório do arquivo colunar.
+        :return: ArquivoColunar com as colunas como np.memmap.
+        """
+        return ArquivoColunar(diretorio)
+
     def close(self):
         """Fecha a conexão com o banco de dados"""
         if self.conn:
             self.conn.close()
             logging.info("Conexão com o banco de dados SQLite encerrada.")
+
+
+# Limite padrão do SQLite para bancos anexados; Connection.getlimit só existe a partir do Python 3.11
+LIMITE_ANEXOS_PADRAO = 10
+
+
+def _limite_anexos(conn: sqlite3.Connection) -> int:
+    """Quantidade máxima de bancos que a conexão aceita anexar com ATTACH"""
+    getlimit = getattr(conn, "getlimit", None)
+    if getlimit is None:
+        return LIMITE_ANEXOS_PADRAO
+    return getlimit(sqlite3.SQLITE_LIMIT_ATTACHED)
+
+
+class CatalogoProjetos:
+    """
+    Catálogo de projetos: cada projeto tem seu próprio arquivo SQLite em <diretorio_dados>/projetos,
+    e o catálogo (catalogo.db) registra nome, arquivo e situação de cada um. Consultas entre
+    projetos anexam os bancos com ATTACH, em grupos limitados pelo máximo do SQLite.
+    """
+
+    def __init__(self, diretorio_dados: Optional[Union[str, Path]] = None):
+        """
+        Inicializa o catálogo, criando o diretório de dados e o banco do catálogo se necessário.
+        :param diretorio_dados: Diretório de dados (padrão: diretorio_dados_padrao()).
+        """
+        self.diretorio_dados = Path(diretorio_dados) if diretorio_dados else diretorio_dados_padrao()
+        self.diretorio_projetos = self.diretorio_dados / "projetos"
+        self.diretorio_arquivo_morto = self.diretorio_dados / "arquivo"
+        self.caminho_catalogo = self.diretorio_dados / "catalogo.db"
+        self.diretorio_projetos.mkdir(parents=True, exist_ok=True)
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.execute("""
+                    CREATE TABLE IF NOT EXISTS projetos (
+                        id INTEGER PRIMARY KEY AUTOINCREMENT,
+                        nome TEXT NOT NULL UNIQUE,
+                        arquivo TEXT NOT NULL,
+                        criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                        arquivado_em TIMESTAMP
+                    );
+                """)
+        finally:
+            conn.close()
+
+    def _conectar(self) -> sqlite3.Connection:
+        """Abre uma conexão com o banco do catálogo"""
+        return sqlite3.connect(self.caminho_catalogo)
+
+    @staticmethod
+    def _nome_arquivo(id_projeto: int, nome: str) -> str:
+        """Gera um nome de arquivo seguro e único para o banco do projeto"""
+        ascii_ = unicodedata.normalize("NFKD", nome).encode("ascii", "ignore").decode("ascii")
+        slug = re.sub(r"[^0-9A-Za-z]+", "_", ascii_).strip("_").lower() or "projeto"
+        return f"{id_projeto:06d}_{slug[:40]}.db"
+
+    def _buscar(self, nome: str) -> Optional[Dict[str, Any]]:
+        """Retorna o registro do projeto no catálogo, ou None"""
+        conn = self._conectar()
+        try:
+            conn.row_factory = sqlite3.Row
+            linha = conn.execute("SELECT * FROM projetos WHERE nome = ?", (nome,)).fetchone()
+            return dict(linha) if linha else None
+        finally:
+            conn.close()
+
+    def caminho_projeto(self, nome: str) -> Path:
+        """Retorna o caminho do banco de dados do projeto (que precisa estar no catálogo)"""
+        projeto = self._buscar(nome)
+        if projeto is None:
+            raise KeyError(f"Projeto '{nome}' não encontrado no catálogo.")
+        return self.diretorio_projetos / projeto["arquivo"]
+
+    def abrir_projeto(self, nome: str, criar: bool = True) -> DatabaseService:
+        """
+        Retorna o DatabaseService do banco do projeto.
+        :param nome: Nome do projeto.
+        :param criar: Registra e cria o projeto caso ainda não exista.
+        """
+        projeto = self._buscar(nome)
+        if projeto is None:
+            if not criar:
+                raise KeyError(f"Projeto '{nome}' não encontrado no catálogo.")
+            conn = self._conectar()
+            try:
+                with conn:
+                    cursor = conn.execute("INSERT INTO projetos (nome, arquivo) VALUES (?, '')", (nome,))
+                    arquivo = self._nome_arquivo(cursor.lastrowid, nome)
+                    conn.execute("UPDATE projetos SET arquivo = ? WHERE id = ?", (arquivo, cursor.lastrowid))
+            finally:
+                conn.close()
+            logging.info(f"Projeto '{nome}' registrado no catálogo ({arquivo}).")
+        elif projeto["arquivado_em"]:
+            raise ValueError(f"Projeto '{nome}' está arquivado.")
+        else:
+            arquivo = projeto["arquivo"]
+        return DatabaseService(self.diretorio_projetos / arquivo)
+
+    def listar_projetos(self, incluir_arquivados: bool = False) -> List[Dict[str, Any]]:
+        """Lista os projetos do catálogo"""
+        filtro = "" if incluir_arquivados else "WHERE arquivado_em IS NULL"
+        conn = self._conectar()
+        try:
+            conn.row_factory = sqlite3.Row
+            return [dict(linha) for linha in conn.execute(f"SELECT * FROM projetos {filtro} ORDER BY nome")]
+        finally:
+            conn.close()
+
+    def consultar_projetos(self, sql: str, parametros: Sequence[Any] = (),
+                           projetos: Optional[Sequence[str]] = None) -> List[Tuple]:
+        """
+        Executa uma consulta em vários projetos anexando seus bancos com ATTACH.
+
+        A consulta usa o marcador {schema} antes das tabelas (ex.: "SELECT tipo, quantidade
+        FROM {schema}.resumo_tipo") e é combinada com UNION ALL; cada linha retornada é
+        prefixada com o nome do projeto. Os parâmetros são repetidos para cada projeto.
+
+        :param sql: Consulta com o marcador {schema}.
+        :param parametros: Parâmetros da consulta.
+        :param projetos: Nomes dos projetos (padrão: todos os não arquivados).
+        :return: Lista de tuplas (projeto, *colunas).
+        """
+        nomes = projetos if projetos is not None else [p["nome"] for p in self.listar_projetos()]
+        caminhos = [(nome, self.caminho_projeto(nome)) for nome in nomes]
+        conn = self._conectar()
+        resultados: List[Tuple] = []
+        try:
+            limite = _limite_anexos(conn)
+            for inicio in range(0, len(caminhos), limite):
+                grupo = caminhos[inicio:inicio + limite]
+                esquemas = []
+                for indice, (nome, caminho) in enumerate(grupo):
+                    esquema = f"p{indice}"
+                    conn.execute("ATTACH DATABASE ? AS " + esquema, (str(caminho),))
+                    esquemas.append((nome, esquema))
+                try:
+                    consulta = " UNION ALL ".join(
+                        f"SELECT ? AS projeto, * FROM ({sql.format(schema=esquema)})" for _, esquema in esquemas
+                    )
+                    valores: List[Any] = []
+                    for nome, _ in esquemas:
+                        valores.append(nome)
+                        valores.extend(parametros)
+                    resultados.extend(conn.execute(consulta, valores).fetchall())
+                finally:
+                    for _, esquema in esquemas:
+                        conn.execute(f"DETACH DATABASE {esquema}")
+            return resultados
+        except sqlite3.Error as e:
+            logging.error(f"Erro na consulta entre projetos: {e}")
+            raise
+        finally:
+            conn.close()
+
+    def resumo_por_tipo(self, projetos: Optional[Sequence[str]] = None) -> List[Dict[str, Any]]:
+        """Soma as tabelas de resumo de vários projetos por tipo de fundação"""
+        totais: Dict[str, Dict[str, Any]] = {}
+        linhas = self.consultar_projetos(
+            "SELECT tipo, quantidade, volume_concreto, rupturas FROM {schema}.resumo_tipo", projetos=projetos
+        )
+        for _, tipo, quantidade, volume, rupturas in linhas:
+            total = totais.setdefault(tipo, {"tipo": tipo, "quantidade": 0, "volume_concreto": 0.0, "rupturas": 0})
+            total["quantidade"] += quantidade
+            total["volume_concreto"] += volume
+            total["rupturas"] += rupturas
+        return [totais[tipo] for tipo in sorted(totais)]
+
+    def vacuum_projeto(self, nome: str):
+        """Compacta apenas o banco do projeto informado"""
+        DatabaseService(self.caminho_projeto(nome)).vacuum()
+
+    def arquivar_projeto(self, nome: str) -> Path:
+        """
+        Arquiva o projeto: grava uma cópia compactada (VACUUM INTO) em <diretorio_dados>/arquivo,
+        remove o banco ativo e marca o projeto como arquivado no catálogo.
+        :return: Caminho do arquivo gerado.
+        """
+        origem = self.caminho_projeto(nome)
+        self.diretorio_arquivo_morto.mkdir(parents=True, exist_ok=True)
+        destino = self.diretorio_arquivo_morto / f"{origem.stem}_{datetime.now():%Y%m%d%H%M%S}.db"
+        conn = sqlite3.connect(origem)
+        try:
+            conn.execute("VACUUM INTO ?", (str(destino),))
+        finally:
+            conn.close()
+        origem.unlink()
+        conn = self._conectar()
+        try:
+            with conn:
+                conn.execute(
+                    "UPDATE projetos SET arquivo = ?, arquivado_em = CURRENT_TIMESTAMP WHERE nome = ?",
+                    (os.path.relpath(destino, self.diretorio_projetos), nome),
+                )
+        finally:
+            conn.close()
+        logging.info(f"Projeto '{nome}' arquivado em {destino}.")
+        return destino
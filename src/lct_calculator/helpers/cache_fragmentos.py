@@ -0,0 +1,314 @@
+import hashlib
+import logging
+import os
+import pickle
+import sqlite3
+import time
+from itertools import islice
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple
+
+from src.lct_calculator.database import diretorio_dados_padrao
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Chaves consultadas por instrução SQL (abaixo do limite de parâmetros do SQLite)
+TAMANHO_CONSULTA = 500
+
+
+# Limites do cache: fragmentos sem uso há mais de IDADE_MAXIMA_DIAS são removidos e, acima de
+# TAMANHO_MAXIMO bytes, os usados há mais tempo também
+IDADE_MAXIMA_DIAS = 30
+TAMANHO_MAXIMO = 512 * 1024 * 1024
+
+# O horário de uso de um fragmento é regravado no máximo uma vez neste intervalo (s)
+INTERVALO_USO = 24 * 3600
+
+# Tamanho médio e máximo dos grupos de linhas guardados como um único fragmento
+LINHAS_POR_GRUPO = 64
+MAXIMO_LINHAS_POR_GRUPO = 4 * LINHAS_POR_GRUPO
+
+
+def chave_linha(valores: Sequence[Any]) -> bytes:
+    """
+    Hash do conteúdo de uma linha do relatório. Inclui todas as colunas exibidas (o hash_resultado,
+    quando presente, entra como as demais), pois id e datas também aparecem no fragmento.
+    """
+    try:
+        conteudo = pickle.dumps(tuple(valores), protocol=5)
+    except (pickle.PicklingError, TypeError, AttributeError):
+        conteudo = repr(tuple(valores)).encode("utf-8")
+    return hashlib.blake2b(conteudo, digest_size=16).digest()
+
+
+def _grupos(linhas: Iterable[Sequence[Any]]) -> Iterator[Tuple[List[Sequence[Any]], List[bytes]]]:
+    """
+    Agrupa as linhas pelo conteúdo: um grupo termina após uma linha cujo hash cai em 1 a cada
+    LINHAS_POR_GRUPO valores. Inserir ou remover uma linha altera apenas o grupo que a contém,
+    e não desloca as fronteiras dos grupos seguintes.
+    """
+    limiar = 256 // LINHAS_POR_GRUPO
+    grupo, chaves = [], []
+    for linha in linhas:
+        chave = chave_linha(linha)
+        grupo.append(linha)
+        chaves.append(chave)
+        if chave[0] < limiar or len(grupo) >= MAXIMO_LINHAS_POR_GRUPO:
+            yield grupo, chaves
+            grupo, chaves = [], []
+    if grupo:
+        yield grupo, chaves
+
+
+def assinatura(*partes: Any) -> str:
+    """Identifica um formato de fragmento (formato, colunas, layout...); muda quando a renderização muda"""
+    return hashlib.blake2b(repr(partes).encode("utf-8"), digest_size=16).hexdigest()
+
+
+class CacheFragmentos:
+    """
+    Cache em disco (SQLite) dos fragmentos renderizados dos relatórios: linhas de CSV, itens de
+    JSON, linhas e páginas de PDF.
+
+    Cada fragmento é guardado pela assinatura do formato e pelo hash do conteúdo da linha. Ao
+    regenerar um relatório após poucas alterações, só as linhas alteradas são renderizadas de novo;
+    as demais são lidas do cache e o documento é remontado na ordem original.
+
+    Cada fragmento guarda o horário do último uso; ao abrir o cache, os fragmentos antigos e, se o
+    arquivo passar do tamanho máximo, os usados há mais tempo são removidos (ver podar).
+    """
+
+    def __init__(self, caminho: Optional[os.PathLike] = None, idade_maxima_dias: Optional[float] = IDADE_MAXIMA_DIAS,
+                 tamanho_maximo: Optional[int] = TAMANHO_MAXIMO):
+        """
+        :param caminho: Arquivo SQLite do cache (padrão: "cache_relatorios.db" no diretório de dados).
+        :param idade_maxima_dias: Remove os fragmentos sem uso há mais dias que isso (None: sem limite).
+        :param tamanho_maximo: Tamanho máximo do cache em bytes (None: sem limite).
+        """
+        self.caminho = Path(caminho) if caminho is not None else diretorio_dados_padrao() / "cache_relatorios.db"
+        self.caminho.parent.mkdir(parents=True, exist_ok=True)
+        self.idade_maxima_dias = idade_maxima_dias
+        self.tamanho_maximo = tamanho_maximo
+        self._conexao: Optional[sqlite3.Connection] = None
+        self.acertos = 0
+        self.renderizados = 0
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # A conexão é reaberta em cada processo
+        return {**self.__dict__, "_conexao": None}
+
+    @property
+    def conexao(self) -> sqlite3.Connection:
+        if self._conexao is None:
+            self._conexao = sqlite3.connect(self.caminho)
+            # Só tem efeito em arquivos novos: permite devolver ao disco o espaço liberado por podar
+            self._conexao.execute("PRAGMA auto_vacuum = INCREMENTAL")
+            with self._conexao:
+                self._conexao.execute("""
+                    CREATE TABLE IF NOT EXISTS fragmentos (
+                        assinatura TEXT NOT NULL,
+                        chave BLOB NOT NULL,
+                        fragmento BLOB NOT NULL,
+                        acesso INTEGER NOT NULL DEFAULT 0,
+                        PRIMARY KEY (assinatura, chave)
+                    ) WITHOUT ROWID
+                """)
+                self._conexao.execute("""
+                    CREATE TABLE IF NOT EXISTS metadados (
+                        chave TEXT PRIMARY KEY,
+                        valor TEXT,
+                        acesso INTEGER NOT NULL DEFAULT 0
+                    )
+                """)
+                # Caches criados antes do controle de uso: as entradas existentes contam como antigas
+                for tabela in ("fragmentos", "metadados"):
+                    colunas = {linha[1] for linha in self._conexao.execute(f"PRAGMA table_info({tabela})")}
+                    if "acesso" not in colunas:
+                        self._conexao.execute(f"ALTER TABLE {tabela} ADD COLUMN acesso INTEGER NOT NULL DEFAULT 0")
+                self._conexao.execute("CREATE INDEX IF NOT EXISTS idx_fragmentos_acesso ON fragmentos(acesso)")
+            self.podar()
+        return self._conexao
+
+    def _tamanho_usado(self) -> int:
+        """Bytes ocupados pelas páginas em uso do arquivo (sem as páginas livres)"""
+        paginas, = self.conexao.execute("PRAGMA page_count").fetchone()
+        livres, = self.conexao.execute("PRAGMA freelist_count").fetchone()
+        tamanho_pagina, = self.conexao.execute("PRAGMA page_size").fetchone()
+        return (paginas - livres) * tamanho_pagina
+
+    def podar(self) -> int:
+        """
+        Remove os fragmentos e metadados sem uso há mais de idade_maxima_dias e, enquanto o cache
+        passar de tamanho_maximo, os fragmentos usados há mais tempo (10% por vez).
+        Executado automaticamente ao abrir o cache.
+
+        :return: Quantidade de fragmentos removidos.
+        """
+        removidos = 0
+        with self.conexao:
+            if self.idade_maxima_dias is not None:
+                limite = time.time() - self.idade_maxima_dias * 86400
+                removidos += self.conexao.execute("DELETE FROM fragmentos WHERE acesso < ?", (limite,)).rowcount
+                self.conexao.execute("DELETE FROM metadados WHERE acesso < ?", (limite,))
+            if self.tamanho_maximo is not None:
+                while self._tamanho_usado() > self.tamanho_maximo:
+                    quantidade, = self.conexao.execute("SELECT COUNT(*) FROM fragmentos").fetchone()
+                    if not quantidade:
+                        break
+                    removidos += self.conexao.execute("""
+                        DELETE FROM fragmentos WHERE (assinatura, chave) IN (
+                            SELECT assinatura, chave FROM fragmentos ORDER BY acesso LIMIT ?
+                        )
+                    """, (max(quantidade // 10, 1),)).rowcount
+        if removidos:
+            self.conexao.execute("PRAGMA incremental_vacuum")
+            logging.info(f"{removidos} fragmentos removidos do cache de relatórios {self.caminho}.")
+        return removidos
+
+    def obter(self, assinatura_fragmento: str, chaves: Sequence[bytes]) -> Dict[bytes, bytes]:
+        """Retorna os fragmentos encontrados para as chaves, como {chave: fragmento}"""
+        encontrados: Dict[bytes, bytes] = {}
+        chaves = list(dict.fromkeys(chaves))
+        agora = int(time.time())
+        with self.conexao:
+            for inicio in range(0, len(chaves), TAMANHO_CONSULTA):
+                lote = chaves[inicio:inicio + TAMANHO_CONSULTA]
+                marcadores = ", ".join("?" for _ in lote)
+                encontrados.update(self.conexao.execute(
+                    f"SELECT chave, fragmento FROM fragmentos WHERE assinatura = ? AND chave IN ({marcadores})",
+                    (assinatura_fragmento, *lote),
+                ))
+                # Marca o uso dos fragmentos encontrados (no máximo uma gravação por INTERVALO_USO)
+                self.conexao.execute(
+                    f"UPDATE fragmentos SET acesso = ? WHERE assinatura = ? AND acesso < ? AND chave IN ({marcadores})",
+                    (agora, assinatura_fragmento, agora - INTERVALO_USO, *lote),
+                )
+        return encontrados
+
+    def gravar(self, assinatura_fragmento: str, fragmentos: Mapping[bytes, bytes]):
+        """Guarda os fragmentos renderizados"""
+        with self.conexao:
+            self.conexao.executemany(
+                "INSERT OR REPLACE INTO fragmentos (assinatura, chave, fragmento, acesso) VALUES (?, ?, ?, ?)",
+                ((assinatura_fragmento, chave, fragmento, int(time.time())) for chave, fragmento in fragmentos.items()),
+            )
+
+    def renderizar(self, assinatura_fragmento: str, linhas: Iterable[Sequence[Any]],
+                   renderizar_linha: Callable[[Sequence[Any]], bytes], separador: bytes = b"",
+                   tamanho_bloco: int = 5000) -> Iterator[bytes]:
+        """
+        Renderiza as linhas em fluxo, reaproveitando os fragmentos do cache.
+
+        Grupos de linhas inalterados são lidos do cache em uma única consulta; nos grupos com
+        alterações, apenas as linhas que não estão no cache são renderizadas.
+
+        :param assinatura_fragmento: Assinatura do formato (ver assinatura).
+        :param linhas: Valores de cada linha.
+        :param renderizar_linha: Função que renderiza uma linha em bytes.
+        :param separador: Inserido entre as linhas dentro de cada grupo.
+        :param tamanho_bloco: Linhas consultadas e gravadas no cache por vez (aproximadamente).
+        :return: Iterador dos grupos de linhas renderizados, na ordem; o separador também deve
+            ser inserido entre grupos consecutivos.
+        """
+        assinatura_grupos = assinatura_fragmento + ":grupos"
+        grupos = _grupos(linhas)
+        while True:
+            lote, quantidade = [], 0
+            for grupo in grupos:
+                lote.append(grupo)
+                quantidade += len(grupo[0])
+                if quantidade >= tamanho_bloco:
+                    break
+            if not lote:
+                return
+            chaves_grupos = [hashlib.blake2b(b"".join(chaves), digest_size=16).digest() for _, chaves in lote]
+            prontos = self.obter(assinatura_grupos, chaves_grupos)
+            faltantes = [(chave, grupo) for chave, grupo in zip(chaves_grupos, lote) if chave not in prontos]
+            self.acertos += quantidade - sum(len(linhas_grupo) for _, (linhas_grupo, _) in faltantes)
+            if faltantes:
+                fragmentos = self.renderizar_bloco(
+                    assinatura_fragmento, [linha for _, (linhas_grupo, _) in faltantes for linha in linhas_grupo],
+                    renderizar_linha, [chave for _, (_, chaves) in faltantes for chave in chaves],
+                )
+                novos, posicao = {}, 0
+                for chave, (linhas_grupo, _) in faltantes:
+                    novos[chave] = separador.join(fragmentos[posicao:posicao + len(linhas_grupo)])
+                    posicao += len(linhas_grupo)
+                self.gravar(assinatura_grupos, novos)
+                prontos.update(novos)
+            yield from (prontos[chave] for chave in chaves_grupos)
+
+    def renderizar_bloco(self, assinatura_fragmento: str, linhas: Sequence[Sequence[Any]],
+                         renderizar_linha: Callable[[Sequence[Any]], bytes],
+                         chaves: Optional[Sequence[bytes]] = None) -> List[bytes]:
+        """Como renderizar, para um bloco já em memória (com as chaves das linhas, se já calculadas)"""
+        chaves = chaves if chaves is not None else [chave_linha(linha) for linha in linhas]
+        fragmentos = self.obter(assinatura_fragmento, chaves)
+        novos = {}
+        for chave, linha in zip(chaves, linhas):
+            if chave not in fragmentos:
+                fragmentos[chave] = novos[chave] = renderizar_linha(linha)
+        if novos:
+            self.gravar(assinatura_fragmento, novos)
+        self.renderizados += len(novos)
+        self.acertos += len(linhas) - len(novos)
+        return [fragmentos[chave] for chave in chaves]
+
+    def obter_metadado(self, chave: str) -> Optional[str]:
+        with self.conexao:
+            linha = self.conexao.execute("SELECT valor FROM metadados WHERE chave = ?", (chave,)).fetchone()
+            if linha:
+                self.conexao.execute("UPDATE metadados SET acesso = ? WHERE chave = ?", (int(time.time()), chave))
+        return linha[0] if linha else None
+
+    def gravar_metadado(self, chave: str, valor: str):
+        with self.conexao:
+            self.conexao.execute("INSERT OR REPLACE INTO metadados (chave, valor, acesso) VALUES (?, ?, ?)",
+                                 (chave, valor, int(time.time())))
+
+    def limpar(self, assinatura_fragmento: Optional[str] = None):
+        """Remove os fragmentos de uma assinatura, ou todo o cache"""
+        with self.conexao:
+            if assinatura_fragmento is None:
+                self.conexao.execute("DELETE FROM fragmentos")
+                self.conexao.execute("DELETE FROM metadados")
+            else:
+                self.conexao.execute("DELETE FROM fragmentos WHERE assinatura = ?", (assinatura_fragmento,))
+
+    def close(self):
+        if self._conexao is not None:
+            self._conexao.close()
+            self._conexao = None
+
+
+# Exemplo de uso e benchmark: regeneração após alterar poucas fundações
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from src.lct_calculator.interfaces.report_generator import ReportGenerator
+
+    colunas = ["id", "tipo", "fck", "volume_concreto", "quantidade_barras", "resultado"]
+    linhas = [[i, ("sapata", "bloco", "estaca", "tubulão")[i % 4], 25.0 + i % 3 * 5, 1.5 + i / 997,
+               8.0 + i % 5, f'{{"Volume de Concreto (m³)": {1.5 + i / 997:.4f}}}'] for i in range(100_000)]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        cache = CacheFragmentos(os.path.join(diretorio, "cache.db"))
+        gerador = ReportGenerator(linhas, "Benchmark", "-", colunas=colunas, cache=cache)
+        sem_cache = ReportGenerator(linhas, "Benchmark", "-", colunas=colunas)
+        for formato in ("csv", "json", "pdf"):
+            caminho = os.path.join(diretorio, f"relatorio.{formato}")
+            inicio = time.perf_counter()
+            sem_cache.gerar_relatorio(formato, caminho)
+            completo = time.perf_counter() - inicio
+
+            gerador.gerar_relatorio(formato, caminho)
+            for linha in linhas[::10_000]:
+                linha[3] += 0.1
+            cache.acertos = cache.renderizados = 0
+            inicio = time.perf_counter()
+            gerador.gerar_relatorio(formato, caminho)
+            incremental = time.perf_counter() - inicio
+            print(f"{formato}: completo {completo:.2f} s, após alterar 10 linhas {incremental:.2f} s "
+                  f"({cache.renderizados} fragmentos renderizados, {cache.acertos} do cache)")
@@ -0,0 +1,143 @@
+import bz2
+import gzip
+import io
+import logging
+import lzma
+import os
+import zipfile
+from typing import IO, Optional
+
+import ifcopenshell
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Assinaturas (magic bytes) -> formato de compressão
+ASSINATURAS = (
+    (b"\x1f\x8b", "gzip"),
+    (b"\x28\xb5\x2f\xfd", "zstd"),
+    (b"PK\x03\x04", "zip"),
+    (b"BZh", "bz2"),
+    (b"\xfd7zXZ\x00", "xz"),
+)
+
+# Extensão -> formato usado na gravação quando a compressão não é informada
+EXTENSOES_COMPRESSAO = {".gz": "gzip", ".zst": "zstd", ".zip": "zip", ".ifczip": "zip", ".bz2": "bz2", ".xz": "xz"}
+
+
+def detectar_compressao(caminho_arquivo: str) -> Optional[str]:
+    """Retorna o formato de compressão do arquivo pelas assinaturas iniciais, ou None se não comprimido"""
+    with open(caminho_arquivo, 'rb') as arquivo:
+        inicio = arquivo.read(6)
+    for assinatura, formato in ASSINATURAS:
+        if inicio.startswith(assinatura):
+            return formato
+    return None
+
+
+def extensao_base(caminho_arquivo: str) -> str:
+    """
+    Retorna a extensão do conteúdo, ignorando o sufixo de compressão
+    (ex.: "dados.csv.gz" -> ".csv", "modelo.ifczip" -> ".ifc").
+    """
+    raiz, extensao = os.path.splitext(caminho_arquivo.lower())
+    if extensao == ".ifczip":
+        return ".ifc"
+    if extensao in EXTENSOES_COMPRESSAO:
+        return os.path.splitext(raiz)[1]
+    return extensao
+
+
+def _zstandard():
+    try:
+        import zstandard
+    except ImportError:
+        raise ImportError("Arquivos .zst exigem o pacote opcional 'zstandard' (pip install zstandard).")
+    return zstandard
+
+
+def _membro_zip(arquivo_zip: zipfile.ZipFile) -> str:
+    """Escolhe o membro de dados do zip: o primeiro .ifc (para .ifczip) ou o primeiro arquivo"""
+    membros = [nome for nome in arquivo_zip.namelist() if not nome.endswith("/")]
+    if not membros:
+        raise ValueError("Arquivo zip vazio.")
+    return next((nome for nome in membros if nome.lower().endswith(".ifc")), membros[0])
+
+
+def abrir_leitura(caminho_arquivo: str) -> IO[bytes]:
+    """
+    Abre o arquivo para leitura binária, descomprimindo em fluxo conforme as assinaturas
+    detectadas (gzip, zstd, zip/ifczip, bz2, xz) ou lendo-o diretamente se não comprimido.
+    """
+    formato = detectar_compressao(caminho_arquivo)
+    if formato == "gzip":
+        return gzip.open(caminho_arquivo, 'rb')
+    if formato == "bz2":
+        return bz2.open(caminho_arquivo, 'rb')
+    if formato == "xz":
+        return lzma.open(caminho_arquivo, 'rb')
+    if formato == "zstd":
+        return _zstandard().open(caminho_arquivo, 'rb')
+    if formato == "zip":
+        # O membro mantém o arquivo aberto mesmo após fechar o ZipFile
+        with zipfile.ZipFile(caminho_arquivo) as arquivo_zip:
+            return arquivo_zip.open(_membro_zip(arquivo_zip))
+    return open(caminho_arquivo, 'rb')
+
+
+def abrir_texto(caminho_arquivo: str, encoding: str = "utf-8", newline: Optional[str] = None) -> IO[str]:
+    """Abre o arquivo, comprimido ou não, para leitura em modo texto"""
+    return io.TextIOWrapper(abrir_leitura(caminho_arquivo), encoding=encoding, newline=newline)
+
+
+class _EscritaZip(io.TextIOWrapper):
+    """Texto gravado em um membro de zip; fecha o membro e depois o próprio zip"""
+
+    def __init__(self, arquivo_zip: zipfile.ZipFile, membro: str, encoding: str, newline: Optional[str]):
+        self._arquivo_zip = arquivo_zip
+        super().__init__(arquivo_zip.open(membro, 'w'), encoding=encoding, newline=newline)
+
+    def close(self):
+        try:
+            super().close()
+        finally:
+            self._arquivo_zip.close()
+
+
+def abrir_escrita(caminho_arquivo: str, compressao: Optional[str] = None, encoding: str = "utf-8",
+                  newline: Optional[str] = None) -> IO[str]:
+    """
+    Abre o arquivo para gravação em modo texto, comprimindo em fluxo.
+
+    :param caminho_arquivo: Caminho de destino.
+    :param compressao: "gzip", "zstd", "zip", "bz2", "xz" ou "nenhuma"; se None, é deduzida
+        da extensão (.gz, .zst, .zip/.ifczip, .bz2, .xz).
+    :param encoding: Codificação do texto.
+    :param newline: Tratamento de fim de linha (como em open).
+    :return: Arquivo de texto aberto para escrita.
+    """
+    if compressao is None:
+        compressao = EXTENSOES_COMPRESSAO.get(os.path.splitext(caminho_arquivo.lower())[1], "nenhuma")
+    if compressao == "nenhuma":
+        return open(caminho_arquivo, 'w', encoding=encoding, newline=newline)
+    if compressao == "gzip":
+        return gzip.open(caminho_arquivo, 'wt', encoding=encoding, newline=newline)
+    if compressao == "bz2":
+        return bz2.open(caminho_arquivo, 'wt', encoding=encoding, newline=newline)
+    if compressao == "xz":
+        return lzma.open(caminho_arquivo, 'wt', encoding=encoding, newline=newline)
+    if compressao == "zstd":
+        return _zstandard().open(caminho_arquivo, 'wt', encoding=encoding, newline=newline)
+    if compressao == "zip":
+        raiz, extensao = os.path.splitext(os.path.basename(caminho_arquivo))
+        membro = raiz + ".ifc" if extensao.lower() == ".ifczip" else raiz
+        return _EscritaZip(zipfile.ZipFile(caminho_arquivo, 'w', zipfile.ZIP_DEFLATED), membro, encoding, newline)
+    raise ValueError(f"Compressão '{compressao}' não suportada.")
+
+
+def abrir_ifc(caminho_arquivo: str) -> ifcopenshell.file:
+    """Abre um modelo IFC, descomprimindo-o em memória quando estiver comprimido (.ifczip, .ifc.gz...)"""
+    if detectar_compressao(caminho_arquivo) is None:
+        return ifcopenshell.open(caminho_arquivo)
+    with abrir_texto(caminho_arquivo) as arquivo:
+        return ifcopenshell.file.from_string(arquivo.read())
@@ -0,0 +1,184 @@
+import logging
+from typing import Any, Callable, Dict, List, Mapping, Sequence, Union
+
+import numpy as np
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Faixa de fck (MPa) das classes de concreto estrutural C20 a C90 da NBR 6118
+FCK_MINIMO = 20.0
+FCK_MAXIMO = 90.0
+
+
+class Regra:
+    """
+    Regra de validação declarativa: uma condição avaliada sobre colunas inteiras, que retorna
+    a máscara booleana das linhas válidas.
+    """
+
+    def __init__(self, colunas: Sequence[str], condicao: Callable[..., np.ndarray], motivo: str):
+        """
+        :param colunas: Colunas usadas pela condição, na ordem dos argumentos.
+        :param condicao: Função que recebe os arrays das colunas e retorna True nas linhas válidas.
+        :param motivo: Descrição do problema reportada nas linhas inválidas.
+        """
+        self.colunas = tuple(colunas)
+        self.condicao = condicao
+        self.motivo = motivo
+
+    def avaliar(self, dados: Mapping[str, np.ndarray]) -> np.ndarray:
+        with np.errstate(invalid="ignore"):
+            return np.asarray(self.condicao(*(dados[coluna] for coluna in self.colunas)), dtype=bool)
+
+
+def positivo(coluna: str) -> Regra:
+    return Regra((coluna,), lambda v: v > 0, f"{coluna} deve ser maior que zero")
+
+
+def nao_negativo(coluna: str) -> Regra:
+    return Regra((coluna,), lambda v: v >= 0, f"{coluna} não pode ser negativo")
+
+
+def intervalo(coluna: str, minimo: float, maximo: float) -> Regra:
+    return Regra((coluna,), lambda v: (v >= minimo) & (v <= maximo),
+                 f"{coluna} fora do intervalo [{minimo:g}, {maximo:g}]")
+
+
+def menor_que(coluna: str, limite: str, fator: float = 1.0, unidades: Sequence[str] = ()) -> Regra:
+    """
+    Regra coluna * fator < limite. `fator` converte a coluna para a unidade do limite quando as
+    duas estão em unidades diferentes (ex.: cobrimento em mm e altura em m), e `unidades` as
+    identifica na mensagem.
+    """
+    nomes = [f"{nome} ({unidade})" for nome, unidade in zip((coluna, limite), unidades)] or [coluna, limite]
+    return Regra((coluna, limite), lambda v, l: v * fator < l, f"{nomes[0]} deve ser menor que {nomes[1]}")
+
+
+def _fck() -> Regra:
+    return intervalo("fck", FCK_MINIMO, FCK_MAXIMO)
+
+
+# Esquema de validação por tipo de fundação, com os parâmetros de cada calculador.
+# Valores ausentes (NaN) falham em todas as comparações e são reportados pela mesma regra.
+ESQUEMAS_VALIDACAO: Dict[str, List[Regra]] = {
+    "sapata": [positivo("carga"), _fck(), positivo("base"), positivo("altura"), positivo("capacidade_solo")],
+    "bloco": [positivo("carga"), _fck(), positivo("largura"), positivo("comprimento"), positivo("altura")],
+    "estaca": [positivo("carga"), _fck(), positivo("diametro"), positivo("comprimento"),
+               positivo("capacidade_solo")],
+    "tubulão": [positivo("carga"), _fck(), positivo("diametro"), positivo("altura"),
+                nao_negativo("escavacao_prof"), nao_negativo("profundidade_agua")],
+    "radier": [positivo("carga_total"), _fck(), positivo("area"), positivo("espessura"),
+               positivo("capacidade_solo")],
+    "barrete": [positivo("carga"), _fck(), positivo("largura"), positivo("altura"), positivo("comprimento"),
+                positivo("capacidade_solo")],
+    "sapata_corrida": [positivo("largura_base"), positivo("altura_sapata"), positivo("comprimento_sapata"), _fck(),
+                       positivo("carga_kN"), positivo("cobrimento"),
+                       menor_que("cobrimento", "altura_sapata", fator=0.001, unidades=("mm", "m")),
+                       positivo("diametro_aco"), intervalo("angulo_atrito_solo", 0, 90),
+                       positivo("peso_proprio_solo")],
+    "estaca_helice_continua": [positivo("diametro_estaca"), positivo("profundidade_estaca"), _fck(),
+                               positivo("fyk"), positivo("carga_vertical_kN"), positivo("tensao_admissivel_solo"),
+                               positivo("cobrimento"), positivo("diametro_aco"), positivo("peso_concreto")],
+    "tubulão_céu_aberto": [positivo("carga"), _fck(), positivo("diametro"), positivo("profundidade"),
+                           positivo("capacidade_solo")],
+    "tubulão_sob_ar_comprimido": [positivo("carga"), _fck(), positivo("diametro"), positivo("profundidade"),
+                                  positivo("capacidade_solo"), positivo("pressao_ar")],
+}
+
+
+class ResultadoValidacao:
+    """Resultado da validação: máscara das linhas válidas e as violações (linha, regra) encontradas"""
+
+    def __init__(self, validas: np.ndarray, linhas: np.ndarray, regras: np.ndarray,
+                 esquema: Sequence[Regra], linha_inicial: int = 0):
+        self.validas = validas
+        self.linhas = linhas
+        self.regras = regras
+        self.esquema = esquema
+        self.linha_inicial = linha_inicial
+
+    def __bool__(self) -> bool:
+        return bool(self.validas.all())
+
+    @property
+    def linhas_invalidas(self) -> np.ndarray:
+        """Índices (com o deslocamento linha_inicial) das linhas com ao menos uma violação"""
+        return np.flatnonzero(~self.validas) + self.linha_inicial
+
+    def erros(self) -> List[Dict[str, Any]]:
+        """Lista de violações, ordenada por linha: {"linha", "colunas", "motivo"}"""
+        return [
+            {"linha": int(linha) + self.linha_inicial, "colunas": self.esquema[regra].colunas,
+             "motivo": self.esquema[regra].motivo}
+            for linha, regra in zip(self.linhas.tolist(), self.regras.tolist())
+        ]
+
+
+class DataValidator:
+    """
+    Validação vetorizada dos dados importados, antes de chegarem aos calculadores.
+
+    Cada regra do esquema é avaliada sobre as colunas inteiras como máscara booleana do NumPy;
+    todas as violações de todas as linhas são coletadas em uma única passada, sem laço por linha.
+    """
+
+    @staticmethod
+    def validar(dados: Mapping[str, Any], esquema: Union[str, Sequence[Regra]],
+                linha_inicial: int = 0) -> ResultadoValidacao:
+        """
+        Valida um conjunto de colunas.
+
+        :param dados: Dicionário {coluna: valores}, como os blocos de LeitorCSVTipado.blocos.
+        :param esquema: Tipo de fundação (chave de ESQUEMAS_VALIDACAO) ou lista de regras.
+        :param linha_inicial: Número da primeira linha, para reportar posições ao validar em blocos.
+        :return: ResultadoValidacao com a máscara das linhas válidas e as violações.
+        """
+        if isinstance(esquema, str):
+            if esquema not in ESQUEMAS_VALIDACAO:
+                raise ValueError(f"Tipo de fundação '{esquema}' não possui esquema de validação.")
+            esquema = ESQUEMAS_VALIDACAO[esquema]
+        colunas = {coluna for regra in esquema for coluna in regra.colunas}
+        ausentes = sorted(colunas - set(dados))
+        if ausentes:
+            raise ValueError(f"Colunas ausentes para validação: {', '.join(ausentes)}")
+
+        arrays = {coluna: np.asarray(dados[coluna], dtype=float) for coluna in colunas}
+        tamanhos = {len(valores) for valores in arrays.values()}
+        if len(tamanhos) > 1:
+            raise ValueError("As colunas informadas têm tamanhos diferentes.")
+        quantidade = tamanhos.pop() if tamanhos else 0
+
+        # Matriz regras x linhas com True nas violações
+        violacoes = np.zeros((len(esquema), quantidade), dtype=bool)
+        for indice, regra in enumerate(esquema):
+            np.logical_not(regra.avaliar(arrays), out=violacoes[indice])
+        regras, linhas = np.nonzero(violacoes)
+        ordem = np.argsort(linhas, kind="stable")
+        resultado = ResultadoValidacao(~violacoes.any(axis=0), linhas[ordem], regras[ordem], esquema, linha_inicial)
+        if len(linhas):
+            logging.warning(f"Validação: {len(resultado.linhas_invalidas)} de {quantidade} linhas inválidas.")
+        return resultado
+
+
+# Exemplo de uso e benchmark
+if __name__ == "__main__":
+    import time
+
+    quantidade = 1_000_000
+    gerador = np.random.default_rng(0)
+    dados = {
+        "carga": gerador.uniform(-10, 500, quantidade),
+        "fck": gerador.choice([15.0, 25.0, 30.0, 40.0], quantidade),
+        "base": gerador.uniform(0, 3, quantidade),
+        "altura": gerador.uniform(0.3, 2, quantidade),
+        "capacidade_solo": gerador.uniform(100, 400, quantidade),
+    }
+    dados["base"][::1000] = np.nan
+
+    inicio = time.perf_counter()
+    resultado = DataValidator.validar(dados, "sapata")
+    duracao = time.perf_counter() - inicio
+    print(f"{quantidade} linhas validadas em {duracao * 1000:.1f} ms: "
+          f"{len(resultado.linhas_invalidas)} inválidas, {len(resultado.linhas)} violações")
+    print(resultado.erros()[:3])
@@ -2,7 +2,9 @@ import os
 import json
 import csv
 import logging
-from typing import Dict, List, Any, Union
+from typing import Dict, List, Any, Optional, Union
+
+from src.lct_calculator.helpers.compression import abrir_escrita, abrir_texto, extensao_base
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
@@ -17,7 +19,7 @@ class FileHelper:
     def carregar_arquivo(filepath: str) -> Union[Dict, List, None]:
         """
         Carrega um arquivo e retorna seus dados em formato apropriado (lista ou dicionário).
-        Suporta JSON e CSV.
+        Suporta JSON e CSV, inclusive comprimidos (gzip, zstd, zip, bz2, xz), detectados pelo conteúdo.
         
         :param filepath: Caminho para o arquivo a ser carregado.
         :return: Dados do arquivo em formato de lista ou dicionário.
@@ -26,7 +28,7 @@ class FileHelper:
             logging.error(f"Arquivo {filepath} não encontrado.")
             raise FileNotFoundError(f"Arquivo {filepath} não encontrado.")
         
-        extensao = os.path.splitext(filepath)[1].lower()
+        extensao = extensao_base(filepath)
 
         try:
             if extensao == ".json":
@@ -41,13 +43,16 @@ class FileHelper:
             raise
 
     @staticmethod
-    def salvar_arquivo(filepath: str, dados: Union[Dict, List], formato: str = "json") -> None:
+    def salvar_arquivo(filepath: str, dados: Union[Dict, List], formato: str = "json",
+                       compressao: Optional[str] = None) -> None:
         """
         Salva os dados fornecidos em um arquivo. Suporta JSON e CSV.
         
         :param filepath: Caminho onde o arquivo será salvo.
         :param dados: Dados a serem salvos (dicionário ou lista).
         :param formato: Formato de saída ('json' ou 'csv').
+        :param compressao: Compressão da saída ('gzip', 'zstd', 'zip', 'bz2', 'xz' ou 'nenhuma');
+            se não informada, é deduzida da extensão do arquivo (ex.: '.json.gz').
         """
         if formato not in ["json", "csv"]:
             logging.error(f"Formato {formato} não suportado para exportação.")
@@ -55,9 +60,9 @@ class FileHelper:
 
         try:
             if formato == "json":
-                FileHelper._salvar_json(filepath, dados)
+                FileHelper._salvar_json(filepath, dados, compressao)
             elif formato == "csv":
-                FileHelper._salvar_csv(filepath, dados)
+                FileHelper._salvar_csv(filepath, dados, compressao)
             logging.info(f"Arquivo salvo com sucesso em {filepath}")
         except Exception as e:
             logging.error(f"Erro ao salvar o arquivo {filepath}: {str(e)}")
@@ -67,17 +72,17 @@ class FileHelper:
     def _carregar_json(filepath: str) -> Dict:
         """Carrega um arquivo JSON e retorna os dados como um dicionário."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as json_file:
+            with abrir_texto(filepath) as json_file:
                 return json.load(json_file)
         except json.JSONDecodeError as e:
             logging.error(f"Erro ao decodificar JSON no arquivo {filepath}: {str(e)}")
             raise
 
     @staticmethod
-    def _salvar_json(filepath: str, dados: Dict) -> None:
+    def _salvar_json(filepath: str, dados: Dict, compressao: Optional[str] = None) -> None:
         """Salva dados em formato JSON no arquivo especificado."""
         try:
-            with open(filepath, 'w', encoding='utf-8') as json_file:
+            with abrir_escrita(filepath, compressao) as json_file:
                 json.dump(dados, json_file, ensure_ascii=False, indent=4)
         except IOError as e:
             logging.error(f"Erro de I/O ao salvar JSON no arquivo {filepath}: {str(e)}")
@@ -87,7 +92,7 @@ class FileHelper:
     def _carregar_csv(filepath: str) -> List[Dict[str, Any]]:
         """Carrega um arquivo CSV e retorna os dados como uma lista de dicionários."""
         try:
-            with open(filepath, 'r', encoding='utf-8') as csv_file:
+            with abrir_texto(filepath, newline='') as csv_file:
                 reader = csv.DictReader(csv_file)
                 return [row for row in reader]
         except csv.Error as e:
@@ -95,14 +100,14 @@ class FileHelper:
             raise
 
     @staticmethod
-    def _salvar_csv(filepath: str, dados: List[Dict[str, Any]]) -> None:
+    def _salvar_csv(filepath: str, dados: List[Dict[str, Any]], compressao: Optional[str] = None) -> None:
         """Salva dados em formato CSV no arquivo especificado."""
         if not isinstance(dados, list) or not all(isinstance(row, dict) for row in dados):
             logging.error("Dados fornecidos para CSV não estão no formato correto.")
             raise ValueError("Dados fornecidos para CSV devem ser uma lista de dicionários.")
 
         try:
-            with open(filepath, 'w', newline='', encoding='utf-8') as csv_file:
+            with abrir_escrita(filepath, compressao, newline='') as csv_file:
                 writer = csv.DictWriter(csv_file, fieldnames=dados[0].keys())
                 writer.writeheader()
                 writer.writerows(dados)
@@ -0,0 +1,134 @@
+import hashlib
+import json
+import logging
+import os
+import tempfile
+from pathlib import Path
+from typing import Any, Callable, Dict, Optional
+
+import ifcopenshell
+
+from src.lct_calculator.database import diretorio_dados_padrao
+from src.lct_calculator.helpers.compression import abrir_ifc
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Arquivo que associa cada caminho de IFC à sua última impressão digital conhecida
+NOME_INDICE = "indice.json"
+
+# Bytes lidos por vez ao calcular o hash dos arquivos
+TAMANHO_LEITURA_HASH = 1024 * 1024
+
+
+def _gravar_atomico(caminho: Path, dados: Any):
+    """Grava o JSON em um arquivo temporário e o move para o destino, sem deixar arquivos parciais"""
+    descritor, temporario = tempfile.mkstemp(dir=caminho.parent, suffix=".tmp")
+    try:
+        with os.fdopen(descritor, 'w', encoding='utf-8') as arquivo:
+            json.dump(dados, arquivo, ensure_ascii=False, separators=(",", ":"))
+        os.replace(temporario, caminho)
+    except BaseException:
+        os.unlink(temporario)
+        raise
+
+
+class CacheExtracaoIFC:
+    """
+    Cache em disco dos dados extraídos de modelos IFC.
+
+    Cada extração é guardada por hash do conteúdo do arquivo e chave do extrator. O índice guarda
+    tamanho e mtime de cada caminho já visto: se ambos não mudaram, o hash gravado é reutilizado
+    sem reler o arquivo; caso contrário o hash é recalculado, e um arquivo apenas copiado ou tocado
+    continua encontrando a mesma extração.
+    """
+
+    def __init__(self, diretorio: Optional[os.PathLike] = None):
+        """
+        :param diretorio: Diretório do cache (padrão: "cache_ifc" no diretório de dados).
+        """
+        self.diretorio = Path(diretorio) if diretorio is not None else diretorio_dados_padrao() / "cache_ifc"
+        self.diretorio.mkdir(parents=True, exist_ok=True)
+        self._caminho_indice = self.diretorio / NOME_INDICE
+
+    def _ler_indice(self) -> Dict[str, Dict[str, Any]]:
+        try:
+            with open(self._caminho_indice, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return {}
+
+    def impressao_digital(self, caminho_arquivo: str) -> Dict[str, Any]:
+        """
+        Retorna tamanho, mtime (ns) e hash SHA-256 do arquivo, reaproveitando o hash do índice
+        quando tamanho e mtime não mudaram.
+        """
+        caminho = os.path.realpath(caminho_arquivo)
+        estado = os.stat(caminho)
+        impressao = {"tamanho": estado.st_size, "mtime_ns": estado.st_mtime_ns}
+        indice = self._ler_indice()
+        anterior = indice.get(caminho)
+        if anterior and all(anterior.get(campo) == valor for campo, valor in impressao.items()):
+            return anterior
+
+        resumo = hashlib.sha256()
+        with open(caminho, 'rb') as arquivo:
+            while bloco := arquivo.read(TAMANHO_LEITURA_HASH):
+                resumo.update(bloco)
+        impressao["hash"] = resumo.hexdigest()
+        indice[caminho] = impressao
+        _gravar_atomico(self._caminho_indice, indice)
+        return impressao
+
+    def _caminho_entrada(self, hash_arquivo: str, chave_extrator: str) -> Path:
+        chave = hashlib.sha256(chave_extrator.encode("utf-8")).hexdigest()[:16]
+        return self.diretorio / f"{hash_arquivo}_{chave}.json"
+
+    def obter(self, caminho_arquivo: str, chave_extrator: str) -> Optional[Any]:
+        """Retorna a extração guardada para o arquivo e o extrator, ou None se não houver"""
+        entrada = self._caminho_entrada(self.impressao_digital(caminho_arquivo)["hash"], chave_extrator)
+        try:
+            with open(entrada, 'r', encoding='utf-8') as arquivo:
+                return json.load(arquivo)
+        except FileNotFoundError:
+            return None
+        except json.JSONDecodeError:
+            logging.warning(f"Entrada de cache IFC corrompida descartada: {entrada}")
+            entrada.unlink(missing_ok=True)
+            return None
+
+    def gravar(self, caminho_arquivo: str, chave_extrator: str, dados: Any):
+        """Guarda a extração (serializável em JSON) do arquivo para o extrator informado"""
+        entrada = self._caminho_entrada(self.impressao_digital(caminho_arquivo)["hash"], chave_extrator)
+        _gravar_atomico(entrada, dados)
+
+    def extrair(self, caminho_arquivo: str, extrator: Callable[[ifcopenshell.file], Any],
+                chave_extrator: Optional[str] = None) -> Any:
+        """
+        Retorna a extração do cache ou, na ausência dela, abre o IFC, executa o extrator e guarda o resultado.
+
+        :param caminho_arquivo: Caminho do arquivo IFC.
+        :param extrator: Função que recebe o modelo aberto e retorna dados serializáveis em JSON.
+        :param chave_extrator: Identifica o extrator e sua versão (padrão: nome qualificado da função);
+            deve mudar sempre que o formato da extração mudar.
+        :return: Dados extraídos.
+        """
+        if not os.path.exists(caminho_arquivo):
+            logging.error(f"Arquivo IFC não encontrado: {caminho_arquivo}")
+            raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
+        chave_extrator = chave_extrator or f"{extrator.__module__}.{extrator.__qualname__}"
+
+        dados = self.obter(caminho_arquivo, chave_extrator)
+        if dados is not None:
+            logging.info(f"Extração do IFC {caminho_arquivo} carregada do cache.")
+            return dados
+
+        dados = extrator(abrir_ifc(caminho_arquivo))
+        self.gravar(caminho_arquivo, chave_extrator, dados)
+        logging.info(f"Extração do IFC {caminho_arquivo} gravada no cache.")
+        return dados
+
+    def limpar(self):
+        """Remove todas as extrações e o índice do cache"""
+        for entrada in self.diretorio.glob("*.json"):
+            entrada.unlink(missing_ok=True)
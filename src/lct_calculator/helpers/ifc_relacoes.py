@@ -0,0 +1,158 @@
+import logging
+from typing import Any, Dict, List, Optional
+
+import ifcopenshell
+import ifcopenshell.util.element
+import ifcopenshell.util.placement
+import numpy as np
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+
+class IndiceRelacoesIFC:
+    """
+    Índices das relações de um modelo IFC, construídos com uma única passada por tipo de relação.
+
+    Substitui a navegação por atributos inversos elemento a elemento: propriedades, tipo, materiais,
+    contêiner espacial e conexões entre elementos passam a ser consultas em dicionários, e conjuntos
+    de propriedades ou materiais compartilhados por vários elementos são convertidos uma única vez.
+    """
+
+    def __init__(self, modelo_ifc: ifcopenshell.file):
+        """
+        :param modelo_ifc: Objeto ifcopenshell.file carregado.
+        """
+        self.modelo_ifc = modelo_ifc
+        self._definicoes: Dict[int, List[ifcopenshell.entity_instance]] = {}
+        self._tipos: Dict[int, ifcopenshell.entity_instance] = {}
+        self._materiais: Dict[int, ifcopenshell.entity_instance] = {}
+        self._contenedores: Dict[int, ifcopenshell.entity_instance] = {}
+        self._conexoes: Dict[int, List[ifcopenshell.entity_instance]] = {}
+        self._cache_psets: Dict[int, Dict[str, Any]] = {}
+        self._cache_materiais: Dict[int, List[str]] = {}
+        self._cache_posicionamentos: Dict[int, np.ndarray] = {}
+
+        for relacao in modelo_ifc.by_type("IfcRelDefinesByProperties"):
+            definicoes = relacao.RelatingPropertyDefinition
+            definicoes = list(definicoes) if isinstance(definicoes, tuple) else [definicoes]
+            for objeto in relacao.RelatedObjects:
+                self._definicoes.setdefault(objeto.id(), []).extend(definicoes)
+        for relacao in modelo_ifc.by_type("IfcRelDefinesByType"):
+            for objeto in relacao.RelatedObjects:
+                self._tipos[objeto.id()] = relacao.RelatingType
+        for relacao in modelo_ifc.by_type("IfcRelAssociatesMaterial"):
+            for objeto in relacao.RelatedObjects:
+                self._materiais[objeto.id()] = relacao.RelatingMaterial
+        for relacao in modelo_ifc.by_type("IfcRelContainedInSpatialStructure"):
+            for elemento in relacao.RelatedElements:
+                self._contenedores[elemento.id()] = relacao.RelatingStructure
+        # Inclui os subtipos (IfcRelConnectsPathElements, IfcRelConnectsWithRealizingElements)
+        for relacao in modelo_ifc.by_type("IfcRelConnectsElements"):
+            if relacao.RelatingElement is None or relacao.RelatedElement is None:
+                continue
+            self._conexoes.setdefault(relacao.RelatingElement.id(), []).append(relacao.RelatedElement)
+            self._conexoes.setdefault(relacao.RelatedElement.id(), []).append(relacao.RelatingElement)
+
+    def tipo(self, elemento: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """Retorna o tipo (IfcTypeObject) associado ao elemento, se houver"""
+        return self._tipos.get(elemento.id())
+
+    def contenedor(self, elemento: ifcopenshell.entity_instance) -> Optional[ifcopenshell.entity_instance]:
+        """Retorna a estrutura espacial (pavimento, edifício...) que contém o elemento"""
+        return self._contenedores.get(elemento.id())
+
+    def conectados(self, elemento: ifcopenshell.entity_instance) -> List[ifcopenshell.entity_instance]:
+        """Retorna os elementos ligados ao elemento por IfcRelConnectsElements, nos dois sentidos"""
+        return list(self._conexoes.get(elemento.id(), ()))
+
+    def _pset(self, definicao: ifcopenshell.entity_instance) -> Dict[str, Any]:
+        if definicao.id() not in self._cache_psets:
+            propriedades = ifcopenshell.util.element.get_property_definition(definicao) or {}
+            self._cache_psets[definicao.id()] = {**propriedades, "id": definicao.id()}
+        return self._cache_psets[definicao.id()]
+
+    def propriedades(self, elemento: ifcopenshell.entity_instance) -> Dict[str, Dict[str, Any]]:
+        """
+        Retorna os conjuntos de propriedades e quantidades do elemento, no formato de
+        ifcopenshell.util.element.get_psets: os do tipo primeiro, sobrescritos pelos da ocorrência.
+        """
+        resultado: Dict[str, Dict[str, Any]] = {}
+        tipo = self.tipo(elemento)
+        if tipo is not None:
+            for definicao in tipo.HasPropertySets or ():
+                resultado[definicao.Name] = dict(self._pset(definicao))
+        for definicao in self._definicoes.get(elemento.id(), ()):
+            resultado.setdefault(definicao.Name, {}).update(self._pset(definicao))
+        return resultado
+
+    def _nomes_material(self, material: ifcopenshell.entity_instance) -> List[str]:
+        if material.id() in self._cache_materiais:
+            return self._cache_materiais[material.id()]
+        if material.is_a("IfcMaterial"):
+            nomes = [material.Name]
+        elif material.is_a("IfcMaterialLayerSetUsage"):
+            nomes = self._nomes_material(material.ForLayerSet)
+        elif material.is_a("IfcMaterialLayerSet"):
+            nomes = [camada.Material.Name for camada in material.MaterialLayers if camada.Material]
+        elif material.is_a("IfcMaterialProfileSetUsage"):
+            nomes = self._nomes_material(material.ForProfileSet)
+        elif material.is_a("IfcMaterialProfileSet"):
+            nomes = [perfil.Material.Name for perfil in material.MaterialProfiles if perfil.Material]
+        elif material.is_a("IfcMaterialConstituentSet"):
+            nomes = [constituinte.Material.Name for constituinte in material.MaterialConstituents or ()
+                     if constituinte.Material]
+        elif material.is_a("IfcMaterialList"):
+            nomes = [item.Name for item in material.Materials]
+        else:
+            nomes = []
+        self._cache_materiais[material.id()] = nomes
+        return nomes
+
+    def materiais(self, elemento: ifcopenshell.entity_instance) -> List[str]:
+        """Retorna os nomes dos materiais do elemento (ou, na falta deles, os do seu tipo)"""
+        material = self._materiais.get(elemento.id())
+        if material is None and self.tipo(elemento) is not None:
+            material = self._materiais.get(self.tipo(elemento).id())
+        return list(self._nomes_material(material)) if material is not None else []
+
+    def matriz_posicionamento(self, posicionamento: ifcopenshell.entity_instance) -> np.ndarray:
+        """
+        Retorna a matriz 4x4 absoluta do posicionamento. As matrizes da cadeia PlacementRelTo
+        (terreno, edifício, pavimento) são calculadas uma vez e reaproveitadas por todos os elementos.
+        """
+        if posicionamento.id() in self._cache_posicionamentos:
+            return self._cache_posicionamentos[posicionamento.id()]
+        if not posicionamento.is_a("IfcLocalPlacement"):
+            matriz = ifcopenshell.util.placement.get_local_placement(posicionamento)
+        else:
+            relativo = posicionamento.RelativePlacement
+            if relativo.is_a("IfcAxis2Placement3D") and relativo.Axis is None and relativo.RefDirection is None:
+                # Caso mais comum (apenas translação), sem as operações vetoriais do util.placement
+                matriz = np.eye(4)
+                matriz[:3, 3] = relativo.Location.Coordinates
+            else:
+                matriz = ifcopenshell.util.placement.get_axis2placement(relativo)
+            if posicionamento.PlacementRelTo is not None:
+                matriz = self.matriz_posicionamento(posicionamento.PlacementRelTo) @ matriz
+        self._cache_posicionamentos[posicionamento.id()] = matriz
+        return matriz
+
+    def descrever(self, elemento: ifcopenshell.entity_instance) -> Dict[str, Any]:
+        """Reúne em um dicionário os dados e as relações do elemento"""
+        tipo = self.tipo(elemento)
+        contenedor = self.contenedor(elemento)
+        posicao = [0.0, 0.0, 0.0]
+        if elemento.ObjectPlacement is not None:
+            matriz = self.matriz_posicionamento(elemento.ObjectPlacement)
+            posicao = [float(v) for v in matriz[:3, 3]]
+        return {
+            "Classe": elemento.is_a(),
+            "Tipo": elemento.ObjectType or (tipo.Name if tipo is not None else None),
+            "Nome": elemento.Name,
+            "PredefinedType": getattr(elemento, "PredefinedType", None),
+            "Pavimento": contenedor.Name if contenedor is not None else None,
+            "Posicao": posicao,
+            "Materiais": self.materiais(elemento),
+            "Propriedades": self.propriedades(elemento),
+        }
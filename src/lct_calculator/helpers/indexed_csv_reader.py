@@ -0,0 +1,146 @@
+import csv
+import logging
+import mmap
+import os
+from typing import Dict, List, Optional, Tuple, Union
+
+import numpy as np
+
+from src.lct_calculator.helpers.compression import detectar_compressao
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Bytes examinados por vez na construção do índice (limita a memória temporária)
+TAMANHO_BLOCO_INDICE = 64 * 1024 * 1024
+
+# Posições do cabeçalho do índice persistido: tamanho e mtime do CSV, seguidos dos deslocamentos
+_CABECALHO_INDICE = 2
+
+
+class LeitorCSVIndexado:
+    """
+    Acesso aleatório às linhas de um CSV grande, via arquivo mapeado em memória.
+
+    Um índice com o deslocamento (em bytes) do início de cada linha é construído uma vez e
+    persistido ao lado do arquivo; as aberturas seguintes o mapeiam sem ler o CSV. Cada linha é
+    então lida em O(1), sem analisar as anteriores. Pressupõe que os campos não contêm quebras
+    de linha, como nas exportações do TQS.
+    """
+
+    def __init__(self, caminho_arquivo: str, delimitador: Optional[str] = None, encoding: str = "utf-8",
+                 caminho_indice: Optional[str] = None):
+        """
+        :param caminho_arquivo: Caminho do arquivo CSV (não comprimido).
+        :param delimitador: Separador de campos (padrão: ';' se presente no cabeçalho, senão ',').
+        :param encoding: Codificação do arquivo.
+        :param caminho_indice: Onde persistir o índice (padrão: "<arquivo>.idx.npy").
+        """
+        if not os.path.exists(caminho_arquivo):
+            logging.error(f"Arquivo CSV não encontrado: {caminho_arquivo}")
+            raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
+        if detectar_compressao(caminho_arquivo) is not None:
+            raise ValueError("Acesso aleatório exige um CSV não comprimido.")
+        self.caminho_arquivo = caminho_arquivo
+        self.encoding = encoding
+        self.caminho_indice = caminho_indice or f"{caminho_arquivo}.idx.npy"
+
+        self._arquivo = open(caminho_arquivo, 'rb')
+        estado = os.fstat(self._arquivo.fileno())
+        self.tamanho = estado.st_size
+        self._mapa = mmap.mmap(self._arquivo.fileno(), 0, access=mmap.ACCESS_READ) if self.tamanho else b""
+        self._deslocamentos = self._carregar_indice(estado.st_mtime_ns)
+
+        self.cabecalho: List[str] = []
+        if len(self._deslocamentos):
+            primeira = self._texto(0)
+            self.delimitador = delimitador or (";" if ";" in primeira else ",")
+            self.cabecalho = next(csv.reader([primeira], delimiter=self.delimitador))
+        else:
+            self.delimitador = delimitador or ","
+
+    def _carregar_indice(self, mtime_ns: int) -> np.ndarray:
+        """Mapeia o índice persistido se ainda corresponder ao arquivo; senão o reconstrói"""
+        try:
+            indice = np.load(self.caminho_indice, mmap_mode='r')
+            if len(indice) >= _CABECALHO_INDICE and indice[0] == self.tamanho and indice[1] == mtime_ns:
+                return indice[_CABECALHO_INDICE:]
+        except (OSError, ValueError):
+            pass
+
+        deslocamentos = self._construir_indice()
+        try:
+            np.save(self.caminho_indice, np.concatenate(([self.tamanho, mtime_ns], deslocamentos)).astype(np.int64))
+        except OSError as e:
+            logging.warning(f"Não foi possível gravar o índice {self.caminho_indice}: {e}")
+        return deslocamentos
+
+    def _construir_indice(self) -> np.ndarray:
+        """Localiza as quebras de linha bloco a bloco, de forma vetorizada"""
+        if not self.tamanho:
+            return np.zeros(0, dtype=np.int64)
+        partes = [np.zeros(1, dtype=np.int64)]
+        for inicio in range(0, self.tamanho, TAMANHO_BLOCO_INDICE):
+            bloco = np.frombuffer(self._mapa, dtype=np.uint8, count=min(TAMANHO_BLOCO_INDICE, self.tamanho - inicio),
+                                  offset=inicio)
+            partes.append(np.flatnonzero(bloco == ord("\n")).astype(np.int64) + inicio + 1)
+        deslocamentos = np.concatenate(partes)
+        # A quebra de linha final não inicia uma nova linha
+        deslocamentos = deslocamentos[deslocamentos < self.tamanho]
+        logging.info(f"Índice de {len(deslocamentos)} linhas construído para {self.caminho_arquivo}.")
+        return deslocamentos
+
+    def _limites(self, linha_fisica: int) -> Tuple[int, int]:
+        inicio = int(self._deslocamentos[linha_fisica])
+        fim = int(self._deslocamentos[linha_fisica + 1]) if linha_fisica + 1 < len(self._deslocamentos) else self.tamanho
+        return inicio, fim
+
+    def _texto(self, linha_fisica: int) -> str:
+        inicio, fim = self._limites(linha_fisica)
+        return self._mapa[inicio:fim].decode(self.encoding).rstrip("\r\n")
+
+    def __len__(self) -> int:
+        """Quantidade de linhas de dados (sem o cabeçalho)"""
+        return max(len(self._deslocamentos) - 1, 0)
+
+    def linha(self, indice: int) -> List[str]:
+        """Retorna os campos da linha de dados `indice` (aceita índices negativos)"""
+        if indice < 0:
+            indice += len(self)
+        if not 0 <= indice < len(self):
+            raise IndexError(f"Linha {indice} fora do arquivo ({len(self)} linhas).")
+        return next(csv.reader([self._texto(indice + 1)], delimiter=self.delimitador))
+
+    def __getitem__(self, chave: Union[int, slice]) -> Union[Dict[str, str], List[Dict[str, str]]]:
+        """Linha (ou fatia de linhas) como dicionário {coluna: valor}, no formato de carregar_csv"""
+        if isinstance(chave, slice):
+            return [self[i] for i in range(*chave.indices(len(self)))]
+        return dict(zip(self.cabecalho, self.linha(chave)))
+
+    def intervalo_bytes(self, inicio: int, fim: int) -> Tuple[int, int]:
+        """Retorna o intervalo de bytes [início, fim) que contém as linhas de dados inicio..fim-1"""
+        inicio, fim, _ = slice(inicio, fim).indices(len(self))
+        if inicio >= fim:
+            return 0, 0
+        return self._limites(inicio + 1)[0], self._limites(fim)[1]
+
+    def particoes(self, quantidade: int) -> List[Tuple[int, int]]:
+        """
+        Divide as linhas de dados em até `quantidade` partes contíguas de tamanho semelhante.
+
+        :return: Lista de intervalos de linhas (início, fim), que podem ser convertidos com
+            intervalo_bytes e lidos por outros processos diretamente do arquivo, sem cópias.
+        """
+        limites = np.linspace(0, len(self), max(min(quantidade, len(self)), 1) + 1).astype(int)
+        return [(int(a), int(b)) for a, b in zip(limites[:-1], limites[1:]) if b > a]
+
+    def close(self):
+        if isinstance(self._mapa, mmap.mmap):
+            self._mapa.close()
+        self._arquivo.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
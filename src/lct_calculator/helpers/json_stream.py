@@ -0,0 +1,257 @@
+import json
+import logging
+import os
+from typing import Any, IO, Iterator, List, Optional, Tuple
+
+from src.lct_calculator.helpers.compression import abrir_texto
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Eventos emitidos pelo leitor, no formato (prefixo, evento, valor).
+# O prefixo segue a convenção do ijson: chaves separadas por "." e "item" para elementos de listas;
+# a raiz tem prefixo "". Ex.: {"fundacoes": [{"nome": "S1"}]} gera "fundacoes.item.nome".
+INICIO_OBJETO = "start_map"
+FIM_OBJETO = "end_map"
+CHAVE = "map_key"
+INICIO_LISTA = "start_array"
+FIM_LISTA = "end_array"
+VALOR = "value"
+
+_ESPACOS = " \t\n\r"
+_CARACTERES_NUMERO = frozenset("0123456789.eE+-")
+
+
+def _juntar(prefixo: str, chave: str) -> str:
+    return f"{prefixo}.{chave}" if prefixo else chave
+
+
+class LeitorJSONIncremental:
+    """
+    Leitor de JSON orientado a eventos, que consome o arquivo em pedaços de tamanho fixo.
+
+    A estrutura é percorrida caractere a caractere apenas nos contêineres; strings, números e os
+    elementos das listas capturadas são decodificados pelo json.JSONDecoder (em C) diretamente do
+    buffer. A memória fica limitada ao buffer mais o maior valor decodificado de uma vez.
+    """
+
+    def __init__(self, arquivo: IO[str], tamanho_buffer: int = 65536):
+        """
+        :param arquivo: Arquivo JSON aberto em modo texto.
+        :param tamanho_buffer: Quantidade de caracteres lida do arquivo a cada recarga.
+        """
+        self._arquivo = arquivo
+        self._tamanho_buffer = tamanho_buffer
+        self._decodificador = json.JSONDecoder()
+        self._buffer = ""
+        self._posicao = 0
+        self._fim_arquivo = False
+
+    def _recarregar(self) -> bool:
+        """Descarta o trecho já consumido e acrescenta mais um pedaço do arquivo ao buffer"""
+        if self._fim_arquivo:
+            return False
+        pedaco = self._arquivo.read(self._tamanho_buffer)
+        if not pedaco:
+            self._fim_arquivo = True
+            return False
+        self._buffer = self._buffer[self._posicao:] + pedaco
+        self._posicao = 0
+        return True
+
+    def _espiar(self) -> Optional[str]:
+        """Pula espaços em branco e retorna o próximo caractere sem consumi-lo (None no fim do arquivo)"""
+        while True:
+            while self._posicao < len(self._buffer) and self._buffer[self._posicao] in _ESPACOS:
+                self._posicao += 1
+            if self._posicao < len(self._buffer):
+                return self._buffer[self._posicao]
+            if not self._recarregar():
+                return None
+
+    def _consumir(self, esperado: str):
+        caractere = self._espiar()
+        if caractere != esperado:
+            raise self._erro(f"esperado '{esperado}', encontrado {caractere!r}")
+        self._posicao += 1
+
+    def _valor_completo(self) -> Any:
+        """Decodifica o valor JSON completo que começa na posição atual, recarregando o buffer se preciso"""
+        if self._espiar() is None:
+            raise self._erro("fim inesperado do arquivo")
+        while True:
+            try:
+                valor, fim = self._decodificador.raw_decode(self._buffer, self._posicao)
+            except json.JSONDecodeError:
+                if self._recarregar():
+                    continue
+                raise
+            # Um número que chega ao fim do buffer pode continuar no próximo pedaço ("2" + ".5")
+            if (isinstance(valor, (int, float)) and not isinstance(valor, bool)
+                    and all(c in _CARACTERES_NUMERO for c in self._buffer[fim:fim + 2])
+                    and self._recarregar()):
+                continue
+            self._posicao = fim
+            return valor
+
+    def _erro(self, mensagem: str) -> json.JSONDecodeError:
+        return json.JSONDecodeError(mensagem, self._buffer, self._posicao)
+
+    def eventos(self, capturar: Optional[str] = None) -> Iterator[Tuple[str, str, Any]]:
+        """
+        Percorre o documento emitindo eventos (prefixo, evento, valor).
+
+        :param capturar: Prefixo de uma lista cujos elementos são decodificados inteiros e emitidos
+            como um único evento VALOR com prefixo "<capturar>.item", sem eventos internos.
+        :return: Iterador de eventos.
+        """
+        pilha: List[Tuple[str, str]] = []  # (tipo do contêiner, prefixo)
+        estado, prefixo = "valor", ""
+        while True:
+            caractere = self._espiar()
+            if estado == "valor":
+                if caractere == "{":
+                    self._posicao += 1
+                    yield prefixo, INICIO_OBJETO, None
+                    pilha.append(("objeto", prefixo))
+                    estado = "chave_ou_fim"
+                elif caractere == "[":
+                    self._posicao += 1
+                    yield prefixo, INICIO_LISTA, None
+                    pilha.append(("lista", prefixo))
+                    if prefixo == capturar:
+                        yield from self._elementos_capturados(prefixo)
+                        pilha.pop()
+                        yield prefixo, FIM_LISTA, None
+                        estado = "separador"
+                    else:
+                        estado = "item_ou_fim"
+                else:
+                    yield prefixo, VALOR, self._valor_completo()
+                    estado = "separador"
+            elif estado in ("chave", "chave_ou_fim"):
+                if caractere == "}" and estado == "chave_ou_fim":
+                    self._posicao += 1
+                    yield pilha.pop()[1], FIM_OBJETO, None
+                    estado = "separador"
+                elif caractere == '"':
+                    chave = self._valor_completo()
+                    self._consumir(":")
+                    yield pilha[-1][1], CHAVE, chave
+                    estado, prefixo = "valor", _juntar(pilha[-1][1], chave)
+                else:
+                    raise self._erro(f"esperada uma chave, encontrado {caractere!r}")
+            elif estado == "item_ou_fim":
+                if caractere == "]":
+                    self._posicao += 1
+                    yield pilha.pop()[1], FIM_LISTA, None
+                    estado = "separador"
+                else:
+                    estado, prefixo = "valor", _juntar(pilha[-1][1], "item")
+            else:
+                if not pilha:
+                    if caractere is not None:
+                        raise self._erro("conteúdo após o fim do documento")
+                    return
+                tipo, prefixo_conteiner = pilha[-1]
+                if caractere == ",":
+                    self._posicao += 1
+                    if tipo == "objeto":
+                        estado = "chave"
+                    else:
+                        estado, prefixo = "valor", _juntar(prefixo_conteiner, "item")
+                elif caractere == ("}" if tipo == "objeto" else "]"):
+                    self._posicao += 1
+                    pilha.pop()
+                    yield prefixo_conteiner, FIM_OBJETO if tipo == "objeto" else FIM_LISTA, None
+                else:
+                    raise self._erro(f"separador inválido {caractere!r}")
+
+    def _elementos_capturados(self, prefixo: str) -> Iterator[Tuple[str, str, Any]]:
+        """Emite cada elemento da lista atual decodificado inteiro e consome o ']' final"""
+        prefixo_item = _juntar(prefixo, "item")
+        if self._espiar() == "]":
+            self._posicao += 1
+            return
+        while True:
+            yield prefixo_item, VALOR, self._valor_completo()
+            caractere = self._espiar()
+            self._posicao += 1
+            if caractere == "]":
+                return
+            if caractere != ",":
+                self._posicao -= 1
+                raise self._erro(f"separador inválido {caractere!r}")
+
+    def itens(self, caminho: str = "", tamanho_bloco: Optional[int] = None) -> Iterator[Any]:
+        """
+        Percorre os elementos da lista localizada em `caminho`.
+
+        :param caminho: Prefixo da lista (ex.: "fundacoes" ou "projeto.elementos"); "" para a raiz.
+        :param tamanho_bloco: Se informado, agrupa os elementos em listas de até esse tamanho.
+        :return: Iterador de elementos (ou de blocos de elementos).
+        """
+        prefixo_item = _juntar(caminho, "item")
+        bloco = []
+        for prefixo, evento, valor in self.eventos(capturar=caminho):
+            if evento != VALOR or prefixo != prefixo_item:
+                continue
+            if tamanho_bloco is None:
+                yield valor
+                continue
+            bloco.append(valor)
+            if len(bloco) >= tamanho_bloco:
+                yield bloco
+                bloco = []
+        if bloco:
+            yield bloco
+
+
+def iterar_json(caminho_arquivo: str, caminho: str = "", tamanho_bloco: Optional[int] = None,
+                tamanho_buffer: int = 65536) -> Iterator[Any]:
+    """
+    Abre um arquivo JSON e percorre em fluxo os elementos da lista indicada (ver LeitorJSONIncremental.itens).
+    """
+    if not os.path.exists(caminho_arquivo):
+        logging.error(f"Arquivo JSON não encontrado: {caminho_arquivo}")
+        raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
+    with abrir_texto(caminho_arquivo) as arquivo:
+        yield from LeitorJSONIncremental(arquivo, tamanho_buffer).itens(caminho, tamanho_bloco)
+
+
+# Exemplo de uso e comparação de pico de memória com json.load
+if __name__ == "__main__":
+    import argparse
+    import random
+    import tempfile
+    import time
+    import tracemalloc
+
+    from src.lct_calculator.interfaces.tqs_data_importer import TQSDataImporter
+
+    parser = argparse.ArgumentParser(description="Benchmark do leitor JSON incremental")
+    parser.add_argument('--elementos', type=int, default=200000, help="Quantidade de elementos do arquivo gerado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho_arquivo = os.path.join(diretorio, "exportacao_tqs.json")
+        with open(caminho_arquivo, 'w', encoding='utf-8') as arquivo:
+            arquivo.write('{"projeto": {"nome": "Benchmark"}, "elementos": [')
+            for i in range(args.elementos):
+                elemento = {"id": i, "nome": f"S{i}", "tipo": "sapata", "carga": random.uniform(10, 500),
+                            "dimensoes": {"base": random.uniform(0.5, 3), "altura": random.uniform(0.3, 2)}}
+                arquivo.write((", " if i else "") + json.dumps(elemento))
+            arquivo.write("]}")
+        tamanho_mb = os.path.getsize(caminho_arquivo) / 1e6
+
+        for nome, ler in (
+            ("json.load", lambda: len(TQSDataImporter.carregar_json(caminho_arquivo)["elementos"])),
+            ("iterar_json", lambda: sum(len(bloco) for bloco in iterar_json(caminho_arquivo, "elementos", 1000))),
+        ):
+            tracemalloc.start()
+            inicio = time.perf_counter()
+            quantidade = ler()
+            duracao = time.perf_counter() - inicio
+            pico = tracemalloc.get_traced_memory()[1] / 1e6
+            tracemalloc.stop()
+            print(f"{nome}: {quantidade} elementos de {tamanho_mb:.1f} MB em {duracao:.2f} s, pico {pico:.1f} MB")
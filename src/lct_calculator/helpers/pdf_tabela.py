@@ -0,0 +1,498 @@
+import hashlib
+import json
+import logging
+import os
+import zlib
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+from itertools import chain, islice
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from fpdf.fonts import fpdf_charwidths
+
+from src.lct_calculator.helpers.cache_fragmentos import CacheFragmentos, assinatura, chave_linha
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Página A4 em paisagem, em pontos
+A4_PAISAGEM = (841.89, 595.28)
+
+# Codificação WinAnsi das fontes padrão do PDF (cobre os acentos do português)
+CODIFICACAO = "cp1252"
+
+# Espaçamento interno das células, em pontos
+ESPACAMENTO = 2.0
+
+# Páginas renderizadas por tarefa do pool de processos
+PAGINAS_POR_BLOCO = 50
+
+# Células renderizadas mantidas em memória para reaproveitar valores repetidos
+TAMANHO_MEMO_CELULAS = 50_000
+
+# Vazão mínima esperada do motor em um único núcleo (ver benchmark no final do módulo)
+META_PAGINAS_POR_SEGUNDO = 500
+
+# Larguras (milésimos do corpo) dos 256 caracteres das fontes Helvetica, indexadas pelo byte cp1252
+_LARGURAS = {
+    "F1": tuple(fpdf_charwidths["helvetica"][chr(i)] for i in range(256)),
+    "F2": tuple(fpdf_charwidths["helveticaB"][chr(i)] for i in range(256)),
+}
+
+# Reticências em cp1252, usadas ao truncar textos que não cabem na coluna
+_RETICENCIAS = b"\x85"
+
+# Objetos fixos do documento; as páginas começam logo depois
+_OBJ_CATALOGO, _OBJ_PAGINAS, _OBJ_FONTE, _OBJ_FONTE_NEGRITO, _OBJ_RECURSOS, _OBJ_CABECALHO, _OBJ_INFO = range(1, 8)
+_PRIMEIRO_OBJ_PAGINA = 8
+
+
+def _codificar(valor: Any) -> Tuple[bytes, bool]:
+    """Converte o valor em texto cp1252 e indica se é numérico (alinhado à direita)"""
+    if valor is None:
+        return b"", False
+    if isinstance(valor, bool):
+        return (b"Sim" if valor else b"N\xe3o"), False
+    if isinstance(valor, int):
+        return str(valor).encode("ascii"), True
+    if isinstance(valor, float):
+        return f"{valor:.6g}".encode("ascii"), True
+    texto = str(valor).replace("\r", " ").replace("\n", " ")
+    return texto.encode(CODIFICACAO, errors="replace"), False
+
+
+def _escapar(texto: bytes) -> bytes:
+    return texto.replace(b"\\", b"\\\\").replace(b"(", b"\\(").replace(b")", b"\\)")
+
+
+def largura_texto(texto: bytes, tamanho_fonte: float, fonte: str = "F1") -> float:
+    """Largura, em pontos, de um texto já codificado em cp1252"""
+    return sum(map(_LARGURAS[fonte].__getitem__, texto)) * tamanho_fonte / 1000
+
+
+class LayoutTabela:
+    """
+    Geometria de um relatório tabular: página, fontes, larguras das colunas e cabeçalho.
+
+    Cada linha da tabela é renderizada como um fragmento de conteúdo PDF independente da posição
+    (coordenadas relativas à própria linha). A página apenas posiciona os fragmentos com uma
+    translação, o que permite renderizá-los em paralelo e reaproveitá-los entre relatórios.
+    """
+
+    def __init__(self, colunas: Sequence[str], titulo: str = "", subtitulo: str = "",
+                 larguras: Optional[Sequence[float]] = None, tamanho_fonte: float = 7.0,
+                 pagina: Tuple[float, float] = A4_PAISAGEM, margem: float = 28.0):
+        """
+        :param colunas: Nomes das colunas.
+        :param titulo: Título repetido no topo de cada página.
+        :param subtitulo: Linha abaixo do título (ex.: engenheiro responsável).
+        :param larguras: Larguras das colunas em pontos; se omitidas, são estimadas por ajustar_larguras.
+        :param tamanho_fonte: Corpo do texto da tabela, em pontos.
+        :param pagina: Largura e altura da página, em pontos.
+        :param margem: Margem em todos os lados, em pontos.
+        """
+        self.colunas = list(colunas)
+        self.titulo = titulo
+        self.subtitulo = subtitulo
+        self.tamanho_fonte = tamanho_fonte
+        self.pagina = pagina
+        self.margem = margem
+        self.altura_linha = round(tamanho_fonte * 1.6, 2)
+        # Linha de base do texto dentro da célula
+        self._base = round((self.altura_linha - tamanho_fonte * 0.72) / 2, 2)
+        self.topo_tabela = pagina[1] - margem - 38
+        self.larguras: List[float] = []
+        self._x: List[float] = []
+        self._memo: Dict[Tuple[int, type, Any], bytes] = {}
+        if larguras is not None:
+            self._definir_larguras(larguras)
+        elif not self.colunas:
+            self._definir_larguras([])
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # O memo de células é local a cada processo
+        return {**self.__dict__, "_memo": {}}
+
+    @property
+    def largura_util(self) -> float:
+        return self.pagina[0] - 2 * self.margem
+
+    @property
+    def linhas_por_pagina(self) -> int:
+        # Abaixo do cabeçalho da tabela, reservando o rodapé
+        return max(int((self.topo_tabela - self.altura_linha - self.margem - 10) // self.altura_linha), 1)
+
+    def _definir_larguras(self, larguras: Sequence[float]):
+        if len(larguras) != len(self.colunas):
+            raise ValueError("Informe uma largura para cada coluna.")
+        self.larguras = [float(largura) for largura in larguras]
+        self._memo = {}
+        self._x = []
+        x = self.margem
+        for largura in self.larguras:
+            self._x.append(x)
+            x += largura
+
+    def assinatura(self) -> str:
+        """Identifica a geometria da tabela: fragmentos de layouts com a mesma assinatura são intercambiáveis"""
+        return assinatura(self.colunas, self.larguras, self.tamanho_fonte, self.pagina, self.margem)
+
+    def larguras_naturais(self, amostra: Iterable[Sequence[Any]]) -> List[float]:
+        """Largura que cada coluna precisaria para mostrar sem cortes o título e os valores da amostra"""
+        naturais = [largura_texto(_codificar(coluna)[0], self.tamanho_fonte, "F2") for coluna in self.colunas]
+        for linha in amostra:
+            for indice, valor in enumerate(linha):
+                naturais[indice] = max(naturais[indice], largura_texto(_codificar(valor)[0], self.tamanho_fonte))
+        return [largura + 2 * ESPACAMENTO for largura in naturais]
+
+    def ajustar_larguras(self, amostra: Iterable[Sequence[Any]]):
+        """
+        Estima as larguras das colunas pelo maior texto do título e de uma amostra de linhas,
+        distribuindo proporcionalmente a largura útil da página.
+        """
+        self._distribuir_larguras(self.larguras_naturais(amostra))
+
+    def _distribuir_larguras(self, naturais: Sequence[float]):
+        # Nenhuma coluna fica com menos que metade da média, mesmo com textos longos nas vizinhas
+        minimo = self.largura_util / max(len(naturais), 1) / 2
+        total = sum(naturais) or 1.0
+        escala = self.largura_util / total
+        larguras = [max(largura * escala, minimo) for largura in naturais]
+        excesso = sum(larguras) / self.largura_util
+        self._definir_larguras([largura / excesso for largura in larguras])
+
+    def _celula(self, texto: bytes, x: float, largura: float, direita: bool, fonte: str = "F1") -> bytes:
+        disponivel = largura - 2 * ESPACAMENTO
+        medida = largura_texto(texto, self.tamanho_fonte, fonte)
+        if medida > disponivel:
+            limite = disponivel - largura_texto(_RETICENCIAS, self.tamanho_fonte, fonte)
+            larguras = _LARGURAS[fonte]
+            acumulado, corte = 0.0, 0
+            for corte, caractere in enumerate(texto):
+                acumulado += larguras[caractere] * self.tamanho_fonte / 1000
+                if acumulado > limite:
+                    break
+            texto = texto[:corte] + _RETICENCIAS
+            medida = largura_texto(texto, self.tamanho_fonte, fonte)
+        posicao = x + largura - ESPACAMENTO - medida if direita else x + ESPACAMENTO
+        return b"1 0 0 1 %.2f %.2f Tm (%s) Tj" % (posicao, self._base, _escapar(texto))
+
+    def fragmento_linha(self, valores: Sequence[Any]) -> bytes:
+        """Renderiza uma linha da tabela, com a base da célula em y = 0"""
+        partes = [b"BT /F1 %g Tf" % self.tamanho_fonte]
+        memo = self._memo
+        for indice, (x, largura, valor) in enumerate(zip(self._x, self.larguras, valores)):
+            # Valores repetidos (tipo, fck, diâmetros...) reaproveitam a célula já renderizada
+            chave = (indice, type(valor), valor)
+            try:
+                celula = memo.get(chave)
+            except TypeError:
+                chave = celula = None
+            if celula is None:
+                texto, numerico = _codificar(valor)
+                celula = self._celula(texto, x, largura, numerico) if texto else b""
+                if chave is not None:
+                    if len(memo) >= TAMANHO_MEMO_CELULAS:
+                        memo.clear()
+                    memo[chave] = celula
+            if celula:
+                partes.append(celula)
+        partes.append(b"ET")
+        return b" ".join(partes)
+
+    def modelo_cabecalho(self) -> bytes:
+        """Conteúdo do cabeçalho repetido em todas as páginas (gravado uma vez como Form XObject)"""
+        altura = self.pagina[1]
+        partes = [
+            b"BT /F2 12 Tf 1 0 0 1 %.2f %.2f Tm (%s) Tj ET"
+            % (self.margem, altura - self.margem - 12, _escapar(_codificar(self.titulo)[0])),
+            b"BT /F1 9 Tf 1 0 0 1 %.2f %.2f Tm (%s) Tj ET"
+            % (self.margem, altura - self.margem - 26, _escapar(_codificar(self.subtitulo)[0])),
+            b"0.85 g %.2f %.2f %.2f %.2f re f 0 g"
+            % (self.margem, self.topo_tabela - self.altura_linha, self.largura_util, self.altura_linha),
+            b"q 1 0 0 1 0 %.2f cm BT /F2 %g Tf" % (self.topo_tabela - self.altura_linha, self.tamanho_fonte),
+        ]
+        for x, largura, coluna in zip(self._x, self.larguras, self.colunas):
+            partes.append(self._celula(_codificar(coluna)[0], x, largura, False, "F2"))
+        partes.append(b"ET Q")
+        partes.append(b"0.5 w %.2f %.2f m %.2f %.2f l S"
+                      % (self.margem, self.topo_tabela - self.altura_linha,
+                         self.margem + self.largura_util, self.topo_tabela - self.altura_linha))
+        return b"\n".join(partes)
+
+    def conteudo_pagina(self, fragmentos: Sequence[bytes], numero: int) -> bytes:
+        """Posiciona os fragmentos das linhas sobre o cabeçalho e numera a página"""
+        partes = [b"/Cab Do"]
+        y = self.topo_tabela - self.altura_linha
+        faixas = []
+        for indice in range(len(fragmentos)):
+            y -= self.altura_linha
+            if indice % 2:
+                faixas.append(b"%.2f %.2f %.2f %.2f re" % (self.margem, y, self.largura_util, self.altura_linha))
+        if faixas:
+            partes.append(b"0.95 g " + b" ".join(faixas) + b" f 0 g")
+        y = self.topo_tabela - self.altura_linha
+        for fragmento in fragmentos:
+            y -= self.altura_linha
+            partes.append(b"q 1 0 0 1 0 %.2f cm %s Q" % (y, fragmento))
+        rodape = f"Página {numero}".encode(CODIFICACAO)
+        partes.append(b"BT /F1 8 Tf 1 0 0 1 %.2f %.2f Tm (%s) Tj ET"
+                      % (self.pagina[0] - self.margem - largura_texto(rodape, 8), self.margem - 10, rodape))
+        return b"\n".join(partes)
+
+
+def _renderizar_bloco(layout: LayoutTabela, linhas: Sequence[Sequence[Any]], primeira_pagina: int,
+                      comprimir: bool) -> List[bytes]:
+    """Renderiza um bloco de páginas completas; executado nos processos de trabalho"""
+    por_pagina = layout.linhas_por_pagina
+    paginas = []
+    for inicio in range(0, max(len(linhas), 1), por_pagina):
+        fragmentos = [layout.fragmento_linha(linha) for linha in linhas[inicio:inicio + por_pagina]]
+        conteudo = layout.conteudo_pagina(fragmentos, primeira_pagina + len(paginas))
+        paginas.append(zlib.compress(conteudo, 1) if comprimir else conteudo)
+    return paginas
+
+
+class _EscritorPDF:
+    """Grava os objetos do PDF em sequência, registrando as posições para a tabela xref"""
+
+    def __init__(self, arquivo):
+        self.arquivo = arquivo
+        self.posicao = 0
+        self.deslocamentos = {}
+        self.gravar(b"%PDF-1.4\n%\xe2\xe3\xcf\xd3\n")
+
+    def gravar(self, dados: bytes):
+        self.arquivo.write(dados)
+        self.posicao += len(dados)
+
+    def objeto(self, numero: int, corpo: bytes):
+        self.deslocamentos[numero] = self.posicao
+        self.gravar(b"%d 0 obj\n%s\nendobj\n" % (numero, corpo))
+
+    def fluxo(self, numero: int, conteudo: bytes, dicionario: bytes = b"", comprimido: bool = False):
+        if comprimido:
+            dicionario = b"/Filter /FlateDecode " + dicionario
+        self.objeto(numero, b"<< /Length %d %s>>\nstream\n%s\nendstream" % (len(conteudo), dicionario, conteudo))
+
+    def finalizar(self):
+        inicio_xref = self.posicao
+        total = max(self.deslocamentos) + 1
+        entradas = [b"0000000000 65535 f \n"]
+        entradas += [b"%010d 00000 n \n" % self.deslocamentos[numero] for numero in range(1, total)]
+        self.gravar(b"xref\n0 %d\n%s" % (total, b"".join(entradas)))
+        self.gravar(b"trailer\n<< /Size %d /Root %d 0 R /Info %d 0 R >>\nstartxref\n%d\n%%%%EOF\n"
+                    % (total, _OBJ_CATALOGO, _OBJ_INFO, inicio_xref))
+
+
+class MotorPDFTabela:
+    """
+    Motor de relatórios PDF tabulares de alta vazão.
+
+    As fontes padrão (Helvetica, sem incorporação) e o cabeçalho são gravados uma única vez e
+    compartilhados por todas as páginas. As linhas são lidas em fluxo e agrupadas em blocos de
+    páginas completas, renderizados em um pool de processos e gravados na ordem original, com
+    no máximo alguns blocos em memória. Entradas que cabem em um único bloco são renderizadas no
+    processo atual.
+
+    Com um cache de fragmentos, páginas e linhas inalteradas desde a geração anterior são lidas do
+    cache e apenas as alteradas são renderizadas (no processo atual, já que são poucas).
+    """
+
+    def __init__(self, layout: LayoutTabela, processos: Optional[int] = None,
+                 paginas_por_bloco: int = PAGINAS_POR_BLOCO, comprimir: bool = True,
+                 cache: Optional[CacheFragmentos] = None):
+        """
+        :param layout: Geometria e colunas do relatório.
+        :param processos: Processos de renderização (padrão: número de CPUs; 1 renderiza no processo atual).
+        :param paginas_por_bloco: Páginas enviadas a cada tarefa do pool.
+        :param comprimir: Comprime o conteúdo das páginas (FlateDecode).
+        :param cache: Cache de fragmentos para a regeneração incremental.
+        """
+        self.layout = layout
+        self.processos = processos or os.cpu_count() or 1
+        self.paginas_por_bloco = paginas_por_bloco
+        self.comprimir = comprimir
+        self.cache = cache
+
+    def _ajustar_larguras(self, amostra: Sequence[Sequence[Any]]):
+        """
+        Estima as larguras pela amostra. Com cache, reaproveita as larguras da geração anterior do
+        mesmo relatório (colunas, título e subtítulo), para que uma alteração no maior valor de uma
+        coluna não invalide todos os fragmentos; se algum valor da amostra não couber nelas e couber
+        nas larguras recalculadas, as larguras são recalculadas.
+        """
+        naturais = self.layout.larguras_naturais(amostra)
+        self.layout._distribuir_larguras(naturais)
+        if self.cache is None:
+            return
+        chave = "larguras:" + assinatura(self.layout.colunas, self.layout.titulo, self.layout.subtitulo,
+                                         self.layout.tamanho_fonte, self.layout.pagina, self.layout.margem)
+        larguras = self.cache.obter_metadado(chave)
+        if larguras is not None:
+            anteriores = json.loads(larguras)
+            # As anteriores não podem cortar nada que as recalculadas mostrariam inteiro
+            if all(min(natural, nova) <= anterior + 1e-6
+                   for natural, nova, anterior in zip(naturais, self.layout.larguras, anteriores)):
+                self.layout._definir_larguras(anteriores)
+                return
+        self.cache.gravar_metadado(chave, json.dumps(self.layout.larguras))
+
+    def _blocos(self, linhas: Iterable[Sequence[Any]]):
+        """Divide as linhas em blocos de páginas completas, ajustando as larguras pelo primeiro bloco"""
+        tamanho = self.layout.linhas_por_pagina * self.paginas_por_bloco
+        linhas = iter(linhas)
+        bloco = list(islice(linhas, tamanho))
+        if not self.layout.larguras and self.layout.colunas:
+            self._ajustar_larguras(bloco[:1000])
+        # Sem linhas, um bloco vazio gera uma página apenas com o cabeçalho
+        yield bloco
+        while len(bloco) == tamanho:
+            bloco = list(islice(linhas, tamanho))
+            if bloco:
+                yield bloco
+
+    def _paginas(self, linhas: Iterable[Sequence[Any]]):
+        """Gera o conteúdo de cada página, na ordem, renderizando os blocos em paralelo"""
+        if self.cache is not None:
+            yield from self._paginas_cache(linhas)
+            return
+
+        primeira_pagina = 1
+        blocos = self._blocos(linhas)
+        # O pool só é criado quando há mais de um bloco: relatórios curtos são renderizados no
+        # processo atual, sem criar processos enquanto a origem das linhas (ex.: cursor) está aberta
+        iniciais = list(islice(blocos, 2))
+        if self.processos <= 1 or len(iniciais) < 2:
+            for bloco in chain(iniciais, blocos):
+                paginas = _renderizar_bloco(self.layout, bloco, primeira_pagina, self.comprimir)
+                primeira_pagina += len(paginas)
+                yield from paginas
+            return
+
+        with ProcessPoolExecutor(self.processos) as executor:
+            pendentes = deque()
+            for bloco in chain(iniciais, blocos):
+                pendentes.append(executor.submit(_renderizar_bloco, self.layout, bloco, primeira_pagina,
+                                                 self.comprimir))
+                primeira_pagina += -(-len(bloco) // self.layout.linhas_por_pagina)
+                # Limita os blocos em memória, mantendo todos os processos ocupados
+                while len(pendentes) > 2 * self.processos:
+                    yield from pendentes.popleft().result()
+            while pendentes:
+                yield from pendentes.popleft().result()
+
+    def _paginas_cache(self, linhas: Iterable[Sequence[Any]]):
+        """Gera o conteúdo de cada página, renderizando apenas as páginas com linhas fora do cache"""
+        layout = self.layout
+        por_pagina = layout.linhas_por_pagina
+        assinatura_linhas = assinatura_paginas = None
+        numero = 1
+        for bloco in self._blocos(linhas):
+            if assinatura_linhas is None:
+                # As larguras só são conhecidas após o primeiro bloco
+                assinatura_linhas = assinatura("pdf-linha", layout.assinatura())
+                assinatura_paginas = assinatura("pdf-pagina", layout.assinatura(), self.comprimir)
+            chaves = [chave_linha(linha) for linha in bloco]
+            inicios = range(0, max(len(bloco), 1), por_pagina)
+            # Uma página não muda se o número e as linhas que ela contém não mudaram
+            chaves_paginas = [
+                hashlib.blake2b(b"%d:" % (numero + indice) + b"".join(chaves[inicio:inicio + por_pagina]),
+                                digest_size=16).digest()
+                for indice, inicio in enumerate(inicios)
+            ]
+            paginas = self.cache.obter(assinatura_paginas, chaves_paginas)
+            faltantes = [indice for indice, chave in enumerate(chaves_paginas) if chave not in paginas]
+            trechos = [slice(inicios[indice], inicios[indice] + por_pagina) for indice in faltantes]
+            self.cache.acertos += len(bloco) - sum(len(chaves[trecho]) for trecho in trechos)
+            if faltantes:
+                fragmentos = self.cache.renderizar_bloco(
+                    assinatura_linhas, [linha for trecho in trechos for linha in bloco[trecho]],
+                    layout.fragmento_linha, [chave for trecho in trechos for chave in chaves[trecho]],
+                )
+                novas, posicao = {}, 0
+                for indice, trecho in zip(faltantes, trechos):
+                    quantidade = len(chaves[trecho])
+                    conteudo = layout.conteudo_pagina(fragmentos[posicao:posicao + quantidade], numero + indice)
+                    novas[chaves_paginas[indice]] = zlib.compress(conteudo, 1) if self.comprimir else conteudo
+                    posicao += quantidade
+                self.cache.gravar(assinatura_paginas, novas)
+                paginas.update(novas)
+            yield from (paginas[chave] for chave in chaves_paginas)
+            numero += len(chaves_paginas)
+
+    def gravar(self, caminho_arquivo: str, linhas: Iterable[Sequence[Any]]) -> int:
+        """
+        Gera o PDF com uma linha da tabela por registro.
+
+        :param caminho_arquivo: Caminho do PDF de destino.
+        :param linhas: Valores de cada linha, na ordem das colunas do layout.
+        :return: Número de páginas geradas.
+        """
+        with open(caminho_arquivo, 'wb') as arquivo:
+            escritor = _EscritorPDF(arquivo)
+            escritor.objeto(_OBJ_CATALOGO, b"<< /Type /Catalog /Pages %d 0 R >>" % _OBJ_PAGINAS)
+            escritor.objeto(_OBJ_FONTE, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica "
+                                        b"/Encoding /WinAnsiEncoding >>")
+            escritor.objeto(_OBJ_FONTE_NEGRITO, b"<< /Type /Font /Subtype /Type1 /BaseFont /Helvetica-Bold "
+                                                b"/Encoding /WinAnsiEncoding >>")
+            escritor.objeto(_OBJ_RECURSOS, b"<< /Font << /F1 %d 0 R /F2 %d 0 R >> /XObject << /Cab %d 0 R >> >>"
+                            % (_OBJ_FONTE, _OBJ_FONTE_NEGRITO, _OBJ_CABECALHO))
+            escritor.objeto(_OBJ_INFO, b"<< /Title (%s) >>" % _escapar(_codificar(self.layout.titulo)[0]))
+
+            paginas = 0
+            for conteudo in self._paginas(linhas):
+                if not paginas:
+                    # As larguras já foram ajustadas pelo primeiro bloco
+                    escritor.fluxo(_OBJ_CABECALHO, self.layout.modelo_cabecalho(),
+                                   b"/Type /XObject /Subtype /Form /BBox [0 0 %.2f %.2f] /Resources %d 0 R "
+                                   % (*self.layout.pagina, _OBJ_RECURSOS))
+                numero = _PRIMEIRO_OBJ_PAGINA + 2 * paginas
+                escritor.objeto(numero, b"<< /Type /Page /Parent %d 0 R /MediaBox [0 0 %.2f %.2f] "
+                                        b"/Resources %d 0 R /Contents %d 0 R >>"
+                                % (_OBJ_PAGINAS, *self.layout.pagina, _OBJ_RECURSOS, numero + 1))
+                escritor.fluxo(numero + 1, conteudo, comprimido=self.comprimir)
+                paginas += 1
+
+            filhos = b" ".join(b"%d 0 R" % (_PRIMEIRO_OBJ_PAGINA + 2 * i) for i in range(paginas))
+            escritor.objeto(_OBJ_PAGINAS, b"<< /Type /Pages /Kids [%s] /Count %d >>" % (filhos, paginas))
+            escritor.finalizar()
+        logging.info(f"PDF tabular gerado: {caminho_arquivo} ({paginas} páginas).")
+        return paginas
+
+
+# Exemplo de uso e benchmark
+if __name__ == "__main__":
+    import tempfile
+    import time
+
+    from fpdf import FPDF
+
+    colunas = ["id", "tipo", "fck", "volume_concreto", "quantidade_barras", "diametro_barras", "data_calculo"]
+    linhas = [(i, ("sapata", "bloco", "estaca", "tubulão")[i % 4], 25.0 + i % 3 * 5, 1.5 + i % 97 / 10,
+               8.0 + i % 5, 12.5, "2024-01-01 12:00:00") for i in range(100_000)]
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        for processos in sorted({1, os.cpu_count() or 1}):
+            layout = LayoutTabela(colunas, titulo="Relatório do Projeto: Benchmark", subtitulo="Engenheiro Responsável: -")
+            inicio = time.perf_counter()
+            paginas = MotorPDFTabela(layout, processos).gravar(os.path.join(diretorio, "tabela.pdf"), linhas)
+            duracao = time.perf_counter() - inicio
+            print(f"{len(linhas)} linhas, {processos} processo(s): {paginas} páginas em {duracao:.2f} s "
+                  f"({paginas / duracao:.0f} páginas/s, {len(linhas) / duracao:.0f} linhas/s; "
+                  f"meta {META_PAGINAS_POR_SEGUNDO} páginas/s por núcleo)")
+
+        # Referência: uma célula do fpdf por par chave/valor, como no gerador anterior
+        amostra = linhas[:2_000]
+        inicio = time.perf_counter()
+        pdf = FPDF()
+        pdf.add_page()
+        pdf.set_font("Arial", size=12)
+        for linha in amostra:
+            for chave, valor in zip(colunas, linha):
+                pdf.cell(200, 10, txt=f"{chave}: {valor}", ln=True)
+            pdf.ln(5)
+        pdf.output(os.path.join(diretorio, "fpdf.pdf"))
+        duracao = time.perf_counter() - inicio
+        print(f"fpdf, {len(amostra)} linhas: {pdf.page} páginas em {duracao:.2f} s "
+              f"({pdf.page / duracao:.0f} páginas/s, {len(amostra) / duracao:.0f} linhas/s)")
@@ -0,0 +1,329 @@
+import csv
+import itertools
+import logging
+import math
+import os
+import re
+from typing import Any, Dict, Iterator, List, Optional, Sequence
+
+import numpy as np
+
+from src.lct_calculator.helpers.compression import abrir_texto
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Unidade -> (grandeza, fator para a unidade base da grandeza)
+# Bases: comprimento em m, área em m², volume em m³, força em kN e tensão em MPa.
+UNIDADES = {
+    "m": ("comprimento", 1.0), "cm": ("comprimento", 0.01), "mm": ("comprimento", 0.001),
+    "m²": ("area", 1.0), "m2": ("area", 1.0), "cm²": ("area", 1e-4), "cm2": ("area", 1e-4),
+    "m³": ("volume", 1.0), "m3": ("volume", 1.0),
+    "kn": ("forca", 1.0), "n": ("forca", 1e-3), "tf": ("forca", 9.80665), "kgf": ("forca", 0.00980665),
+    "mpa": ("tensao", 1.0), "kpa": ("tensao", 1e-3), "kn/m²": ("tensao", 1e-3), "kn/m2": ("tensao", 1e-3),
+    "kgf/cm²": ("tensao", 0.0980665), "kgf/cm2": ("tensao", 0.0980665),
+    "tf/m²": ("tensao", 0.00980665), "tf/m2": ("tensao", 0.00980665),
+}
+
+# Cabeçalhos no formato "Largura (cm)" ou "Largura [cm]"
+_PADRAO_CABECALHO = re.compile(r"^(.*?)\s*[\(\[]\s*([^\)\]]+?)\s*[\)\]]\s*$")
+
+_TIPOS_NUMPY = {float: "f8", int: "i8", bool: "?"}
+
+# Largura (caracteres) com que as colunas de texto são lidas pelo parser. Um bloco com valor que
+# atinja a largura é relido como object, sem truncar, e a largura dos blocos seguintes aumenta até
+# LARGURA_TEXTO_MAXIMA; acima dela, a coluna passa a ser lida sempre como object.
+LARGURA_TEXTO_INICIAL = 32
+LARGURA_TEXTO_MAXIMA = 1024
+
+
+def _texto_no_limite(dados: np.ndarray, nome: str) -> bool:
+    """
+    Indica se algum valor da coluna de texto `nome` ocupa toda a largura do seu dtype (e pode ter
+    sido truncado). Lê apenas o último caractere de cada campo, sem calcular o tamanho dos textos.
+    """
+    tipo, deslocamento = dados.dtype.fields[nome][:2]
+    ultimo = np.dtype({"names": ["ultimo"], "formats": ["u4"], "itemsize": dados.itemsize,
+                       "offsets": [deslocamento + tipo.itemsize - 4]})
+    return bool(dados.view(ultimo)["ultimo"].any())
+
+
+def fator_unidade(unidade: str) -> float:
+    """Retorna o fator que converte a unidade informada para a unidade base da sua grandeza"""
+    try:
+        return UNIDADES[unidade.strip().lower()][1]
+    except KeyError:
+        raise ValueError(f"Unidade '{unidade}' não suportada.")
+
+
+class ColunaCSV:
+    """
+    Declaração de uma coluna do esquema: nome, tipo Python (float, int, bool ou str) e unidade
+    usada no arquivo quando o cabeçalho não a informa.
+    """
+
+    def __init__(self, nome: str, tipo: type = float, unidade: Optional[str] = None,
+                 obrigatoria: bool = True, padrao: Any = None, tamanho: Optional[int] = None):
+        """
+        :param nome: Nome da coluna no cabeçalho (sem a unidade, sem diferenciar maiúsculas).
+        :param tipo: float, int, bool ou str.
+        :param unidade: Unidade dos valores no arquivo; o cabeçalho "Nome (unidade)" tem precedência.
+        :param obrigatoria: Se False, a coluna pode faltar no arquivo; a coluna ausente e os campos
+            vazios viram `padrao`.
+        :param padrao: Valor para campos vazios e colunas ausentes. Sem ele, float usa NaN e str usa
+            texto vazio; colunas int e bool opcionais exigem um padrão.
+        :param tamanho: Número máximo de caracteres das colunas str (None: sem limite). Valores
+            maiores geram ValueError; a largura do array acompanha o maior valor de cada bloco.
+        """
+        if tipo not in _TIPOS_NUMPY and tipo is not str:
+            raise ValueError(f"Tipo de coluna não suportado: {tipo}")
+        if unidade is not None and tipo not in (float, int):
+            raise ValueError(f"A coluna '{nome}' não é numérica e não aceita unidade.")
+        if padrao is None and not obrigatoria and tipo in (int, bool):
+            raise ValueError(f"A coluna opcional '{nome}' do tipo {tipo.__name__} precisa de um valor padrão.")
+        self.nome = nome
+        self.tipo = tipo
+        self.unidade = unidade
+        self.obrigatoria = obrigatoria
+        if padrao is None and tipo is float:
+            padrao = math.nan
+        elif padrao is None and tipo is str and not obrigatoria:
+            padrao = ""
+        self.padrao = padrao
+        self.tamanho = tamanho
+
+    @property
+    def dtype(self):
+        return _TIPOS_NUMPY.get(self.tipo, str)
+
+    def ajustar_textos(self, valores: np.ndarray) -> np.ndarray:
+        """
+        Converte os textos lidos (str ou object) em um array str, troca os campos vazios pelo padrão
+        e valida o tamanho máximo.
+        """
+        textos = valores.astype(str) if valores.dtype == object else valores
+        if self.padrao:
+            textos = np.where(textos == "", self.padrao, textos)
+        if self.tamanho is not None and len(textos) and np.char.str_len(textos).max() > self.tamanho:
+            raise ValueError(f"Valor com mais de {self.tamanho} caracteres na coluna '{self.nome}'.")
+        return textos
+
+    def valores_padrao(self, quantidade: int) -> np.ndarray:
+        """Array com o valor padrão, usado quando a coluna opcional está ausente do arquivo"""
+        if self.tipo is str:
+            # A largura acompanha o padrão (dtype=str criaria um array de um caractere)
+            return np.full(quantidade, str(self.padrao))
+        return np.full(quantidade, self.padrao, dtype=self.dtype)
+
+    def converter(self, valor: str):
+        """Conversão campo a campo, usada apenas nos blocos com campos vazios"""
+        valor = valor.strip()
+        if not valor:
+            if self.padrao is None:
+                raise ValueError(f"Valor vazio na coluna obrigatória '{self.nome}'.")
+            return self.padrao
+        if self.tipo is bool:
+            return valor.lower() in ("1", "true", "sim", "s", "verdadeiro")
+        return self.tipo(valor)
+
+
+class LeitorCSVTipado:
+    """
+    Leitor de CSV em fluxo guiado por um esquema de colunas.
+
+    O arquivo é lido em blocos de tamanho fixo e cada bloco é convertido de uma vez pelo parser
+    em C do NumPy, com as unidades normalizadas para a base da grandeza. A memória depende apenas
+    do tamanho do bloco, não do tamanho do arquivo.
+    """
+
+    def __init__(self, caminho_arquivo: str, esquema: Sequence[ColunaCSV], delimitador: Optional[str] = None,
+                 decimal: str = ".", encoding: str = "utf-8-sig"):
+        """
+        :param caminho_arquivo: Caminho do arquivo CSV.
+        :param esquema: Colunas a extrair; as demais colunas do arquivo são ignoradas.
+        :param delimitador: Separador de campos (padrão: ';' se presente no cabeçalho, senão ',').
+        :param decimal: Separador decimal dos números ('.' ou ',').
+        :param encoding: Codificação do arquivo.
+        """
+        if not os.path.exists(caminho_arquivo):
+            logging.error(f"Arquivo CSV não encontrado: {caminho_arquivo}")
+            raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
+        if decimal not in (".", ","):
+            raise ValueError("O separador decimal deve ser '.' ou ','.")
+        self.caminho_arquivo = caminho_arquivo
+        self.esquema = list(esquema)
+        self.delimitador = delimitador
+        self.decimal = decimal
+        self.encoding = encoding
+
+    def _resolver_cabecalho(self, linha: str):
+        """Associa as colunas do esquema aos índices do arquivo e calcula os fatores de unidade"""
+        if self.delimitador is None:
+            self.delimitador = ";" if ";" in linha else ","
+        if self.decimal == "," and self.delimitador == ",":
+            raise ValueError("Separador decimal ',' exige outro delimitador de campos.")
+
+        posicoes = {}
+        for indice, cabecalho in enumerate(next(csv.reader([linha], delimiter=self.delimitador))):
+            correspondencia = _PADRAO_CABECALHO.match(cabecalho)
+            nome, unidade = correspondencia.groups() if correspondencia else (cabecalho, None)
+            posicoes[nome.strip().lower()] = (indice, unidade)
+
+        indices, fatores, ausentes = {}, {}, []
+        for coluna in self.esquema:
+            if coluna.nome.lower() not in posicoes:
+                if coluna.obrigatoria:
+                    raise ValueError(f"Coluna obrigatória '{coluna.nome}' ausente em {self.caminho_arquivo}.")
+                ausentes.append(coluna)
+                continue
+            indice, unidade = posicoes[coluna.nome.lower()]
+            indices[coluna.nome] = indice
+            unidade = unidade if coluna.tipo in (float, int) and unidade else coluna.unidade
+            if unidade:
+                fatores[coluna.nome] = fator_unidade(unidade)
+        return indices, fatores, ausentes
+
+    def _converter_bloco(self, linhas: List[str], colunas: List[ColunaCSV], indices: Dict[str, int],
+                         larguras: Dict[str, Optional[int]]) -> np.ndarray:
+        """
+        Converte as linhas do bloco em um array estruturado com as colunas informadas. Textos são
+        lidos com a largura de `larguras` (None: object, sem limite) e a vírgula decimal é traduzida
+        apenas nos campos float.
+        """
+        dtype = [
+            (coluna.nome, coluna.dtype if coluna.tipo is not str
+             else object if larguras[coluna.nome] is None else f"U{larguras[coluna.nome]}")
+            for coluna in colunas
+        ]
+        usecols = [indices[coluna.nome] for coluna in colunas]
+        try:
+            return np.loadtxt(linhas, delimiter=self.delimitador, quotechar='"', comments=None, dtype=dtype,
+                              usecols=usecols, ndmin=1, converters=self._conversores(colunas, usecols, False))
+        except ValueError:
+            # Campos vazios ou booleanos textuais: conversão campo a campo apenas neste bloco
+            return np.loadtxt(linhas, delimiter=self.delimitador, quotechar='"', comments=None, dtype=dtype,
+                              usecols=usecols, ndmin=1, converters=self._conversores(colunas, usecols, True))
+
+    def _conversores(self, colunas: List[ColunaCSV], usecols: List[int], campo_a_campo: bool) -> Dict[int, Any]:
+        """Conversores do loadtxt: vírgula decimal nos campos float e, se pedido, ColunaCSV.converter"""
+        conversores = {}
+        for indice, coluna in zip(usecols, colunas):
+            if self.decimal == "," and coluna.tipo is float:
+                conversor = coluna.converter if campo_a_campo else float
+                conversores[indice] = lambda valor, conversor=conversor: conversor(valor.replace(",", "."))
+            elif campo_a_campo and coluna.tipo is not str:
+                conversores[indice] = coluna.converter
+        return conversores
+
+    def blocos(self, tamanho_bloco: int = 65536) -> Iterator[Dict[str, np.ndarray]]:
+        """
+        Percorre o arquivo em blocos de até `tamanho_bloco` linhas.
+
+        :return: Iterador de dicionários {nome da coluna: array NumPy} com valores tipados.
+        """
+        with abrir_texto(self.caminho_arquivo, encoding=self.encoding, newline='') as arquivo:
+            indices, fatores, ausentes = self._resolver_cabecalho(arquivo.readline())
+            presentes = [coluna for coluna in self.esquema if coluna.nome in indices]
+            larguras: Dict[str, Optional[int]] = {
+                coluna.nome: LARGURA_TEXTO_INICIAL for coluna in presentes if coluna.tipo is str
+            }
+
+            total = 0
+            while True:
+                linhas = list(itertools.islice(arquivo, tamanho_bloco))
+                if not linhas:
+                    break
+                bloco: Dict[str, np.ndarray] = {}
+                quantidade = 0
+                if presentes:
+                    dados = self._converter_bloco(linhas, presentes, indices, larguras)
+                    # Colunas de texto com algum valor na largura máxima podem ter sido truncadas
+                    cheias = [
+                        nome for nome, largura in larguras.items()
+                        if largura is not None and _texto_no_limite(dados, nome)
+                    ]
+                    if cheias:
+                        for nome in cheias:
+                            larguras[nome] = None
+                        dados = self._converter_bloco(linhas, presentes, indices, larguras)
+                        for nome in cheias:
+                            maior = max(np.char.str_len(dados[nome].astype(str)).max(), 1)
+                            largura = LARGURA_TEXTO_INICIAL
+                            while largura <= maior:
+                                largura *= 2
+                            larguras[nome] = largura if largura <= LARGURA_TEXTO_MAXIMA else None
+                    for coluna in presentes:
+                        valores = dados[coluna.nome]
+                        if coluna.tipo is str:
+                            valores = coluna.ajustar_textos(valores)
+                        elif coluna.nome in fatores:
+                            valores = valores * fatores[coluna.nome]
+                        bloco[coluna.nome] = valores
+                    quantidade = len(dados)
+                if not quantidade:
+                    continue
+                for coluna in ausentes:
+                    bloco[coluna.nome] = coluna.valores_padrao(quantidade)
+                total += quantidade
+                yield {coluna.nome: bloco[coluna.nome] for coluna in self.esquema}
+        logging.info(f"{total} linhas lidas do arquivo CSV {self.caminho_arquivo}.")
+
+    def registros(self, tamanho_bloco: int = 65536) -> Iterator[Dict[str, Any]]:
+        """
+        Percorre o arquivo linha a linha, com os valores já tipados e em unidades base.
+
+        :return: Iterador de dicionários {nome da coluna: valor}.
+        """
+        nomes = [coluna.nome for coluna in self.esquema]
+        for bloco in self.blocos(tamanho_bloco):
+            for valores in zip(*(bloco[nome].tolist() for nome in nomes)):
+                yield dict(zip(nomes, valores))
+
+
+# Exemplo de uso e benchmark contra csv.DictReader
+if __name__ == "__main__":
+    import argparse
+    import random
+    import tempfile
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark do leitor de CSV tipado")
+    parser.add_argument('--linhas', type=int, default=500000, help="Quantidade de linhas do arquivo gerado")
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as diretorio:
+        caminho = os.path.join(diretorio, "exportacao_tqs.csv")
+        with open(caminho, 'w', encoding='utf-8') as arquivo:
+            arquivo.write("Id;Nome;Tipo;Largura (cm);Comprimento (cm);Altura (m);Carga (tf);fck (MPa)\n")
+            for i in range(args.linhas):
+                arquivo.write(f"{i};S{i};sapata;{random.uniform(50, 300):.1f};{random.uniform(50, 300):.1f};"
+                              f"{random.uniform(0.3, 2):.2f};{random.uniform(10, 500):.2f};25\n")
+
+        inicio = time.perf_counter()
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            linhas_dict = len(list(csv.DictReader(arquivo, delimiter=';')))
+        tempo_dict = time.perf_counter() - inicio
+
+        # Referência equivalente: DictReader com a mesma tipagem e conversão de unidades
+        fatores = {"Largura (cm)": 0.01, "Comprimento (cm)": 0.01, "Altura (m)": 1.0, "Carga (tf)": 9.80665,
+                   "fck (MPa)": 1.0}
+        inicio = time.perf_counter()
+        with open(caminho, 'r', encoding='utf-8') as arquivo:
+            linhas_tipadas = len([
+                {nome: float(valor) * fatores[nome] if nome in fatores else (int(valor) if nome == "Id" else valor)
+                 for nome, valor in linha.items()}
+                for linha in csv.DictReader(arquivo, delimiter=';')
+            ])
+        tempo_tipado = time.perf_counter() - inicio
+
+        esquema = [ColunaCSV("Id", int), ColunaCSV("Nome", str), ColunaCSV("Tipo", str),
+                   ColunaCSV("Largura"), ColunaCSV("Comprimento"), ColunaCSV("Altura"), ColunaCSV("Carga"),
+                   ColunaCSV("fck")]
+        inicio = time.perf_counter()
+        linhas_blocos = sum(len(bloco["Id"]) for bloco in LeitorCSVTipado(caminho, esquema).blocos())
+        tempo_blocos = time.perf_counter() - inicio
+
+        print(f"csv.DictReader: {linhas_dict} linhas em {tempo_dict:.2f} s (valores como str)")
+        print(f"csv.DictReader + tipagem: {linhas_tipadas} linhas em {tempo_tipado:.2f} s")
+        print(f"LeitorCSVTipado.blocos: {linhas_blocos} linhas em {tempo_blocos:.2f} s "
+              f"({tempo_dict / tempo_blocos:.1f}x / {tempo_tipado / tempo_blocos:.1f}x)")
@@ -2,12 +2,14 @@
 
 from .cli import CLI
 from .foundation_calculator_interface import FoundationCalculatorInterface
+from .ifc_exporter import IFCExporter
 from .report_generator import ReportGenerator
 from .tqs_data_importer import TQSDataImporter
 
 __all__ = [
     'CLI',
     'FoundationCalculatorInterface',
+    'IFCExporter',
     'ReportGenerator',
     'TQSDataImporter'
 ]
@@ -2,7 +2,7 @@ import logging
 import argparse
 import sys
 from src.lct_calculator.calculators import Sapata, Bloco, Tubulao, Estaca, Radier, Barrete, SapataCorrida, EstacaHeliceContinua, TubulaoCeuAberto, TubulaoArComprimido
-from src.lct_calculator.database import DatabaseService
+from src.lct_calculator.database import COLUNAS_CALCULOS, DatabaseService
 from src.lct_calculator.interfaces.report_generator import ReportGenerator
 
 # Configurando o logger
@@ -30,7 +30,7 @@ class CLI:
 
         # Comando para gerar relatório
         gerar_relatorio_parser = subparsers.add_parser("gerar-relatorio", help="Gerar relatório de fundações")
-        gerar_relatorio_parser.add_argument("formato", choices=['csv', 'json', 'pdf'], help="Formato do relatório")
+        gerar_relatorio_parser.add_argument("formato", choices=['csv', 'json', 'ndjson', 'pdf'], help="Formato do relatório")
         gerar_relatorio_parser.add_argument("--file", required=True, type=str, help="Caminho para o arquivo de saída")
 
     def executar(self, args=None):
@@ -76,8 +76,8 @@ class CLI:
             resultado = fundacao.gerar_relatorio()
 
             # Salvar no banco de dados
-            dados_entrada = f"Área: {area} m², Força: {forca} kN"
-            self.db_service.salvar_calculo(tipo, dados_entrada, str(resultado))
+            dados_entrada = {"area": area, "forca": forca, "fck": fundacao.fck}
+            self.db_service.salvar_calculo(tipo, dados_entrada, resultado)
             print(f"Resultado do cálculo de {tipo}: {resultado}")
         except Exception as e:
             print(f"Erro ao calcular a fundação: {e}")
@@ -86,9 +86,9 @@ class CLI:
     def gerar_relatorio(self, formato, caminho_arquivo):
         """Gera um relatório baseado nos cálculos realizados"""
         try:
-            # Exemplo de dados que poderiam ser extraídos do banco de dados
-            dados = self.db_service.buscar_calculos()
-            relatorio = ReportGenerator(dados=dados, nome_projeto="Projeto Exemplo", engenheiro_responsavel="Eng. Rafael Dias")
+            # Os cálculos são lidos do banco em fluxo, à medida que o relatório é gravado
+            relatorio = ReportGenerator(dados=self.db_service.iterar_calculos, nome_projeto="Projeto Exemplo",
+                                        engenheiro_responsavel="Eng. Rafael Dias", colunas=COLUNAS_CALCULOS)
             relatorio.gerar_relatorio(formato, caminho_arquivo)
             print(f"Relatório gerado com sucesso: {caminho_arquivo}")
         except Exception as e:
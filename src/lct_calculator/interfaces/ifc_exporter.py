@@ -0,0 +1,374 @@
+import os
+import ifcopenshell
+import ifcopenshell.guid
+import numpy as np
+from typing import Any, Dict, List, Optional, Tuple
+import logging
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Nome padrão do conjunto de propriedades com os resultados dos cálculos
+NOME_PSET_PADRAO = "Pset_LCT_Calculo"
+
+# Tipo de fundação -> (classe IFC, PredefinedType, perfil, campos das dimensões do perfil, campo da profundidade)
+# Perfis retangulares recebem (dimensão X, dimensão Y); circulares, (diâmetro,).
+# Sapatas e blocos são extrudados para cima a partir da cota de assentamento; estacas e tubulões,
+# para baixo a partir do topo.
+MAPEAMENTO_FUNDACOES = {
+    "sapata": ("IfcFooting", "PAD_FOOTING", "retangular", ("base", "base"), "altura"),
+    "bloco": ("IfcFooting", "PILE_CAP", "retangular", ("largura", "comprimento"), "altura"),
+    "estaca": ("IfcPile", "BORED", "circular", ("diametro",), "comprimento"),
+    "tubulão": ("IfcPile", "USERDEFINED", "circular", ("diametro",), "altura"),
+}
+
+
+class IFCExporter:
+    """
+    Classe responsável por gravar resultados de cálculo em modelos IFC.
+    """
+
+    @staticmethod
+    def _valor_ifc(valor: Any) -> Tuple[str, Any]:
+        """
+        Converte um valor Python ou NumPy no tipo IFC correspondente (IfcBoolean, IfcInteger, IfcReal,
+        IfcLabel). Escalares NumPy (np.int64, np.float32, np.bool_...) viram os tipos nativos.
+        """
+        if isinstance(valor, (bool, np.bool_)):
+            return "IfcBoolean", bool(valor)
+        if isinstance(valor, (int, np.integer)):
+            return "IfcInteger", int(valor)
+        if isinstance(valor, (float, np.floating)):
+            return "IfcReal", float(valor)
+        return "IfcLabel", str(valor)
+
+    @staticmethod
+    def gravar_resultados(modelo_ifc: ifcopenshell.file, resultados: Dict[str, Dict[str, Any]],
+                          nome_pset: str = NOME_PSET_PADRAO) -> Dict[str, int]:
+        """
+        Grava os resultados como IfcPropertySet nos elementos do modelo, identificados por GlobalId.
+
+        As entidades são criadas em lote: cada propriedade (nome, tipo, valor) vira uma única
+        IfcPropertySingleValue compartilhada, cada combinação distinta de propriedades vira um único
+        IfcPropertySet, e todos os elementos com o mesmo conjunto são ligados por um único
+        IfcRelDefinesByProperties. Conjuntos com o mesmo nome gravados anteriormente nesses
+        elementos são substituídos.
+
+        :param modelo_ifc: Objeto ifcopenshell.file carregado.
+        :param resultados: Dicionário {GlobalId: {nome_propriedade: valor}}.
+        :param nome_pset: Nome do conjunto de propriedades.
+        :return: Estatísticas (elementos, nao_encontrados, propriedades, psets, relacoes).
+        """
+        elementos = {}
+        nao_encontrados = 0
+        for global_id in resultados:
+            try:
+                elementos[global_id] = modelo_ifc.by_guid(global_id)
+            except RuntimeError:
+                nao_encontrados += 1
+        if nao_encontrados:
+            logging.warning(f"{nao_encontrados} GlobalIds não encontrados no modelo IFC.")
+
+        IFCExporter._remover_psets_anteriores(modelo_ifc, set(elementos), nome_pset)
+
+        owner_history = next(iter(modelo_ifc.by_type("IfcOwnerHistory")), None)
+        propriedades: Dict[Tuple[str, str, Any], ifcopenshell.entity_instance] = {}
+        grupos: Dict[Tuple, List[ifcopenshell.entity_instance]] = {}
+        for global_id, elemento in elementos.items():
+            chaves = []
+            for nome, valor in resultados[global_id].items():
+                if valor is None:
+                    continue
+                tipo_ifc, valor_ifc = IFCExporter._valor_ifc(valor)
+                chave = (nome, tipo_ifc, valor_ifc)
+                if chave not in propriedades:
+                    propriedades[chave] = modelo_ifc.create_entity(
+                        "IfcPropertySingleValue", Name=nome,
+                        NominalValue=modelo_ifc.create_entity(tipo_ifc, valor_ifc),
+                    )
+                chaves.append(chave)
+            if chaves:
+                grupos.setdefault(tuple(sorted(chaves, key=repr)), []).append(elemento)
+
+        for chaves, objetos in grupos.items():
+            pset = modelo_ifc.create_entity(
+                "IfcPropertySet", GlobalId=ifcopenshell.guid.new(), OwnerHistory=owner_history,
+                Name=nome_pset, HasProperties=[propriedades[chave] for chave in chaves],
+            )
+            modelo_ifc.create_entity(
+                "IfcRelDefinesByProperties", GlobalId=ifcopenshell.guid.new(), OwnerHistory=owner_history,
+                RelatedObjects=objetos, RelatingPropertyDefinition=pset,
+            )
+
+        estatisticas = {
+            "elementos": len(elementos),
+            "nao_encontrados": nao_encontrados,
+            "propriedades": len(propriedades),
+            "psets": len(grupos),
+            "relacoes": len(grupos),
+        }
+        logging.info(f"Resultados gravados no modelo IFC: {estatisticas}")
+        return estatisticas
+
+    @staticmethod
+    def criar_modelo(nome_projeto: str = "Projeto", schema: str = "IFC4") -> ifcopenshell.file:
+        """
+        Cria um modelo IFC vazio com projeto, unidades (metro), contexto geométrico e a hierarquia
+        espacial mínima (terreno, edifício e pavimento de fundações).
+
+        :param nome_projeto: Nome do IfcProject.
+        :param schema: Esquema IFC do arquivo.
+        :return: Objeto ifcopenshell.file criado.
+        """
+        modelo_ifc = ifcopenshell.file(schema=schema)
+        origem = modelo_ifc.create_entity("IfcAxis2Placement3D", Location=modelo_ifc.create_entity(
+            "IfcCartesianPoint", Coordinates=(0.0, 0.0, 0.0)))
+        contexto = modelo_ifc.create_entity(
+            "IfcGeometricRepresentationContext", ContextType="Model", CoordinateSpaceDimension=3,
+            Precision=1e-5, WorldCoordinateSystem=origem,
+        )
+        unidades = modelo_ifc.create_entity("IfcUnitAssignment", Units=[
+            modelo_ifc.create_entity("IfcSIUnit", UnitType="LENGTHUNIT", Name="METRE"),
+            modelo_ifc.create_entity("IfcSIUnit", UnitType="AREAUNIT", Name="SQUARE_METRE"),
+            modelo_ifc.create_entity("IfcSIUnit", UnitType="VOLUMEUNIT", Name="CUBIC_METRE"),
+        ])
+        projeto = modelo_ifc.create_entity(
+            "IfcProject", GlobalId=ifcopenshell.guid.new(), Name=nome_projeto,
+            RepresentationContexts=[contexto], UnitsInContext=unidades,
+        )
+
+        pai, posicionamento_pai = projeto, None
+        for classe, nome in (("IfcSite", "Terreno"), ("IfcBuilding", "Edifício"),
+                             ("IfcBuildingStorey", "Fundações")):
+            posicionamento = modelo_ifc.create_entity(
+                "IfcLocalPlacement", PlacementRelTo=posicionamento_pai, RelativePlacement=origem
+            )
+            espaco = modelo_ifc.create_entity(
+                classe, GlobalId=ifcopenshell.guid.new(), Name=nome, ObjectPlacement=posicionamento,
+                CompositionType="ELEMENT",
+            )
+            modelo_ifc.create_entity(
+                "IfcRelAggregates", GlobalId=ifcopenshell.guid.new(), RelatingObject=pai, RelatedObjects=[espaco]
+            )
+            pai, posicionamento_pai = espaco, posicionamento
+        return modelo_ifc
+
+    @staticmethod
+    def gerar_fundacoes(modelo_ifc: ifcopenshell.file, fundacoes: List[Dict[str, Any]],
+                        pavimento: Optional[ifcopenshell.entity_instance] = None) -> List[ifcopenshell.entity_instance]:
+        """
+        Cria em lote elementos IfcFooting/IfcPile a partir das fundações dimensionadas.
+
+        Cada dimensionamento distinto (tipo + dimensões) gera um único perfil, sólido extrudado,
+        IfcRepresentationMap e tipo (IfcFootingType/IfcPileType); os elementos apenas o referenciam
+        por um IfcMappedItem compartilhado. Pontos repetidos, a contenção espacial e a associação aos
+        tipos também são criados uma única vez.
+
+        :param modelo_ifc: Modelo de destino (ver criar_modelo).
+        :param fundacoes: Lista de dicionários com "tipo" (chave de MAPEAMENTO_FUNDACOES), as dimensões
+            em metros, a posição "x", "y", "z" (padrão 0) e, opcionalmente, "nome".
+        :param pavimento: IfcBuildingStorey que contém os elementos (padrão: primeiro do modelo).
+        :return: Lista com os elementos criados, na ordem de entrada.
+        """
+        if pavimento is None:
+            pavimento = next(iter(modelo_ifc.by_type("IfcBuildingStorey")), None)
+            if pavimento is None:
+                raise ValueError("O modelo IFC não possui IfcBuildingStorey para conter as fundações.")
+        contexto = next(iter(modelo_ifc.by_type("IfcGeometricRepresentationContext")), None)
+        owner_history = next(iter(modelo_ifc.by_type("IfcOwnerHistory")), None)
+
+        # Valida e converte todas as entradas antes de criar qualquer entidade, para que um tipo
+        # desconhecido ou uma dimensão ausente não deixe o modelo parcialmente preenchido
+        preparadas = []
+        for fundacao in fundacoes:
+            tipo = fundacao["tipo"]
+            if tipo not in MAPEAMENTO_FUNDACOES:
+                raise ValueError(f"Tipo de fundação '{tipo}' não suportado na geração IFC.")
+            _, _, _, campos_dimensoes, campo_profundidade = MAPEAMENTO_FUNDACOES[tipo]
+            preparadas.append((
+                fundacao, tipo,
+                tuple(float(fundacao[campo]) for campo in campos_dimensoes),
+                float(fundacao[campo_profundidade]),
+                (float(fundacao.get("x", 0.0)), float(fundacao.get("y", 0.0)), float(fundacao.get("z", 0.0))),
+            ))
+
+        cache: Dict[Any, ifcopenshell.entity_instance] = {}
+
+        def ponto(coordenadas):
+            chave = ("ponto", coordenadas)
+            if chave not in cache:
+                cache[chave] = modelo_ifc.create_entity("IfcCartesianPoint", Coordinates=coordenadas)
+            return cache[chave]
+
+        def direcao(razoes):
+            chave = ("direcao", razoes)
+            if chave not in cache:
+                cache[chave] = modelo_ifc.create_entity("IfcDirection", DirectionRatios=razoes)
+            return cache[chave]
+
+        origem = modelo_ifc.create_entity("IfcAxis2Placement3D", Location=ponto((0.0, 0.0, 0.0)))
+        origem_2d = modelo_ifc.create_entity("IfcAxis2Placement2D", Location=ponto((0.0, 0.0)))
+        operador = modelo_ifc.create_entity(
+            "IfcCartesianTransformationOperator3D", LocalOrigin=ponto((0.0, 0.0, 0.0))
+        )
+
+        def forma(tipo: str, dimensoes: Tuple[float, ...], profundidade: float):
+            """Retorna (IfcProductDefinitionShape, tipo IFC) compartilhados do dimensionamento"""
+            chave = ("forma", tipo, dimensoes, profundidade)
+            if chave in cache:
+                return cache[chave]
+            classe, predefinido, perfil, _, _ = MAPEAMENTO_FUNDACOES[tipo]
+            if perfil == "retangular":
+                secao = modelo_ifc.create_entity(
+                    "IfcRectangleProfileDef", ProfileType="AREA", Position=origem_2d,
+                    XDim=dimensoes[0], YDim=dimensoes[1],
+                )
+                sentido = (0.0, 0.0, 1.0)
+            else:
+                secao = modelo_ifc.create_entity(
+                    "IfcCircleProfileDef", ProfileType="AREA", Position=origem_2d, Radius=dimensoes[0] / 2
+                )
+                sentido = (0.0, 0.0, -1.0)
+            solido = modelo_ifc.create_entity(
+                "IfcExtrudedAreaSolid", SweptArea=secao, Position=origem,
+                ExtrudedDirection=direcao(sentido), Depth=profundidade,
+            )
+            mapa = modelo_ifc.create_entity(
+                "IfcRepresentationMap", MappingOrigin=origem,
+                MappedRepresentation=modelo_ifc.create_entity(
+                    "IfcShapeRepresentation", ContextOfItems=contexto, RepresentationIdentifier="Body",
+                    RepresentationType="SweptSolid", Items=[solido],
+                ),
+            )
+            item = modelo_ifc.create_entity("IfcMappedItem", MappingSource=mapa, MappingTarget=operador)
+            representacao = modelo_ifc.create_entity(
+                "IfcProductDefinitionShape", Representations=[modelo_ifc.create_entity(
+                    "IfcShapeRepresentation", ContextOfItems=contexto, RepresentationIdentifier="Body",
+                    RepresentationType="MappedRepresentation", Items=[item],
+                )],
+            )
+            nome_tipo = f"{tipo} {' x '.join(f'{d:g}' for d in dimensoes)} x {profundidade:g}"
+            tipo_ifc = modelo_ifc.create_entity(
+                f"{classe}Type", GlobalId=ifcopenshell.guid.new(), OwnerHistory=owner_history, Name=nome_tipo,
+                RepresentationMaps=[mapa], PredefinedType=predefinido,
+                ElementType=tipo if predefinido == "USERDEFINED" else None,
+            )
+            cache[chave] = (representacao, tipo_ifc)
+            return cache[chave]
+
+        elementos = []
+        por_tipo: Dict[int, Tuple[ifcopenshell.entity_instance, List]] = {}
+        posicionamento_pavimento = pavimento.ObjectPlacement
+        for indice, (fundacao, tipo, dimensoes, profundidade, posicao) in enumerate(preparadas):
+            classe, predefinido = MAPEAMENTO_FUNDACOES[tipo][:2]
+            representacao, tipo_ifc = forma(tipo, dimensoes, profundidade)
+
+            posicionamento = modelo_ifc.create_entity(
+                "IfcLocalPlacement", PlacementRelTo=posicionamento_pavimento,
+                RelativePlacement=modelo_ifc.create_entity("IfcAxis2Placement3D", Location=ponto(posicao)),
+            )
+            elemento = modelo_ifc.create_entity(
+                classe, GlobalId=ifcopenshell.guid.new(), OwnerHistory=owner_history,
+                Name=fundacao.get("nome", f"{tipo} {indice + 1}"), ObjectType=tipo if predefinido == "USERDEFINED" else None,
+                ObjectPlacement=posicionamento, Representation=representacao, PredefinedType=predefinido,
+            )
+            elementos.append(elemento)
+            por_tipo.setdefault(tipo_ifc.id(), (tipo_ifc, []))[1].append(elemento)
+
+        if elementos:
+            modelo_ifc.create_entity(
+                "IfcRelContainedInSpatialStructure", GlobalId=ifcopenshell.guid.new(), OwnerHistory=owner_history,
+                RelatedElements=elementos, RelatingStructure=pavimento,
+            )
+        for tipo_ifc, objetos in por_tipo.values():
+            modelo_ifc.create_entity(
+                "IfcRelDefinesByType", GlobalId=ifcopenshell.guid.new(), OwnerHistory=owner_history,
+                RelatedObjects=objetos, RelatingType=tipo_ifc,
+            )
+        logging.info(f"{len(elementos)} fundações geradas no modelo IFC ({len(por_tipo)} dimensionamentos distintos).")
+        return elementos
+
+    @staticmethod
+    def _remover_psets_anteriores(modelo_ifc: ifcopenshell.file, global_ids: set, nome_pset: str) -> None:
+        """
+        Desliga dos elementos informados os conjuntos de propriedades com o mesmo nome (uma passagem).
+        Conjuntos que ficam sem elementos são removidos junto com as propriedades que só eles usavam.
+        """
+        for relacao in modelo_ifc.by_type("IfcRelDefinesByProperties"):
+            definicao = relacao.RelatingPropertyDefinition
+            if not definicao.is_a("IfcPropertySet") or definicao.Name != nome_pset:
+                continue
+            restantes = [obj for obj in relacao.RelatedObjects if obj.GlobalId not in global_ids]
+            if len(restantes) == len(relacao.RelatedObjects):
+                continue
+            if restantes:
+                relacao.RelatedObjects = restantes
+            else:
+                modelo_ifc.remove(relacao)
+                if modelo_ifc.get_total_inverses(definicao) == 0:
+                    propriedades = list(definicao.HasProperties)
+                    modelo_ifc.remove(definicao)
+                    for propriedade in propriedades:
+                        if modelo_ifc.get_total_inverses(propriedade) == 0:
+                            modelo_ifc.remove(propriedade)
+
+    @staticmethod
+    def gravar_resultados_arquivo(caminho_entrada: str, resultados: Dict[str, Dict[str, Any]],
+                                  caminho_saida: Optional[str] = None,
+                                  nome_pset: str = NOME_PSET_PADRAO) -> Dict[str, int]:
+        """
+        Abre o arquivo IFC uma vez, grava os resultados em lote e salva o arquivo uma única vez.
+
+        :param caminho_entrada: Caminho do arquivo IFC de origem.
+        :param resultados: Dicionário {GlobalId: {nome_propriedade: valor}}.
+        :param caminho_saida: Caminho do arquivo enriquecido (padrão: sobrescreve a origem).
+        :param nome_pset: Nome do conjunto de propriedades.
+        :return: Estatísticas da gravação (ver gravar_resultados).
+        """
+        if not os.path.exists(caminho_entrada):
+            logging.error(f"Arquivo IFC não encontrado: {caminho_entrada}")
+            raise FileNotFoundError(f"Arquivo {caminho_entrada} não encontrado.")
+
+        try:
+            modelo_ifc = ifcopenshell.open(caminho_entrada)
+            estatisticas = IFCExporter.gravar_resultados(modelo_ifc, resultados, nome_pset)
+            modelo_ifc.write(caminho_saida or caminho_entrada)
+            logging.info(f"Arquivo IFC enriquecido salvo em {caminho_saida or caminho_entrada}.")
+            return estatisticas
+        except Exception as e:
+            logging.error(f"Erro ao gravar resultados no arquivo IFC: {e}")
+            raise
+
+
+# Exemplo de uso e benchmark de geração em lote
+if __name__ == "__main__":
+    import argparse
+    import random
+    import time
+
+    parser = argparse.ArgumentParser(description="Benchmark de geração de fundações IFC")
+    parser.add_argument('--quantidade', type=int, default=50000, help="Quantidade de fundações geradas")
+    parser.add_argument('--saida', type=str, default="fundacoes_benchmark.ifc", help="Arquivo IFC de saída")
+    args = parser.parse_args()
+
+    # Poucos dimensionamentos distintos, como em um projeto real
+    modelos = [
+        {"tipo": "sapata", "base": 1.5, "altura": 0.6},
+        {"tipo": "sapata", "base": 2.0, "altura": 0.8},
+        {"tipo": "bloco", "largura": 1.2, "comprimento": 2.4, "altura": 1.0},
+        {"tipo": "estaca", "diametro": 0.4, "comprimento": 12.0},
+        {"tipo": "tubulão", "diametro": 1.2, "altura": 8.0},
+    ]
+    fundacoes = [
+        dict(random.choice(modelos), x=(i % 250) * 5.0, y=(i // 250) * 5.0, z=-1.5)
+        for i in range(args.quantidade)
+    ]
+
+    inicio = time.perf_counter()
+    modelo = IFCExporter.criar_modelo("Benchmark")
+    IFCExporter.gerar_fundacoes(modelo, fundacoes)
+    geracao = time.perf_counter() - inicio
+    modelo.write(args.saida)
+    total = time.perf_counter() - inicio
+    print(f"{args.quantidade} fundações: geração {geracao:.2f} s, total com gravação {total:.2f} s "
+          f"({args.quantidade / total:.0f} elementos/s, {os.path.getsize(args.saida) / 1e6:.1f} MB)")
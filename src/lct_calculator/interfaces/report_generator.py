@@ -1,28 +1,73 @@
 import csv
+import io
+import itertools
 import json
-from fpdf import FPDF
-from typing import List, Dict, Union
+import os
+import re
+import textwrap
+from concurrent.futures import ProcessPoolExecutor
+from typing import Any, Callable, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence, Tuple, Union
 import logging
 
+from src.lct_calculator.helpers.cache_fragmentos import CacheFragmentos, assinatura
+from src.lct_calculator.helpers.compression import abrir_escrita
+from src.lct_calculator.helpers.pdf_tabela import LayoutTabela, MotorPDFTabela
+
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 
+# Separador entre os elementos de "dados" em cada modo de gerar_json
+SEPARADORES_JSON = {'indentado': ",\n", 'compacto': ",", 'ndjson': "\n"}
+
+# Caracteres substituídos ao usar o nome do edifício como nome de arquivo
+_NOME_INVALIDO = re.compile(r"[^\w.-]+")
+
 class ReportGenerator:
     """
     Classe para geração de relatórios com base em dados de cálculo de fundações.
     Suporta múltiplos formatos: CSV, JSON e PDF.
     """
 
-    def __init__(self, dados: List[Dict[str, Union[str, float, int]]], nome_projeto: str, engenheiro_responsavel: str):
+    def __init__(self, dados: Union[Iterable[Union[Dict[str, Any], Sequence[Any]]], Callable[[], Iterable]],
+                 nome_projeto: str, engenheiro_responsavel: str, colunas: Optional[Sequence[str]] = None,
+                 cache: Optional[CacheFragmentos] = None):
         """
         Inicializa o gerador de relatórios com os dados necessários.
-        :param dados: Lista de dicionários contendo os dados calculados das fundações.
+        :param dados: Linhas do relatório (dicionários ou tuplas), em lista, iterador, cursor do
+            SQLite ou função que retorna um novo iterável a cada relatório. As linhas são lidas em
+            fluxo, sem carregar tudo em memória; iteradores de uso único servem a um único relatório.
         :param nome_projeto: Nome do projeto.
         :param engenheiro_responsavel: Nome do engenheiro responsável pelo projeto.
+        :param colunas: Esquema das colunas; obrigatório para tuplas, exceto cursores (usa cursor.description).
+            Para dicionários, o padrão são as chaves da primeira linha.
+        :param cache: Cache de fragmentos renderizados; ao regenerar o relatório, apenas as linhas
+            alteradas desde a geração anterior são renderizadas novamente.
         """
         self.dados = dados
         self.nome_projeto = nome_projeto
         self.engenheiro_responsavel = engenheiro_responsavel
+        self.colunas = list(colunas) if colunas is not None else None
+        self.cache = cache
+
+    def _linhas(self) -> Tuple[List[str], Iterator[Tuple[Any, ...]]]:
+        """Retorna o esquema de colunas e um iterador de tuplas na ordem do esquema"""
+        dados = self.dados() if callable(self.dados) else self.dados
+        colunas = self.colunas
+        if colunas is None and getattr(dados, "description", None):
+            colunas = [descricao[0] for descricao in dados.description]
+        linhas = iter(dados)
+        if colunas is None:
+            primeira = next(linhas, None)
+            if primeira is None:
+                return [], iter(())
+            if not isinstance(primeira, dict):
+                raise ValueError("Informe 'colunas' para gerar relatórios a partir de tuplas.")
+            colunas = list(primeira.keys())
+            linhas = itertools.chain([primeira], linhas)
+        return colunas, (
+            tuple(linha.get(coluna) for coluna in colunas) if isinstance(linha, dict) else tuple(linha)
+            for linha in linhas
+        )
 
     def gerar_csv(self, caminho_arquivo: str):
         """
@@ -30,78 +75,156 @@ class ReportGenerator:
         :param caminho_arquivo: Caminho onde o arquivo CSV será salvo.
         """
         try:
+            colunas, linhas = self._linhas()
             with open(caminho_arquivo, mode='w', newline='', encoding='utf-8') as file:
-                writer = csv.DictWriter(file, fieldnames=self.dados[0].keys())
-                writer.writeheader()
-                writer.writerows(self.dados)
+                writer = csv.writer(file)
+                writer.writerow(colunas)
+                if self.cache is None:
+                    writer.writerows(linhas)
+                else:
+                    buffer = io.StringIO()
+                    writer_linha = csv.writer(buffer)
+
+                    def renderizar(linha):
+                        buffer.seek(0)
+                        buffer.truncate()
+                        writer_linha.writerow(linha)
+                        return buffer.getvalue().encode('utf-8')
+
+                    for fragmento in self.cache.renderizar(assinatura("csv", colunas), linhas, renderizar):
+                        file.write(fragmento.decode('utf-8'))
             logging.info(f"Relatório CSV gerado com sucesso: {caminho_arquivo}")
         except Exception as e:
             logging.error(f"Erro ao gerar relatório CSV: {e}")
             raise
 
-    def gerar_json(self, caminho_arquivo: str):
+    def gerar_json(self, caminho_arquivo: str, modo: str = 'indentado'):
         """
-        Gera um relatório em formato JSON.
-        :param caminho_arquivo: Caminho onde o arquivo JSON será salvo.
+        Gera um relatório em formato JSON, gravando uma linha de dados por vez.
+        :param caminho_arquivo: Caminho onde o arquivo JSON será salvo; com extensão de
+            compressão (.gz, .bz2, .xz...), o arquivo é comprimido em fluxo.
+        :param modo: "indentado" (mesmo formato de json.dump com indent=4), "compacto" (sem
+            espaços) ou "ndjson" (uma linha com o cabeçalho do projeto e depois um elemento por linha).
         """
+        if modo not in SEPARADORES_JSON:
+            raise ValueError(f"Modo JSON '{modo}' não suportado. Use um de {tuple(SEPARADORES_JSON)}.")
         try:
-            with open(caminho_arquivo, mode='w', encoding='utf-8') as file:
-                json.dump({
-                    "nome_projeto": self.nome_projeto,
-                    "engenheiro_responsavel": self.engenheiro_responsavel,
-                    "dados": self.dados
-                }, file, indent=4)
+            colunas, linhas = self._linhas()
+            cabecalho = {"nome_projeto": self.nome_projeto, "engenheiro_responsavel": self.engenheiro_responsavel}
+            itens = self._itens_json(colunas, linhas, modo)
+            with abrir_escrita(caminho_arquivo, encoding='utf-8') as file:
+                if modo == 'ndjson':
+                    file.write(json.dumps(cabecalho, separators=(",", ":")) + "\n")
+                    for item in itens:
+                        file.write(item + "\n")
+                elif modo == 'compacto':
+                    file.write(json.dumps(cabecalho, separators=(",", ":"))[:-1] + ',"dados":[')
+                    separador = ""
+                    for item in itens:
+                        file.write(separador + item)
+                        separador = ","
+                    file.write("]}")
+                else:
+                    file.write("{\n")
+                    file.write(f'    "nome_projeto": {json.dumps(self.nome_projeto)},\n')
+                    file.write(f'    "engenheiro_responsavel": {json.dumps(self.engenheiro_responsavel)},\n')
+                    file.write('    "dados": [')
+                    separador = "\n"
+                    for item in itens:
+                        file.write(separador + item)
+                        separador = ",\n"
+                    file.write("\n    ]\n}" if separador != "\n" else "]\n}")
             logging.info(f"Relatório JSON gerado com sucesso: {caminho_arquivo}")
         except Exception as e:
             logging.error(f"Erro ao gerar relatório JSON: {e}")
             raise
 
-    def gerar_pdf(self, caminho_arquivo: str):
+    def _itens_json(self, colunas: Sequence[str], linhas: Iterable[Sequence[Any]], modo: str) -> Iterator[str]:
         """
-        Gera um relatório em formato PDF.
-        :param caminho_arquivo: Caminho onde o arquivo PDF será salvo.
+        Serializa cada linha como elemento de "dados", conforme o modo. Com cache, cada texto
+        retornado é um grupo de elementos, já unidos pelo separador do modo.
         """
-        try:
-            pdf = FPDF()
-            pdf.add_page()
-            pdf.set_font("Arial", size=12)
-
-            # Cabeçalho
-            pdf.cell(200, 10, txt=f"Relatório do Projeto: {self.nome_projeto}", ln=True, align='C')
-            pdf.cell(200, 10, txt=f"Engenheiro Responsável: {self.engenheiro_responsavel}", ln=True, align='C')
-
-            # Adiciona uma linha em branco
-            pdf.ln(10)
+        if modo == 'indentado':
+            def renderizar(linha):
+                return textwrap.indent(json.dumps(dict(zip(colunas, linha)), indent=4, default=str), " " * 8)
+        else:
+            def renderizar(linha):
+                return json.dumps(dict(zip(colunas, linha)), separators=(",", ":"), default=str)
 
-            # Adiciona os dados de cada fundação
-            for fundacao in self.dados:
-                for key, value in fundacao.items():
-                    pdf.cell(200, 10, txt=f"{key}: {value}", ln=True)
-                pdf.ln(5)
+        if self.cache is None:
+            return (renderizar(linha) for linha in linhas)
+        return (fragmento.decode('utf-8') for fragmento in self.cache.renderizar(
+            assinatura("json", modo, colunas), linhas, lambda linha: renderizar(linha).encode('utf-8'),
+            separador=SEPARADORES_JSON[modo].encode('utf-8')))
 
-            # Salva o PDF no caminho especificado
-            pdf.output(caminho_arquivo)
+    def gerar_pdf(self, caminho_arquivo: str, processos: Optional[int] = None) -> int:
+        """
+        Gera um relatório em formato PDF, com uma linha de tabela por fundação.
+        :param caminho_arquivo: Caminho onde o arquivo PDF será salvo.
+        :param processos: Processos usados na renderização (padrão: número de CPUs); relatórios
+            com até PAGINAS_POR_BLOCO páginas são renderizados no processo atual.
+        :return: Número de páginas geradas.
+        """
+        try:
+            colunas, linhas = self._linhas()
+            layout = LayoutTabela(colunas, titulo=f"Relatório do Projeto: {self.nome_projeto}",
+                                  subtitulo=f"Engenheiro Responsável: {self.engenheiro_responsavel}")
+            paginas = MotorPDFTabela(layout, processos, cache=self.cache).gravar(caminho_arquivo, linhas)
             logging.info(f"Relatório PDF gerado com sucesso: {caminho_arquivo}")
+            return paginas
         except Exception as e:
             logging.error(f"Erro ao gerar relatório PDF: {e}")
             raise
 
     def gerar_relatorio(self, formato: str, caminho_arquivo: str):
         """
-        Gera o relatório no formato especificado (CSV, JSON, PDF).
-        :param formato: O formato desejado (csv, json, pdf).
+        Gera o relatório no formato especificado (CSV, JSON, NDJSON, PDF).
+        :param formato: O formato desejado (csv, json, ndjson, pdf).
         :param caminho_arquivo: Caminho onde o relatório será salvo.
         """
         if formato == 'csv':
             self.gerar_csv(caminho_arquivo)
         elif formato == 'json':
             self.gerar_json(caminho_arquivo)
+        elif formato == 'ndjson':
+            self.gerar_json(caminho_arquivo, modo='ndjson')
         elif formato == 'pdf':
             self.gerar_pdf(caminho_arquivo)
         else:
             logging.error(f"Formato de relatório não suportado: {formato}")
             raise ValueError("Formato de relatório não suportado.")
 
+    @staticmethod
+    def gerar_relatorios_paralelo(geradores: Mapping[str, "ReportGenerator"], diretorio: str, formato: str = 'pdf',
+                                  max_processos: Optional[int] = None) -> Dict[str, str]:
+        """
+        Gera um relatório por edifício (ou qualquer agrupamento), cada um em um processo.
+        :param geradores: Dicionário {edifício: gerador}; os dados de cada gerador devem ser
+            serializáveis (listas de linhas), pois são enviados aos processos de trabalho.
+        :param diretorio: Diretório onde os relatórios serão salvos, como "<edifício>.<formato>".
+        :param formato: O formato desejado (csv, json, ndjson, pdf).
+        :param max_processos: Número máximo de processos (padrão: número de CPUs).
+        :return: Dicionário {edifício: caminho do relatório}.
+        """
+        os.makedirs(diretorio, exist_ok=True)
+        caminhos = {nome: os.path.join(diretorio, f"{_NOME_INVALIDO.sub('_', nome)}.{formato}") for nome in geradores}
+        with ProcessPoolExecutor(max_processos) as executor:
+            futuros = [executor.submit(_gerar_relatorio, gerador, formato, caminhos[nome])
+                       for nome, gerador in geradores.items()]
+            for futuro in futuros:
+                futuro.result()
+        logging.info(f"{len(caminhos)} relatórios {formato.upper()} gerados em {diretorio}")
+        return caminhos
+
+
+def _gerar_relatorio(gerador: ReportGenerator, formato: str, caminho_arquivo: str):
+    """Gera um relatório em um processo de trabalho, sem abrir um segundo pool para o PDF"""
+    if formato == 'pdf':
+        gerador.gerar_pdf(caminho_arquivo, processos=1)
+    else:
+        gerador.gerar_relatorio(formato, caminho_arquivo)
+
+
 # Exemplo de uso
 if __name__ == "__main__":
     # Dados de exemplo
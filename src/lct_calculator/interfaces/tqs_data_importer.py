@@ -2,12 +2,31 @@ import os
 import csv
 import json
 import ifcopenshell
-from typing import List, Dict, Union
+import ifcopenshell.geom
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Union
 import logging
 
+import numpy as np
+
+from src.lct_calculator.helpers.compression import abrir_ifc, abrir_texto, extensao_base
+from src.lct_calculator.helpers.ifc_cache import CacheExtracaoIFC
+from src.lct_calculator.helpers.ifc_relacoes import IndiceRelacoesIFC
+from src.lct_calculator.helpers.indexed_csv_reader import LeitorCSVIndexado
+from src.lct_calculator.helpers.json_stream import iterar_json
+from src.lct_calculator.helpers.typed_csv_reader import ColunaCSV, LeitorCSVTipado
+
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 
+# Versão do formato retornado por extrair_informacoes_ifc; mudar invalida as extrações em cache
+VERSAO_EXTRACAO_IFC = 4
+
+# Classes IFC de fundação cuja geometria é processada na extração de dimensões
+CLASSES_FUNDACOES = ("IfcFooting", "IfcPile")
+
+# Classes dos elementos apoiados extraídos junto com as fundações (ligados a elas por IfcRelConnectsElements)
+CLASSES_APOIADAS = ("IfcColumn",)
+
 class TQSDataImporter:
     """
     Classe responsável por importar dados de arquivos do TQS (.csv, .json, .ifc).
@@ -26,7 +45,7 @@ class TQSDataImporter:
             raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
         
         try:
-            with open(caminho_arquivo, mode='r', encoding='utf-8') as file:
+            with abrir_texto(caminho_arquivo, newline='') as file:
                 reader = csv.DictReader(file)
                 dados = [linha for linha in reader]
             logging.info(f"Dados do arquivo CSV {caminho_arquivo} carregados com sucesso.")
@@ -35,6 +54,38 @@ class TQSDataImporter:
             logging.error(f"Erro ao carregar o arquivo CSV: {e}")
             raise
 
+    @staticmethod
+    def iterar_csv(caminho_arquivo: str, esquema: Sequence[ColunaCSV], tamanho_bloco: Optional[int] = None,
+                   delimitador: Optional[str] = None, decimal: str = ".") -> Iterator:
+        """
+        Lê um CSV exportado pelo TQS em fluxo, com os valores tipados segundo o esquema e as
+        unidades normalizadas (m, m², m³, kN, MPa). A memória não cresce com o tamanho do arquivo.
+
+        :param caminho_arquivo: Caminho do arquivo CSV.
+        :param esquema: Colunas a extrair (ver ColunaCSV).
+        :param tamanho_bloco: Se informado, retorna blocos {coluna: array NumPy} com até esse número
+            de linhas; caso contrário, um dicionário tipado por linha.
+        :param delimitador: Separador de campos (padrão: detectado pelo cabeçalho).
+        :param decimal: Separador decimal ('.' ou ',').
+        :return: Iterador de registros ou de blocos.
+        """
+        leitor = LeitorCSVTipado(caminho_arquivo, esquema, delimitador=delimitador, decimal=decimal)
+        if tamanho_bloco is None:
+            return leitor.registros()
+        return leitor.blocos(tamanho_bloco)
+
+    @staticmethod
+    def abrir_csv_indexado(caminho_arquivo: str, delimitador: Optional[str] = None) -> LeitorCSVIndexado:
+        """
+        Abre um CSV para acesso aleatório às linhas (ex.: paginação na interface), sem ler o
+        arquivo inteiro. O índice de linhas é construído na primeira abertura e reaproveitado depois.
+
+        :param caminho_arquivo: Caminho do arquivo CSV (não comprimido).
+        :param delimitador: Separador de campos (padrão: detectado pelo cabeçalho).
+        :return: LeitorCSVIndexado; use como gerenciador de contexto para liberar o mapeamento.
+        """
+        return LeitorCSVIndexado(caminho_arquivo, delimitador=delimitador)
+
     @staticmethod
     def carregar_json(caminho_arquivo: str) -> Union[Dict, List]:
         """
@@ -48,7 +99,7 @@ class TQSDataImporter:
             raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
         
         try:
-            with open(caminho_arquivo, mode='r', encoding='utf-8') as file:
+            with abrir_texto(caminho_arquivo) as file:
                 dados = json.load(file)
             logging.info(f"Dados do arquivo JSON {caminho_arquivo} carregados com sucesso.")
             return dados
@@ -59,6 +110,20 @@ class TQSDataImporter:
             logging.error(f"Erro ao carregar o arquivo JSON: {e}")
             raise
 
+    @staticmethod
+    def iterar_json(caminho_arquivo: str, caminho_elementos: str = "", tamanho_bloco: Optional[int] = None) -> Iterator:
+        """
+        Percorre em fluxo os elementos de uma lista de uma exportação JSON do TQS, sem carregar o
+        arquivo inteiro. O pico de memória é limitado pelo buffer de leitura e pelo tamanho do bloco.
+
+        :param caminho_arquivo: Caminho do arquivo JSON.
+        :param caminho_elementos: Caminho da lista no documento, com chaves separadas por "."
+            (ex.: "elementos" ou "projeto.fundacoes"); "" quando a raiz é a lista.
+        :param tamanho_bloco: Se informado, retorna listas com até esse número de elementos.
+        :return: Iterador de elementos (ou de blocos de elementos).
+        """
+        return iterar_json(caminho_arquivo, caminho_elementos, tamanho_bloco)
+
     @staticmethod
     def carregar_dados_ifc(caminho_arquivo: str) -> ifcopenshell.file:
         """
@@ -72,7 +137,7 @@ class TQSDataImporter:
             raise FileNotFoundError(f"Arquivo {caminho_arquivo} não encontrado.")
         
         try:
-            model = ifcopenshell.open(caminho_arquivo)
+            model = abrir_ifc(caminho_arquivo)
             logging.info(f"Arquivo IFC {caminho_arquivo} carregado com sucesso.")
             return model
         except Exception as e:
@@ -80,28 +145,118 @@ class TQSDataImporter:
             raise
 
     @staticmethod
-    def extrair_informacoes_ifc(modelo_ifc: ifcopenshell.file) -> Dict[str, Union[str, float]]:
+    def extrair_informacoes_ifc(modelo_ifc: ifcopenshell.file, classes: Sequence[str] = CLASSES_FUNDACOES,
+                                classes_apoiadas: Sequence[str] = CLASSES_APOIADAS) -> Dict[str, Dict[str, Any]]:
         """
-        Extrai informações essenciais do arquivo IFC (exemplo: dimensões da fundação, materiais, etc.).
-        
+        Extrai informações essenciais do arquivo IFC: classe, tipo, nome, dimensões, posição,
+        pavimento, materiais e conjuntos de propriedades das fundações e dos pilares que elas apoiam.
+
+        As relações do modelo são indexadas uma única vez (IndiceRelacoesIFC), e cada elemento é
+        resolvido em tempo constante, em uma passada linear. Apenas as fundações são tesseladas;
+        os pilares apoiados entram sem dimensões ('N/A').
+
         :param modelo_ifc: Objeto ifcopenshell.file carregado.
-        :return: Dicionário contendo as informações essenciais extraídas.
+        :param classes: Classes IFC das fundações extraídas.
+        :param classes_apoiadas: Classes dos elementos ligados às fundações (IfcRelConnectsElements)
+            que também são extraídos; os demais elementos dessas classes são ignorados.
+        :return: Dicionário {GlobalId: informações do elemento}.
         """
         fundacoes = {}
         try:
-            for fundacao in modelo_ifc.by_type("IfcFooting"):
-                fundacoes[fundacao.GlobalId] = {
-                    "Tipo": fundacao.ObjectType,
-                    "Nome": fundacao.Name,
-                    "Largura": fundacao.OverallWidth if hasattr(fundacao, 'OverallWidth') else 'N/A',
-                    "Comprimento": fundacao.OverallLength if hasattr(fundacao, 'OverallLength') else 'N/A',
-                }
+            indice = IndiceRelacoesIFC(modelo_ifc)
+            dimensoes = TQSDataImporter.extrair_dimensoes_ifc(modelo_ifc, classes=classes)
+            apoiados = {}
+            for classe in classes:
+                for elemento in modelo_ifc.by_type(classe):
+                    informacoes = indice.descrever(elemento)
+                    medidas = dimensoes.get(elemento.GlobalId, {})
+                    for dimensao in ("Largura", "Comprimento", "Altura"):
+                        informacoes[dimensao] = medidas.get(dimensao, 'N/A')
+                    fundacoes[elemento.GlobalId] = informacoes
+                    for conectado in indice.conectados(elemento):
+                        if any(conectado.is_a(classe_apoiada) for classe_apoiada in classes_apoiadas):
+                            apoiados[conectado.GlobalId] = conectado
+            for global_id, elemento in apoiados.items():
+                if global_id not in fundacoes:
+                    fundacoes[global_id] = {**indice.descrever(elemento),
+                                            "Largura": 'N/A', "Comprimento": 'N/A', "Altura": 'N/A'}
             logging.info("Informações extraídas com sucesso do arquivo IFC.")
             return fundacoes
         except Exception as e:
             logging.error(f"Erro ao extrair informações do modelo IFC: {e}")
             raise
 
+    @staticmethod
+    def extrair_dimensoes_ifc(modelo_ifc: ifcopenshell.file, classes: Sequence[str] = CLASSES_FUNDACOES,
+                              num_threads: Optional[int] = None,
+                              progresso: Optional[Callable[[int, int], None]] = None) -> Dict[str, Dict[str, float]]:
+        """
+        Extrai as dimensões das fundações a partir da geometria, pela caixa envolvente no sistema
+        local de cada elemento (Largura em X, Comprimento em Y, Altura em Z). Os valores estão em
+        metros, qualquer que seja a unidade do projeto: o iterador de geometria converte para SI.
+
+        Apenas os elementos das classes informadas são tesselados, pelo iterador de geometria
+        multithread do ifcopenshell. Geometrias compartilhadas (IfcMappedItem) são medidas uma vez.
+
+        :param modelo_ifc: Objeto ifcopenshell.file carregado.
+        :param classes: Classes IFC processadas.
+        :param num_threads: Threads do iterador (padrão: número de CPUs).
+        :param progresso: Função chamada com (processados, total) a cada elemento.
+        :return: Dicionário {GlobalId: {"Largura", "Comprimento", "Altura"}}, em metros.
+        """
+        elementos = [e for classe in classes for e in modelo_ifc.by_type(classe) if e.Representation is not None]
+        if not elementos:
+            return {}
+
+        configuracoes = ifcopenshell.geom.settings()
+        iterador = ifcopenshell.geom.iterator(configuracoes, modelo_ifc, num_threads or os.cpu_count() or 1,
+                                              include=elementos)
+        if not iterador.initialize():
+            logging.warning("Nenhuma geometria de fundação pôde ser processada no modelo IFC.")
+            return {}
+
+        dimensoes, por_geometria = {}, {}
+        total, ultimo_decimo = len(elementos), 0
+        while True:
+            forma = iterador.get()
+            geometria = forma.geometry
+            if geometria.id not in por_geometria:
+                vertices = np.asarray(geometria.verts, dtype=float).reshape(-1, 3)
+                largura, comprimento, altura = (np.ptp(vertices, axis=0).round(6).tolist()
+                                                if len(vertices) else (0.0, 0.0, 0.0))
+                por_geometria[geometria.id] = {"Largura": largura, "Comprimento": comprimento, "Altura": altura}
+            dimensoes[forma.guid] = por_geometria[geometria.id]
+
+            if progresso is not None:
+                progresso(len(dimensoes), total)
+            decimo = len(dimensoes) * 10 // total
+            if decimo > ultimo_decimo:
+                ultimo_decimo = decimo
+                logging.info(f"Geometria das fundações: {len(dimensoes)}/{total} elementos processados.")
+            if not iterador.next():
+                break
+        return dimensoes
+
+    @staticmethod
+    def carregar_informacoes_ifc(caminho_arquivo: str, usar_cache: bool = True,
+                                 cache: Optional[CacheExtracaoIFC] = None) -> Dict[str, Dict]:
+        """
+        Retorna as informações das fundações de um arquivo IFC (ver extrair_informacoes_ifc).
+
+        Com cache, um modelo inalterado (mesmo tamanho, mtime ou conteúdo) é carregado do disco
+        sem ser aberto pelo ifcopenshell.
+
+        :param caminho_arquivo: Caminho do arquivo IFC.
+        :param usar_cache: Se False, sempre abre e percorre o modelo.
+        :param cache: Cache a utilizar (padrão: cache no diretório de dados).
+        :return: Dicionário {GlobalId: informações da fundação}.
+        """
+        if not usar_cache:
+            return TQSDataImporter.extrair_informacoes_ifc(TQSDataImporter.carregar_dados_ifc(caminho_arquivo))
+        cache = cache or CacheExtracaoIFC()
+        return cache.extrair(caminho_arquivo, TQSDataImporter.extrair_informacoes_ifc,
+                             chave_extrator=f"extrair_informacoes_ifc:v{VERSAO_EXTRACAO_IFC}")
+
 
 # Exemplo de uso
 if __name__ == "__main__":
@@ -115,7 +270,7 @@ if __name__ == "__main__":
 
     # Processando o arquivo
     try:
-        extensao = os.path.splitext(args.file)[1].lower()
+        extensao = extensao_base(args.file)
         if extensao == '.csv':
             dados = TQSDataImporter.carregar_csv(args.file)
             print("Dados carregados do CSV:", dados)
@@ -123,8 +278,7 @@ if __name__ == "__main__":
             dados = TQSDataImporter.carregar_json(args.file)
             print("Dados carregados do JSON:", dados)
         elif extensao == '.ifc':
-            modelo_ifc = TQSDataImporter.carregar_dados_ifc(args.file)
-            fundacoes = TQSDataImporter.extrair_informacoes_ifc(modelo_ifc)
+            fundacoes = TQSDataImporter.carregar_informacoes_ifc(args.file)
             print("Fundação extraídas do IFC:", fundacoes)
         else:
             raise ValueError("Formato de arquivo não suportado.")
@@ -1,33 +1,229 @@
 import sqlite3
-from .sqlite_service import connect_db
+from typing import Dict, Iterable, List, Mapping, Optional
+from ..database import DatabaseService
+from .sqlite_service import DB_PATH, connect_db, garantir_esquema_sincronizacao
 import logging
 
 # Configuração do logger
 logging.basicConfig(level=logging.INFO)
 
-def sincronizar_bim(fundacao_id: int) -> None:
+STATUS_SINCRONIZADO = "Sincronizado"
+
+# Resultados possíveis por fundação em sincronizar_bim_lote
+RESULTADO_SINCRONIZADO = "sincronizado"
+RESULTADO_RESSINCRONIZADO = "ressincronizado"
+RESULTADO_INEXISTENTE = "fundacao_inexistente"
+RESULTADO_ID_INVALIDO = "id_invalido"
+
+def sincronizar_bim(fundacao_id: int, db_path: Optional[str] = None) -> None:
     """
     Simula uma sincronização com a plataforma BIM e atualiza o status da fundação no banco de dados.
 
     :param fundacao_id: ID da fundação a ser sincronizada.
+    :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+    """
+    resultado = sincronizar_bim_lote([fundacao_id], db_path)[fundacao_id]
+    if resultado not in (RESULTADO_SINCRONIZADO, RESULTADO_RESSINCRONIZADO):
+        raise ValueError(f"Fundação {fundacao_id} não sincronizada: {resultado}")
+
+def sincronizar_bim_lote(fundacao_ids: Iterable[int], db_path: Optional[str] = None,
+                         hashes_enviados: Optional[Mapping[int, Optional[str]]] = None) -> Dict[int, str]:
     """
-    conn = connect_db()
+    Simula a sincronização de um conjunto de fundações com a plataforma BIM, gravando o status
+    de todas em uma única transação. O status corrente (sincronizacao_bim_atual) é um upsert por
+    fundacao_id e o histórico só cresce quando algo muda, de modo que repetir a sincronização
+    não cria linhas duplicadas.
+
+    :param fundacao_ids: IDs das fundações a serem sincronizadas.
+    :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+    :param hashes_enviados: Hash do conteúdo efetivamente enviado de cada fundação (ex.: o do
+        payload da outbox), gravado como hash_sincronizado. As fundações ausentes usam o
+        hash_resultado atual; None registra o envio sem hash, e a fundação volta ao delta.
+    :return: Dicionário {fundacao_id: resultado}, com um dos valores RESULTADO_*.
+    """
+    resultados: Dict[int, str] = {}
+    hashes_enviados = hashes_enviados or {}
+    validos = []
+    for fundacao_id in fundacao_ids:
+        if isinstance(fundacao_id, int) and not isinstance(fundacao_id, bool):
+            informado = fundacao_id in hashes_enviados
+            validos.append((fundacao_id, hashes_enviados.get(fundacao_id), int(not informado)))
+        else:
+            resultados[fundacao_id] = RESULTADO_ID_INVALIDO
+
+    conn = connect_db(db_path)
     cursor = conn.cursor()
 
     try:
-        # Simula sincronização com plataforma BIM
-        status = "Sincronizado"
-        
-        # Atualiza o status de sincronização no banco de dados
+        garantir_esquema_sincronizacao(cursor)
         cursor.execute('''
-            INSERT INTO sincronizacao_bim (fundacao_id, status, sincronizado_em)
-            VALUES (?, ?, CURRENT_TIMESTAMP)
-        ''', (fundacao_id, status))
+            CREATE TEMP TABLE IF NOT EXISTS ids_sincronizacao (
+                fundacao_id INTEGER PRIMARY KEY,
+                hash_enviado TEXT,
+                hash_atual INTEGER NOT NULL
+            )
+        ''')
+        cursor.execute("DELETE FROM ids_sincronizacao")
+        cursor.executemany(
+            "INSERT OR REPLACE INTO ids_sincronizacao (fundacao_id, hash_enviado, hash_atual) VALUES (?, ?, ?)",
+            validos,
+        )
+        cursor.execute('''
+            UPDATE ids_sincronizacao
+            SET hash_enviado = (SELECT f.hash_resultado FROM fundacoes f WHERE f.id = ids_sincronizacao.fundacao_id)
+            WHERE hash_atual = 1
+        ''')
+
+        existentes = {linha[0] for linha in cursor.execute('''
+            SELECT i.fundacao_id FROM ids_sincronizacao i JOIN fundacoes f ON f.id = i.fundacao_id
+        ''')}
+        ja_sincronizados = {linha[0] for linha in cursor.execute('''
+            SELECT i.fundacao_id FROM ids_sincronizacao i
+            JOIN sincronizacao_bim_atual a ON a.fundacao_id = i.fundacao_id
+        ''')}
+
+        # Simula sincronização com plataforma BIM. O histórico recebe uma linha apenas quando o
+        # status ou o conteúdo sincronizado muda; o status corrente é um upsert por fundação.
+        cursor.execute('''
+            INSERT INTO sincronizacao_bim (fundacao_id, status, sincronizado_em, hash_sincronizado)
+            SELECT i.fundacao_id, ?, CURRENT_TIMESTAMP, i.hash_enviado
+            FROM ids_sincronizacao i
+            JOIN fundacoes f ON f.id = i.fundacao_id
+            LEFT JOIN sincronizacao_bim_atual a ON a.fundacao_id = i.fundacao_id
+            WHERE a.fundacao_id IS NULL OR a.status IS NOT ? OR a.hash_sincronizado IS NOT i.hash_enviado
+        ''', (STATUS_SINCRONIZADO, STATUS_SINCRONIZADO))
+        cursor.execute('''
+            INSERT INTO sincronizacao_bim_atual (fundacao_id, status, sincronizado_em, hash_sincronizado)
+            SELECT i.fundacao_id, ?, CURRENT_TIMESTAMP, i.hash_enviado
+            FROM ids_sincronizacao i JOIN fundacoes f ON f.id = i.fundacao_id
+            WHERE 1
+            ON CONFLICT(fundacao_id) DO UPDATE SET
+                status = excluded.status,
+                sincronizado_em = excluded.sincronizado_em,
+                hash_sincronizado = excluded.hash_sincronizado
+        ''', (STATUS_SINCRONIZADO,))
+
+        conn.commit()
+    except sqlite3.Error as e:
+        conn.rollback()
+        logging.error(f"Erro ao sincronizar lote de {len(validos)} fundações: {e}")
+        raise
+    finally:
+        conn.close()
+
+    for fundacao_id, _, _ in validos:
+        if fundacao_id not in existentes:
+            resultados[fundacao_id] = RESULTADO_INEXISTENTE
+        elif fundacao_id in ja_sincronizados:
+            resultados[fundacao_id] = RESULTADO_RESSINCRONIZADO
+        else:
+            resultados[fundacao_id] = RESULTADO_SINCRONIZADO
+    logging.info(f"{len(existentes)} fundações sincronizadas com a plataforma BIM em lote.")
+    return resultados
+
+def selecionar_alteradas_bim(db_path: Optional[str] = None) -> List[int]:
+    """
+    Seleciona as fundações cujo conteúdo mudou desde a última sincronização (ou que nunca foram
+    sincronizadas), comparando hash_resultado com o hash_sincronizado gravado no status.
 
+    :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+    :return: Lista de IDs das fundações a sincronizar.
+    """
+    conn = connect_db(db_path)
+    cursor = conn.cursor()
+
+    try:
+        garantir_esquema_sincronizacao(cursor)
+        conn.commit()
+        # A junção usa a chave primária de sincronizacao_bim_atual(fundacao_id)
+        cursor.execute('''
+            SELECT f.id FROM fundacoes f
+            LEFT JOIN sincronizacao_bim_atual a ON a.fundacao_id = f.id
+            WHERE a.hash_sincronizado IS NULL OR a.hash_sincronizado IS NOT f.hash_resultado
+            ORDER BY f.id
+        ''')
+        return [linha[0] for linha in cursor.fetchall()]
+    except sqlite3.Error as e:
+        logging.error(f"Erro ao selecionar fundações alteradas: {e}")
+        raise
+    finally:
+        conn.close()
+
+def sincronizar_bim_delta(db_path: Optional[str] = None) -> List[int]:
+    """
+    Enfileira na outbox BIM apenas as fundações alteradas desde a última sincronização. O envio
+    e o registro do status ficam com o BIMSyncWorker: uma fundação só deixa de aparecer em
+    selecionar_alteradas_bim depois que o conteúdo atual for entregue.
+
+    :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+    :return: IDs das fundações enfileiradas.
+    """
+    alteradas = selecionar_alteradas_bim(db_path)
+    if not alteradas:
+        logging.info("Nenhuma fundação alterada desde a última sincronização BIM.")
+        return []
+    return DatabaseService(db_path or DB_PATH).enfileirar_bim(alteradas)
+
+def resumo_status_bim(db_path: Optional[str] = None) -> Dict[str, int]:
+    """
+    Retorna a quantidade de fundações em cada status de sincronização, lendo apenas a tabela de
+    status corrente (custo proporcional ao número de fundações, não ao histórico).
+
+    :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+    :return: Dicionário {status: quantidade}.
+    """
+    conn = connect_db(db_path)
+    cursor = conn.cursor()
+
+    try:
+        garantir_esquema_sincronizacao(cursor)
+        conn.commit()
+        cursor.execute("SELECT status, COUNT(*) FROM sincronizacao_bim_atual GROUP BY status")
+        return dict(cursor.fetchall())
+    except sqlite3.Error as e:
+        logging.error(f"Erro ao consultar status de sincronização: {e}")
+        raise
+    finally:
+        conn.close()
+
+def compactar_historico_bim(manter_por_fundacao: int = 10, dias: Optional[int] = None,
+                            db_path: Optional[str] = None) -> int:
+    """
+    Aplica a retenção do histórico de sincronização: mantém as `manter_por_fundacao` linhas mais
+    recentes de cada fundação e, se `dias` for informado, remove também as linhas mais antigas que
+    isso (preservando sempre a última de cada fundação). O status corrente não é afetado.
+
+    :param manter_por_fundacao: Linhas do histórico mantidas por fundação (mínimo 1).
+    :param dias: Idade máxima, em dias, das linhas do histórico.
+    :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+    :return: Quantidade de linhas removidas.
+    """
+    conn = connect_db(db_path)
+    cursor = conn.cursor()
+
+    try:
+        garantir_esquema_sincronizacao(cursor)
+        filtro_idade = "OR (ordem > 1 AND sincronizado_em < datetime('now', ?))" if dias is not None else ""
+        parametros = [max(manter_por_fundacao, 1)]
+        if dias is not None:
+            parametros.append(f"-{int(dias)} days")
+        cursor.execute(f'''
+            DELETE FROM sincronizacao_bim WHERE id IN (
+                SELECT id FROM (
+                    SELECT id, sincronizado_em,
+                           ROW_NUMBER() OVER (PARTITION BY fundacao_id ORDER BY id DESC) AS ordem
+                    FROM sincronizacao_bim
+                )
+                WHERE ordem > ? {filtro_idade}
+            )
+        ''', parametros)
+        removidas = cursor.rowcount
         conn.commit()
-        logging.info(f"Fundação {fundacao_id} sincronizada com sucesso na plataforma BIM.")
-    except Exception as e:
-        logging.error(f"Erro ao sincronizar a fundação {fundacao_id}: {e}")
+        logging.info(f"{removidas} linhas removidas do histórico de sincronização BIM.")
+        return removidas
+    except sqlite3.Error as e:
+        conn.rollback()
+        logging.error(f"Erro ao compactar histórico de sincronização: {e}")
         raise
     finally:
         conn.close()
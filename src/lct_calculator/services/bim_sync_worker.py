@@ -0,0 +1,360 @@
+import asyncio
+import json
+import logging
+import random
+import sqlite3
+import time
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Tuple
+
+from .bim_integration import sincronizar_bim_lote
+from .sqlite_service import connect_db
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Situações de uma mensagem da outbox BIM
+STATUS_PENDENTE = "pendente"
+STATUS_ENVIADO = "enviado"
+STATUS_DEAD_LETTER = "dead_letter"
+# Mensagem pendente descartada porque há outra mais recente da mesma fundação
+STATUS_SUBSTITUIDO = "substituido"
+
+
+class ErroSincronizacaoBIM(Exception):
+    """Falha ao enviar uma fundação para a plataforma BIM."""
+
+
+class AdaptadorBIM(ABC):
+    """Interface dos adaptadores de plataforma BIM usados pelo BIMSyncWorker."""
+
+    @abstractmethod
+    async def enviar(self, payload: Dict[str, Any]) -> None:
+        """
+        Envia os dados de uma fundação para a plataforma BIM.
+
+        :param payload: Mensagem gravada na outbox (fundacao_id, tipo, dados_entrada, resultado,
+            hash_resultado).
+        :raises ErroSincronizacaoBIM: Se a plataforma recusar ou não responder.
+        """
+
+
+class AdaptadorBIMHttp(AdaptadorBIM):
+    """Adaptador que envia cada fundação como um POST JSON para um endpoint HTTP."""
+
+    def __init__(self, host: str, porta: int, caminho: str = "/fundacoes", timeout: float = 10.0):
+        """
+        :param host: Host do endpoint BIM.
+        :param porta: Porta do endpoint BIM.
+        :param caminho: Caminho do recurso que recebe as fundações.
+        :param timeout: Tempo máximo (s) de cada requisição.
+        """
+        self.host = host
+        self.porta = porta
+        self.caminho = caminho
+        self.timeout = timeout
+
+    async def enviar(self, payload: Dict[str, Any]) -> None:
+        """Envia o payload via HTTP/1.1 e exige uma resposta 2xx"""
+        corpo = json.dumps(payload, ensure_ascii=False).encode("utf-8")
+        requisicao = (
+            f"POST {self.caminho} HTTP/1.1\r\n"
+            f"Host: {self.host}:{self.porta}\r\n"
+            "Content-Type: application/json\r\n"
+            f"Content-Length: {len(corpo)}\r\n"
+            "Connection: close\r\n\r\n"
+        ).encode("ascii") + corpo
+        try:
+            leitor, escritor = await asyncio.wait_for(
+                asyncio.open_connection(self.host, self.porta), self.timeout
+            )
+            try:
+                escritor.write(requisicao)
+                await escritor.drain()
+                linha_status = await asyncio.wait_for(leitor.readline(), self.timeout)
+            finally:
+                escritor.close()
+        except (OSError, asyncio.TimeoutError) as e:
+            raise ErroSincronizacaoBIM(f"Falha de comunicação com {self.host}:{self.porta}: {e!r}") from e
+
+        partes = linha_status.decode("latin-1").split()
+        if len(partes) < 2 or not partes[1].startswith("2"):
+            raise ErroSincronizacaoBIM(f"Resposta inesperada da plataforma BIM: {linha_status!r}")
+
+
+class ServidorBIMLocal:
+    """
+    Servidor HTTP local que simula a plataforma BIM, para testes e desenvolvimento.
+    Guarda os payloads recebidos e pode recusar envios (503) de fundações específicas.
+    """
+
+    def __init__(self, host: str = "127.0.0.1", porta: int = 0, latencia: float = 0.0):
+        """
+        :param host: Endereço de escuta.
+        :param porta: Porta de escuta (0 escolhe uma porta livre).
+        :param latencia: Atraso artificial (s) antes de cada resposta.
+        """
+        self.host = host
+        self.porta = porta
+        self.latencia = latencia
+        self.recebidos: List[Dict[str, Any]] = []
+        # fundacao_id -> quantidade de recusas antes de aceitar (-1 recusa sempre)
+        self.falhas_programadas: Dict[int, int] = {}
+        self._servidor: Optional[asyncio.AbstractServer] = None
+
+    async def iniciar(self) -> "ServidorBIMLocal":
+        """Começa a aceitar conexões e atualiza self.porta com a porta efetiva"""
+        self._servidor = await asyncio.start_server(self._atender, self.host, self.porta)
+        self.porta = self._servidor.sockets[0].getsockname()[1]
+        return self
+
+    async def parar(self):
+        """Encerra o servidor"""
+        if self._servidor:
+            self._servidor.close()
+            await self._servidor.wait_closed()
+            self._servidor = None
+
+    async def __aenter__(self):
+        return await self.iniciar()
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.parar()
+
+    def adaptador(self) -> AdaptadorBIMHttp:
+        """Retorna um adaptador HTTP apontando para este servidor"""
+        return AdaptadorBIMHttp(self.host, self.porta)
+
+    async def _atender(self, leitor: asyncio.StreamReader, escritor: asyncio.StreamWriter):
+        """Trata uma requisição POST com corpo JSON"""
+        try:
+            cabecalhos = await leitor.readuntil(b"\r\n\r\n")
+            tamanho = 0
+            for linha in cabecalhos.decode("latin-1").split("\r\n"):
+                if linha.lower().startswith("content-length:"):
+                    tamanho = int(linha.split(":", 1)[1])
+            payload = json.loads(await leitor.readexactly(tamanho))
+            if self.latencia:
+                await asyncio.sleep(self.latencia)
+
+            fundacao_id = payload.get("fundacao_id")
+            falhas = self.falhas_programadas.get(fundacao_id, 0)
+            if falhas:
+                self.falhas_programadas[fundacao_id] = falhas - 1 if falhas > 0 else falhas
+                resposta = b"HTTP/1.1 503 Service Unavailable\r\nContent-Length: 0\r\n\r\n"
+            else:
+                self.recebidos.append(payload)
+                resposta = b"HTTP/1.1 204 No Content\r\nContent-Length: 0\r\n\r\n"
+            escritor.write(resposta)
+            await escritor.drain()
+        except (asyncio.IncompleteReadError, ValueError) as e:
+            logging.warning(f"Requisição inválida no servidor BIM local: {e}")
+            escritor.write(b"HTTP/1.1 400 Bad Request\r\nContent-Length: 0\r\n\r\n")
+        finally:
+            escritor.close()
+
+
+class MetricasSincronizacao:
+    """Contadores de uma execução do BIMSyncWorker."""
+
+    def __init__(self):
+        self.enviados = 0
+        self.falhas = 0
+        self.dead_letters = 0
+        self.substituidas = 0
+        self.inicio = time.monotonic()
+        self.fim: Optional[float] = None
+
+    @property
+    def duracao(self) -> float:
+        """Duração da execução em segundos"""
+        return (self.fim or time.monotonic()) - self.inicio
+
+    @property
+    def vazao(self) -> float:
+        """Fundações enviadas por segundo"""
+        return self.enviados / self.duracao if self.duracao > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, float]:
+        """
+        Retorna as métricas em formato de dicionário.
+        :return: Dicionário com contadores, duração e vazão.
+        """
+        return {
+            "enviados": self.enviados,
+            "falhas": self.falhas,
+            "dead_letters": self.dead_letters,
+            "substituidas": self.substituidas,
+            "duracao": self.duracao,
+            "vazao": self.vazao,
+        }
+
+
+class BIMSyncWorker:
+    """
+    Consumidor assíncrono da outbox BIM (tabela outbox_bim).
+
+    As mensagens são gravadas na mesma transação do cálculo (DatabaseService.salvar_calculo com
+    sincronizar_bim=True), então o cálculo nunca espera pela plataforma BIM. O worker envia as
+    pendentes com concorrência limitada, reagenda falhas com backoff exponencial e move para
+    dead letter as que esgotam as tentativas. Só a mensagem mais recente de cada fundação é
+    enviada; as anteriores ainda pendentes são marcadas como substituídas, para que um payload
+    antigo nunca sobrescreva um mais novo. Deve haver um único worker por banco de dados.
+    """
+
+    def __init__(self, adaptador: AdaptadorBIM, db_path: Optional[str] = None, concorrencia: int = 8,
+                 tamanho_lote: int = 100, max_tentativas: int = 5, backoff_base: float = 0.5,
+                 backoff_max: float = 60.0):
+        """
+        :param adaptador: Adaptador da plataforma BIM.
+        :param db_path: Caminho do banco de dados (padrão: DB_PATH de sqlite_service).
+        :param concorrencia: Máximo de envios simultâneos.
+        :param tamanho_lote: Mensagens lidas da outbox por vez.
+        :param max_tentativas: Tentativas antes de mover a mensagem para dead letter.
+        :param backoff_base: Espera (s) após a primeira falha; dobra a cada nova falha.
+        :param backoff_max: Limite (s) da espera entre tentativas.
+        """
+        self.adaptador = adaptador
+        self.db_path = db_path
+        self.concorrencia = concorrencia
+        self.tamanho_lote = tamanho_lote
+        self.max_tentativas = max_tentativas
+        self.backoff_base = backoff_base
+        self.backoff_max = backoff_max
+        self.metricas = MetricasSincronizacao()
+
+    def calcular_backoff(self, tentativas: int) -> float:
+        """Espera antes da próxima tentativa: exponencial, limitada e com jitter de até 50%"""
+        espera = min(self.backoff_base * (2 ** (tentativas - 1)), self.backoff_max)
+        return espera * random.uniform(0.5, 1.0)
+
+    async def drenar(self, aguardar_retentativas: bool = True) -> MetricasSincronizacao:
+        """
+        Envia as mensagens pendentes até esvaziar a outbox.
+
+        :param aguardar_retentativas: Também espera as mensagens reagendadas por backoff;
+            com False, retorna assim que não houver mensagens prontas para envio.
+        :return: Métricas acumuladas do worker.
+        """
+        semaforo = asyncio.Semaphore(self.concorrencia)
+        while True:
+            lote = await asyncio.to_thread(self._reservar_lote)
+            if lote:
+                await self._processar_lote(lote, semaforo)
+                continue
+            proxima = await asyncio.to_thread(self._proxima_tentativa)
+            if proxima is None or not aguardar_retentativas:
+                break
+            await asyncio.sleep(max(proxima - time.time(), 0))
+        self.metricas.fim = time.monotonic()
+        logging.info(f"Outbox BIM drenada: {self.metricas.to_dict()}")
+        return self.metricas
+
+    async def executar(self, parar: asyncio.Event, intervalo: float = 1.0):
+        """
+        Mantém o worker ativo, drenando a outbox a cada intervalo até que `parar` seja sinalizado.
+
+        :param parar: Evento que encerra o laço.
+        :param intervalo: Espera (s) entre verificações da outbox.
+        """
+        while not parar.is_set():
+            await self.drenar(aguardar_retentativas=False)
+            try:
+                await asyncio.wait_for(parar.wait(), intervalo)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _processar_lote(self, lote: List[Tuple[int, int, str, int]], semaforo: asyncio.Semaphore):
+        """Envia um lote com concorrência limitada e registra os resultados em uma transação"""
+        async def enviar(mensagem):
+            id_mensagem, fundacao_id, payload, tentativas = mensagem
+            payload = json.loads(payload)
+            async with semaforo:
+                try:
+                    await self.adaptador.enviar(payload)
+                    return id_mensagem, fundacao_id, payload.get("hash_resultado"), tentativas, None
+                except Exception as e:
+                    return id_mensagem, fundacao_id, payload.get("hash_resultado"), tentativas, e
+
+        resultados = await asyncio.gather(*(enviar(mensagem) for mensagem in lote))
+        await asyncio.to_thread(self._registrar_resultados, resultados)
+
+    def _reservar_lote(self) -> List[Tuple[int, int, str, int]]:
+        """
+        Lê as mensagens pendentes prontas para envio. Antes, marca como substituídas as pendentes
+        que têm outra mais recente da mesma fundação; assim o lote tem no máximo uma mensagem por
+        fundação e uma retentativa antiga não é enviada depois de uma versão mais nova.
+        """
+        conn = connect_db(self.db_path)
+        try:
+            with conn:
+                substituidas = conn.execute("""
+                    UPDATE outbox_bim SET status = ?
+                    WHERE status = ? AND id NOT IN (
+                        SELECT MAX(id) FROM outbox_bim WHERE status = ? GROUP BY fundacao_id
+                    )
+                """, (STATUS_SUBSTITUIDO, STATUS_PENDENTE, STATUS_PENDENTE)).rowcount
+            self.metricas.substituidas += substituidas
+            return conn.execute("""
+                SELECT id, fundacao_id, payload, tentativas FROM outbox_bim
+                WHERE status = ? AND proxima_tentativa <= ?
+                ORDER BY proxima_tentativa, id
+                LIMIT ?
+            """, (STATUS_PENDENTE, time.time(), self.tamanho_lote)).fetchall()
+        finally:
+            conn.close()
+
+    def _proxima_tentativa(self) -> Optional[float]:
+        """Retorna o horário (epoch) da próxima mensagem pendente reagendada, se houver"""
+        conn = connect_db(self.db_path)
+        try:
+            return conn.execute(
+                "SELECT MIN(proxima_tentativa) FROM outbox_bim WHERE status = ?", (STATUS_PENDENTE,)
+            ).fetchone()[0]
+        finally:
+            conn.close()
+
+    def _registrar_resultados(self, resultados: List[Tuple[int, int, Optional[str], int, Optional[Exception]]]):
+        """Marca envios, reagenda falhas com backoff e move as esgotadas para dead letter"""
+        enviados, reagendados, mortos = [], [], []
+        agora = time.time()
+        for id_mensagem, fundacao_id, _, tentativas, erro in resultados:
+            if erro is None:
+                enviados.append((STATUS_ENVIADO, id_mensagem))
+                continue
+            tentativas += 1
+            logging.warning(f"Falha ao sincronizar a fundação {fundacao_id} (tentativa {tentativas}): {erro}")
+            if tentativas >= self.max_tentativas:
+                mortos.append((STATUS_DEAD_LETTER, tentativas, str(erro), id_mensagem))
+            else:
+                reagendados.append((tentativas, agora + self.calcular_backoff(tentativas), str(erro), id_mensagem))
+
+        # Status primeiro: se o processo cair antes de marcar a outbox, a mensagem é reenviada.
+        # O hash gravado é o do payload enviado, não o atual: se o cálculo mudou depois de
+        # enfileirado, a fundação continua aparecendo em selecionar_alteradas_bim.
+        hashes_enviados = {
+            fundacao_id: hash_enviado for _, fundacao_id, hash_enviado, _, erro in resultados if erro is None
+        }
+        if hashes_enviados:
+            sincronizar_bim_lote(list(hashes_enviados), self.db_path, hashes_enviados)
+
+        conn = connect_db(self.db_path)
+        try:
+            with conn:
+                conn.executemany("UPDATE outbox_bim SET status = ? WHERE id = ?", enviados)
+                conn.executemany(
+                    "UPDATE outbox_bim SET tentativas = ?, proxima_tentativa = ?, ultimo_erro = ? WHERE id = ?",
+                    reagendados,
+                )
+                conn.executemany(
+                    "UPDATE outbox_bim SET status = ?, tentativas = ?, ultimo_erro = ? WHERE id = ?", mortos
+                )
+        except sqlite3.Error as e:
+            logging.error(f"Erro ao registrar resultados da outbox BIM: {e}")
+            raise
+        finally:
+            conn.close()
+
+        self.metricas.enviados += len(enviados)
+        self.metricas.falhas += len(reagendados) + len(mortos)
+        self.metricas.dead_letters += len(mortos)
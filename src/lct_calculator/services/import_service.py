@@ -0,0 +1,211 @@
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import Future, ProcessPoolExecutor, ThreadPoolExecutor, as_completed
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from src.lct_calculator.helpers.compression import extensao_base
+from src.lct_calculator.helpers.file_helper import FileHelper
+from src.lct_calculator.helpers.typed_csv_reader import ColunaCSV
+from src.lct_calculator.interfaces.tqs_data_importer import TQSDataImporter
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Extensão do conteúdo (sem o sufixo de compressão) -> tipo de importação
+TIPOS_ARQUIVO = {".csv": "csv", ".json": "json", ".ifc": "ifc"}
+
+
+def _contexto_processos():
+    """
+    Contexto do pool de processos do IFC. O pool convive com as threads de leitura (e com as do
+    chamador), e um fork de processo com várias threads pode herdar travas presas; por isso os
+    processos são iniciados por forkserver (ou spawn, onde forkserver não existe).
+    """
+    metodo = "forkserver" if "forkserver" in multiprocessing.get_all_start_methods() else "spawn"
+    return multiprocessing.get_context(metodo)
+
+
+class ResultadoArquivo:
+    """Resultado da importação de um arquivo: registros lidos ou o erro que interrompeu a leitura"""
+
+    def __init__(self, caminho: str, tipo: str, registros: Optional[List[Dict[str, Any]]] = None,
+                 erro: Optional[str] = None, duracao: float = 0.0):
+        self.caminho = caminho
+        self.tipo = tipo
+        self.registros = registros or []
+        self.erro = erro
+        self.duracao = duracao
+
+    @property
+    def sucesso(self) -> bool:
+        return self.erro is None
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "caminho": self.caminho,
+            "tipo": self.tipo,
+            "registros": len(self.registros),
+            "erro": self.erro,
+            "duracao": round(self.duracao, 3),
+        }
+
+
+class LoteImportacao:
+    """Lote com os resultados de todos os arquivos importados, pronto para o cálculo em conjunto"""
+
+    def __init__(self, arquivos: List[ResultadoArquivo], duracao: float):
+        self.arquivos = arquivos
+        self.duracao = duracao
+
+    @property
+    def registros(self) -> List[Dict[str, Any]]:
+        """Registros de todos os arquivos importados com sucesso, com o arquivo de origem em "Arquivo" """
+        return [{**registro, "Arquivo": resultado.caminho}
+                for resultado in self.arquivos if resultado.sucesso for registro in resultado.registros]
+
+    @property
+    def erros(self) -> Dict[str, str]:
+        """Mensagem de erro de cada arquivo que falhou"""
+        return {resultado.caminho: resultado.erro for resultado in self.arquivos if not resultado.sucesso}
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "arquivos": [resultado.to_dict() for resultado in self.arquivos],
+            "registros": sum(len(resultado.registros) for resultado in self.arquivos if resultado.sucesso),
+            "erros": len(self.erros),
+            "duracao": round(self.duracao, 3),
+        }
+
+
+def _importar_arquivo(caminho: str, tipo: str, esquema_csv: Optional[Sequence[ColunaCSV]],
+                      caminho_json: Optional[str], usar_cache_ifc: bool) -> ResultadoArquivo:
+    """Importa um único arquivo; qualquer erro fica registrado no resultado, sem afetar os demais"""
+    inicio = time.perf_counter()
+    try:
+        if tipo == "csv":
+            registros = (list(TQSDataImporter.iterar_csv(caminho, esquema_csv)) if esquema_csv
+                         else TQSDataImporter.carregar_csv(caminho))
+        elif tipo == "json":
+            if caminho_json is not None:
+                registros = list(TQSDataImporter.iterar_json(caminho, caminho_json))
+            else:
+                dados = TQSDataImporter.carregar_json(caminho)
+                registros = dados if isinstance(dados, list) else [dados]
+        else:
+            informacoes = TQSDataImporter.carregar_informacoes_ifc(caminho, usar_cache=usar_cache_ifc)
+            registros = [{"GlobalId": global_id, **dados} for global_id, dados in informacoes.items()]
+        return ResultadoArquivo(caminho, tipo, registros, duracao=time.perf_counter() - inicio)
+    except Exception as e:
+        logging.error(f"Erro ao importar o arquivo {caminho}: {e}")
+        return ResultadoArquivo(caminho, tipo, erro=f"{type(e).__name__}: {e}", duracao=time.perf_counter() - inicio)
+
+
+class ImportService:
+    """
+    Importação concorrente de diretórios de exportações do TQS (CSV, JSON e IFC).
+
+    CSV e JSON são lidos em um pool de threads; IFC, cujo processamento é dominado por CPU, em um
+    pool de processos. Os arquivos são despachados do maior para o menor, para que o tempo total
+    se aproxime do tempo do maior arquivo. Falhas ficam isoladas no resultado de cada arquivo.
+    """
+
+    def __init__(self, max_threads: Optional[int] = None, max_processos: Optional[int] = None,
+                 esquema_csv: Optional[Sequence[ColunaCSV]] = None, caminho_json: Optional[str] = None,
+                 usar_cache_ifc: bool = True,
+                 progresso: Optional[Callable[[int, int, ResultadoArquivo], None]] = None):
+        """
+        :param max_threads: Threads para CSV/JSON (padrão do ThreadPoolExecutor).
+        :param max_processos: Processos para IFC (padrão: número de CPUs).
+        :param esquema_csv: Esquema para leitura tipada dos CSV; sem ele, os valores vêm como texto.
+        :param caminho_json: Caminho da lista de elementos nos JSON (ver TQSDataImporter.iterar_json);
+            sem ele, o documento inteiro é carregado.
+        :param usar_cache_ifc: Usa o cache de extração IFC em disco.
+        :param progresso: Função chamada com (concluídos, total, resultado) a cada arquivo finalizado.
+        """
+        self.max_threads = max_threads
+        self.max_processos = max_processos
+        self.esquema_csv = esquema_csv
+        self.caminho_json = caminho_json
+        self.usar_cache_ifc = usar_cache_ifc
+        self.progresso = progresso
+
+    def importar_diretorio(self, diretorio: str) -> LoteImportacao:
+        """
+        Importa todos os arquivos suportados de um diretório.
+
+        :param diretorio: Caminho do diretório.
+        :return: Lote com o resultado de cada arquivo.
+        """
+        arquivos = [caminho for caminho in FileHelper.listar_arquivos_diretorio(diretorio)
+                    if os.path.isfile(caminho) and extensao_base(caminho) in TIPOS_ARQUIVO]
+        return self.importar_arquivos(arquivos)
+
+    def importar_arquivos(self, caminhos: Iterable[str]) -> LoteImportacao:
+        """
+        Importa os arquivos informados em paralelo.
+
+        :param caminhos: Caminhos de arquivos CSV, JSON ou IFC.
+        :return: Lote com o resultado de cada arquivo, na ordem de entrada.
+        """
+        inicio = time.perf_counter()
+        caminhos = list(caminhos)
+        resultados: Dict[int, ResultadoArquivo] = {}
+        ordem = sorted(range(len(caminhos)), key=lambda i: os.path.getsize(caminhos[i])
+                       if os.path.exists(caminhos[i]) else 0, reverse=True)
+
+        tipos: Dict[int, str] = {}
+        concluidos = 0
+        for indice in ordem:
+            tipo = TIPOS_ARQUIVO.get(extensao_base(caminhos[indice]))
+            if tipo is None:
+                resultados[indice] = ResultadoArquivo(caminhos[indice], "desconhecido",
+                                                      erro="Formato de arquivo não suportado.")
+                concluidos += 1
+                self._notificar(concluidos, len(caminhos), resultados[indice])
+            else:
+                tipos[indice] = tipo
+
+        # Os IFC, mais demorados, são despachados antes que as threads de leitura sejam criadas
+        processos = None
+        if "ifc" in tipos.values():
+            processos = ProcessPoolExecutor(self.max_processos, mp_context=_contexto_processos())
+        futuros: Dict[Future, int] = {}
+        try:
+            for indice, tipo in tipos.items():
+                if tipo == "ifc":
+                    argumentos = (caminhos[indice], tipo, self.esquema_csv, self.caminho_json, self.usar_cache_ifc)
+                    futuros[processos.submit(_importar_arquivo, *argumentos)] = indice
+
+            with ThreadPoolExecutor(self.max_threads, thread_name_prefix="lct-import") as threads:
+                for indice, tipo in tipos.items():
+                    if tipo != "ifc":
+                        argumentos = (caminhos[indice], tipo, self.esquema_csv, self.caminho_json, self.usar_cache_ifc)
+                        futuros[threads.submit(_importar_arquivo, *argumentos)] = indice
+
+                for futuro in as_completed(futuros):
+                    indice = futuros[futuro]
+                    try:
+                        resultado = futuro.result()
+                    except Exception as e:
+                        # Falha do próprio processo de trabalho (ex.: encerrado pelo sistema)
+                        resultado = ResultadoArquivo(caminhos[indice], TIPOS_ARQUIVO[extensao_base(caminhos[indice])],
+                                                     erro=f"{type(e).__name__}: {e}")
+                    resultados[indice] = resultado
+                    concluidos += 1
+                    self._notificar(concluidos, len(caminhos), resultado)
+        finally:
+            if processos is not None:
+                processos.shutdown()
+
+        lote = LoteImportacao([resultados[i] for i in range(len(caminhos))], time.perf_counter() - inicio)
+        logging.info(f"Importação concluída: {len(caminhos)} arquivos, {len(lote.erros)} com erro, "
+                     f"{lote.duracao:.2f} s.")
+        return lote
+
+    def _notificar(self, concluidos: int, total: int, resultado: ResultadoArquivo):
+        if self.progresso is not None:
+            self.progresso(concluidos, total, resultado)
+        logging.info(f"[{concluidos}/{total}] {resultado.caminho}: "
+                     f"{'erro' if resultado.erro else f'{len(resultado.registros)} registros'}")
@@ -1,53 +1,25 @@
 import sqlite3
 import os
 
-DB_PATH = os.path.join(os.path.dirname(__file__), 'lct_calculator.db')
+from ..database import DatabaseService, diretorio_dados_padrao, garantir_esquema_sincronizacao
 
-def connect_db():
-    """Estabelece conexão com o banco de dados SQLite"""
-    conn = sqlite3.connect(DB_PATH)
-    return conn
-
-def create_tables():
-    """Cria tabelas necessárias para armazenar dados de fundações, relatórios e sincronização BIM"""
-    conn = connect_db()
-    cursor = conn.cursor()
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS fundacoes (
-            id INTEGER PRIMARY KEY,
-            tipo TEXT NOT NULL,
-            base REAL,
-            altura REAL,
-            fck REAL,
-            esforco REAL,
-            resultado REAL,
-            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP
-        )
-    ''')
+# Mesmo banco padrão (e mesmo esquema) de DatabaseService, no diretório de dados gravável
+DATA_DIR = str(diretorio_dados_padrao())
+DB_PATH = os.path.join(DATA_DIR, 'lct_calculator.db')
 
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS relatorios (
-            id INTEGER PRIMARY KEY,
-            fundacao_id INTEGER,
-            caminho_arquivo TEXT,
-            criado_em TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
-            FOREIGN KEY(fundacao_id) REFERENCES fundacoes(id)
-        )
-    ''')
-
-    cursor.execute('''
-        CREATE TABLE IF NOT EXISTS sincronizacao_bim (
-            id INTEGER PRIMARY KEY,
-            fundacao_id INTEGER,
-            status TEXT,
-            sincronizado_em TIMESTAMP,
-            FOREIGN KEY(fundacao_id) REFERENCES fundacoes(id)
-        )
-    ''')
+def connect_db(db_path=None):
+    """Estabelece conexão com o banco de dados SQLite (padrão: DB_PATH)"""
+    db_path = db_path or DB_PATH
+    os.makedirs(os.path.dirname(os.path.abspath(db_path)), exist_ok=True)
+    conn = sqlite3.connect(db_path)
+    return conn
 
-    conn.commit()
-    conn.close()
+def create_tables(db_path=None):
+    """
+    Cria as tabelas de fundações, relatórios e sincronização BIM. O esquema é o de DatabaseService,
+    para que este módulo, DatabaseService e o worker da outbox BIM compartilhem o mesmo banco.
+    """
+    DatabaseService(db_path or DB_PATH)
 
 # Exemplo de uso, cria as tabelas ao rodar o script
 if __name__ == "__main__":
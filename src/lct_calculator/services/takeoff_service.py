@@ -0,0 +1,242 @@
+import logging
+import math
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple, Union
+
+import numpy as np
+
+from src.lct_calculator.database import (
+    CHAVES_DIAMETRO_BARRAS, CHAVES_QUANTIDADE_BARRAS, CHAVES_VOLUME_CONCRETO, DatabaseService, para_dict, primeiro_valor,
+)
+from src.lct_calculator.interfaces.report_generator import ReportGenerator
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Massa específica do aço (kg/m³), usada na massa linear das barras: 7850 · π · d² / 4
+MASSA_ESPECIFICA_ACO = 7850.0
+
+# Chaves dos relatórios dos calculadores com os estribos e a escavação
+CHAVES_QUANTIDADE_ESTRIBOS = ("Armadura Transversal - Quantidade de Estribos",)
+CHAVES_DIAMETRO_ESTRIBOS = ("Armadura Transversal - Diâmetro dos Estribos (mm)",)
+CHAVES_VOLUME_ESCAVACAO = ("Volume de Escavação (m³)",)
+
+# Comprimento (m) de cada barra longitudinal por tipo de fundação, a partir dos dados de entrada.
+# As barras são perpendiculares à seção usada no cálculo da armadura de cada calculador.
+COMPRIMENTO_BARRAS: Dict[str, Callable[[Dict[str, Any]], Optional[float]]] = {
+    "sapata": lambda e: e.get("base"),
+    "bloco": lambda e: e.get("comprimento"),
+    "estaca": lambda e: e.get("comprimento"),
+    "tubulão": lambda e: e.get("altura"),
+    "radier": lambda e: math.sqrt(e["area"]) if isinstance(e.get("area"), (int, float)) and e["area"] > 0 else None,
+    "barrete": lambda e: e.get("largura"),
+    "sapata_corrida": lambda e: e.get("largura_base"),
+    "estaca_helice_continua": lambda e: e.get("profundidade_estaca"),
+    "tubulão_céu_aberto": lambda e: e.get("profundidade"),
+    "tubulão_sob_ar_comprimido": lambda e: e.get("profundidade"),
+}
+
+# Comprimento (m) de cada estribo: perímetro da seção transversal
+COMPRIMENTO_ESTRIBOS: Dict[str, Callable[[Dict[str, Any]], Optional[float]]] = {
+    "barrete": lambda e: 2 * (e["largura"] + e["altura"]) if _numeros(e, "largura", "altura") else None,
+    "tubulão_céu_aberto": lambda e: math.pi * e["diametro"] if _numeros(e, "diametro") else None,
+    "tubulão_sob_ar_comprimido": lambda e: math.pi * e["diametro"] if _numeros(e, "diametro") else None,
+}
+
+# Colunas por elemento usadas na agregação, na ordem de extrair_quantitativos
+COLUNAS_QUANTITATIVOS = (
+    "fck", "volume_concreto", "quantidade_barras", "diametro_barras", "comprimento_barras",
+    "quantidade_estribos", "diametro_estribos", "comprimento_estribos", "volume_escavacao",
+)
+
+# Colunas da tabela exportada pelo ReportGenerator
+COLUNAS_LEVANTAMENTO = ("Item", "Grupo", "Elementos", "Quantidade", "Unidade")
+
+
+def _numeros(dados: Dict[str, Any], *chaves: str) -> bool:
+    return all(isinstance(dados.get(chave), (int, float)) for chave in chaves)
+
+
+def _float(valor: Any) -> float:
+    return float(valor) if isinstance(valor, (int, float)) and not isinstance(valor, bool) else math.nan
+
+
+def extrair_quantitativos(tipo: str, dados_entrada: Union[str, Dict[str, Any]],
+                          resultado: Union[str, Dict[str, Any]]) -> Tuple[float, ...]:
+    """
+    Extrai de um cálculo os valores usados no levantamento de quantitativos.
+
+    :param tipo: Tipo de fundação (chave de COMPRIMENTO_BARRAS).
+    :param dados_entrada: Dados de entrada do cálculo (dicionário ou texto).
+    :param resultado: Relatório gerado pelo calculador (dicionário ou texto).
+    :return: Tupla na ordem de COLUNAS_QUANTITATIVOS; valores ausentes são NaN.
+    """
+    entrada = para_dict(dados_entrada)
+    relatorio = para_dict(resultado)
+    comprimento_barras = COMPRIMENTO_BARRAS.get(tipo)
+    comprimento_estribos = COMPRIMENTO_ESTRIBOS.get(tipo)
+    return (
+        _float(entrada.get("fck")),
+        _float(primeiro_valor(relatorio, CHAVES_VOLUME_CONCRETO)),
+        _float(primeiro_valor(relatorio, CHAVES_QUANTIDADE_BARRAS)),
+        _float(primeiro_valor(relatorio, CHAVES_DIAMETRO_BARRAS)),
+        _float(comprimento_barras(entrada)) if comprimento_barras else math.nan,
+        _float(primeiro_valor(relatorio, CHAVES_QUANTIDADE_ESTRIBOS)),
+        _float(primeiro_valor(relatorio, CHAVES_DIAMETRO_ESTRIBOS)),
+        _float(comprimento_estribos(entrada)) if comprimento_estribos else math.nan,
+        _float(primeiro_valor(relatorio, CHAVES_VOLUME_ESCAVACAO)),
+    )
+
+
+def _agrupar(chaves: np.ndarray, *valores: np.ndarray) -> Tuple[np.ndarray, np.ndarray, List[np.ndarray]]:
+    """Agrupa por chave em uma única passada: retorna as chaves distintas, as contagens e as somas de cada valor"""
+    grupos, inverso = np.unique(chaves, return_inverse=True)
+    contagens = np.bincount(inverso, minlength=len(grupos))
+    somas = [np.bincount(inverso, weights=valor, minlength=len(grupos)) for valor in valores]
+    return grupos, contagens, somas
+
+
+class LevantamentoQuantitativos:
+    """Totais do projeto: concreto por classe, aço por diâmetro e escavação por tipo de fundação"""
+
+    def __init__(self, concreto_por_fck: List[Dict[str, Any]], aco_por_diametro: List[Dict[str, Any]],
+                 escavacao_por_tipo: List[Dict[str, Any]], elementos: int, elementos_com_aco: int):
+        self.concreto_por_fck = concreto_por_fck
+        self.aco_por_diametro = aco_por_diametro
+        self.escavacao_por_tipo = escavacao_por_tipo
+        self.elementos = elementos
+        self.elementos_com_aco = elementos_com_aco
+
+    @property
+    def totais(self) -> Dict[str, float]:
+        return {
+            "elementos": self.elementos,
+            "volume_concreto": sum(grupo["Volume de Concreto (m³)"] for grupo in self.concreto_por_fck),
+            "massa_aco": sum(grupo["Massa (kg)"] for grupo in self.aco_por_diametro),
+            "volume_escavacao": sum(grupo["Volume de Escavação (m³)"] for grupo in self.escavacao_por_tipo),
+        }
+
+    def linhas(self) -> List[Tuple[str, str, int, float, str]]:
+        """Tabela única do levantamento, nas colunas de COLUNAS_LEVANTAMENTO"""
+        linhas = [("Concreto", grupo["Classe"], grupo["Elementos"], grupo["Volume de Concreto (m³)"], "m³")
+                  for grupo in self.concreto_por_fck]
+        linhas += [("Aço", f"Ø {grupo['Diâmetro (mm)']:g} mm", grupo["Elementos"], grupo["Massa (kg)"], "kg")
+                   for grupo in self.aco_por_diametro]
+        linhas += [("Escavação", grupo["Tipo"], grupo["Elementos"], grupo["Volume de Escavação (m³)"], "m³")
+                   for grupo in self.escavacao_por_tipo]
+        totais = self.totais
+        linhas += [
+            ("Concreto", "Total", sum(grupo["Elementos"] for grupo in self.concreto_por_fck),
+             totais["volume_concreto"], "m³"),
+            ("Aço", "Total", self.elementos_com_aco, totais["massa_aco"], "kg"),
+            ("Escavação", "Total", sum(grupo["Elementos"] for grupo in self.escavacao_por_tipo),
+             totais["volume_escavacao"], "m³"),
+        ]
+        return linhas
+
+    def gerador_relatorio(self, nome_projeto: str, engenheiro_responsavel: str, **opcoes) -> ReportGenerator:
+        """Retorna um ReportGenerator com a tabela do levantamento, para exportação em CSV, JSON ou PDF"""
+        return ReportGenerator(self.linhas(), nome_projeto, engenheiro_responsavel, colunas=COLUNAS_LEVANTAMENTO,
+                               **opcoes)
+
+
+class TakeoffService:
+    """
+    Levantamento de quantitativos de um projeto a partir dos resultados dos calculadores.
+
+    Os valores de cada elemento são reunidos em colunas NumPy e agregados de forma vetorizada
+    (np.unique + np.bincount), sem laço por elemento. As quantidades fracionárias de barras e
+    estribos retornadas pelos calculadores são arredondadas para cima em cada elemento antes da soma.
+    """
+
+    @staticmethod
+    def colunas_de_resultados(calculos: Iterable[Tuple[str, Any, Any]]) -> Dict[str, np.ndarray]:
+        """
+        Reúne os quantitativos de cada cálculo em colunas.
+
+        :param calculos: Tuplas (tipo, dados_entrada, resultado), como em salvar_calculos_lote.
+        :return: Dicionário {coluna: array}, com "tipo" e as colunas de COLUNAS_QUANTITATIVOS.
+        """
+        tipos, valores = [], []
+        for tipo, dados_entrada, resultado in calculos:
+            tipos.append(tipo)
+            valores.append(extrair_quantitativos(tipo, dados_entrada, resultado))
+        matriz = np.array(valores, dtype=float).reshape(len(valores), len(COLUNAS_QUANTITATIVOS))
+        colunas = {coluna: matriz[:, indice] for indice, coluna in enumerate(COLUNAS_QUANTITATIVOS)}
+        colunas["tipo"] = np.array(tipos, dtype=str)
+        return colunas
+
+    @staticmethod
+    def colunas_do_banco(db_service: DatabaseService, tipo: Optional[str] = None) -> Dict[str, np.ndarray]:
+        """Reúne os quantitativos dos cálculos gravados, lendo o banco em fluxo"""
+        return TakeoffService.colunas_de_resultados(
+            db_service.iterar_calculos(tipo, colunas=("tipo", "dados_entrada", "resultado"))
+        )
+
+    @staticmethod
+    def agregar(colunas: Mapping[str, Sequence[Any]]) -> LevantamentoQuantitativos:
+        """
+        Agrega os quantitativos do projeto.
+
+        :param colunas: Colunas por elemento ("tipo" e COLUNAS_QUANTITATIVOS), como as de
+            colunas_de_resultados; valores ausentes (NaN) são ignorados em cada total.
+        :return: LevantamentoQuantitativos com os totais agrupados.
+        """
+        tipos = np.asarray(colunas["tipo"], dtype=str)
+        dados = {coluna: np.asarray(colunas[coluna], dtype=float) for coluna in COLUNAS_QUANTITATIVOS}
+
+        # Concreto por classe (fck)
+        fck, volume = dados["fck"], dados["volume_concreto"]
+        validos = np.isfinite(fck) & np.isfinite(volume)
+        classes, elementos, (volumes,) = _agrupar(fck[validos], volume[validos])
+        concreto = [{"Classe": f"C{classe:g}", "fck (MPa)": float(classe), "Elementos": int(quantidade),
+                     "Volume de Concreto (m³)": float(total)}
+                    for classe, quantidade, total in zip(classes, elementos, volumes)]
+
+        # Aço por diâmetro: barras longitudinais e estribos, com quantidades inteiras por elemento
+        # (a tolerância evita arredondar para cima resíduos de ponto flutuante, como 3.0000000001)
+        quantidade = np.ceil(np.concatenate((dados["quantidade_barras"], dados["quantidade_estribos"])) - 1e-9)
+        diametro = np.concatenate((dados["diametro_barras"], dados["diametro_estribos"]))
+        comprimento = quantidade * np.concatenate((dados["comprimento_barras"], dados["comprimento_estribos"]))
+        validos = np.isfinite(comprimento) & np.isfinite(diametro) & (quantidade > 0)
+        elementos_com_aco = int(np.count_nonzero(validos[:len(tipos)] | validos[len(tipos):]))
+        diametro, quantidade, comprimento = diametro[validos], quantidade[validos], comprimento[validos]
+        massa = comprimento * MASSA_ESPECIFICA_ACO * np.pi * (diametro / 1000) ** 2 / 4
+        diametros, elementos, (barras, comprimentos, massas) = _agrupar(diametro, quantidade, comprimento, massa)
+        aco = [{"Diâmetro (mm)": float(d), "Elementos": int(n), "Barras": int(b), "Comprimento Total (m)": float(c),
+                "Massa (kg)": float(m)}
+               for d, n, b, c, m in zip(diametros, elementos, barras, comprimentos, massas)]
+
+        # Escavação por tipo de fundação
+        escavacao = dados["volume_escavacao"]
+        validos = np.isfinite(escavacao)
+        grupos, elementos, (volumes,) = _agrupar(tipos[validos], escavacao[validos])
+        escavacao_tipo = [{"Tipo": str(tipo), "Elementos": int(n), "Volume de Escavação (m³)": float(v)}
+                          for tipo, n, v in zip(grupos, elementos, volumes)]
+
+        return LevantamentoQuantitativos(concreto, aco, escavacao_tipo, len(tipos), elementos_com_aco)
+
+
+# Exemplo de uso e benchmark
+if __name__ == "__main__":
+    import time
+
+    from src.lct_calculator.calculators.sapata import Sapata
+    from src.lct_calculator.calculators.tubulão import Tubulao
+
+    quantidade = 200_000
+    entradas = [({"carga": 500, "fck": 25, "base": 2.0, "altura": 0.6, "capacidade_solo": 200}, Sapata),
+                ({"carga": 900, "fck": 30, "diametro": 1.0, "altura": 8.0, "tipo": "Céu Aberto",
+                  "escavacao_prof": 8.5, "profundidade_agua": 0}, Tubulao)]
+    relatorios = [(("sapata", "tubulão")[i], entrada, calculador(**entrada).gerar_relatorio())
+                  for i, (entrada, calculador) in enumerate(entradas)]
+    calculos = [relatorios[i % 2] for i in range(quantidade)]
+
+    inicio = time.perf_counter()
+    colunas = TakeoffService.colunas_de_resultados(calculos)
+    extracao = time.perf_counter() - inicio
+    inicio = time.perf_counter()
+    levantamento = TakeoffService.agregar(colunas)
+    agregacao = time.perf_counter() - inicio
+    print(f"{quantidade} elementos: extração {extracao:.2f} s, agregação {agregacao * 1000:.1f} ms")
+    for linha in levantamento.linhas():
+        print(linha)
@@ -0,0 +1,168 @@
+import atexit
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, List, Optional, Tuple
+
+from src.lct_calculator.database import DATABASE_PATH, DatabaseService
+
+# Configuração do logger
+logging.basicConfig(level=logging.INFO)
+
+# Marcadores de controle enviados pela mesma fila dos cálculos
+_PARAR = object()
+
+
+class _Flush:
+    """Pedido de descarga: o escritor grava o lote pendente e sinaliza o evento."""
+
+    def __init__(self):
+        self.evento = threading.Event()
+
+
+class WriteBehindService:
+    """
+    Persistência assíncrona (write-behind) dos cálculos de fundações.
+
+    Os cálculos entram em uma fila limitada e são gravados por uma thread dedicada,
+    agrupados em transações periódicas. O chamador recebe um Future que resolve com o
+    id gravado ou com a exceção do SQLite, sem esperar pelo commit em disco.
+    """
+
+    def __init__(self, db_path=DATABASE_PATH, tamanho_fila: int = 10000, tamanho_lote: int = 500,
+                 intervalo: float = 0.5, sincronizar_bim: bool = False):
+        """
+        Inicializa o escritor e inicia a thread de gravação.
+
+        :param db_path: Caminho do banco de dados SQLite.
+        :param tamanho_fila: Máximo de cálculos pendentes; acima disso salvar_calculo bloqueia.
+        :param tamanho_lote: Máximo de cálculos gravados por transação.
+        :param intervalo: Tempo máximo (s) que um cálculo aguarda antes de ser gravado.
+        :param sincronizar_bim: Grava a mensagem da outbox BIM junto com cada cálculo.
+        """
+        self.db_path = db_path
+        self.tamanho_lote = tamanho_lote
+        self.intervalo = intervalo
+        self.sincronizar_bim = sincronizar_bim
+        self._fila: "queue.Queue" = queue.Queue(maxsize=tamanho_fila)
+        self._fechado = False
+        # Protege _fechado: nenhum cálculo entra na fila depois do marcador de parada
+        self._trava = threading.Lock()
+        self._thread = threading.Thread(target=self._executar, name="lct-write-behind", daemon=True)
+        self._thread.start()
+        atexit.register(self.close)
+
+    def salvar_calculo(self, tipo: str, dados_entrada: Any, resultado: Any) -> Future:
+        """
+        Enfileira um cálculo para gravação.
+
+        :return: Future resolvido com o id da fundação gravada (ou com o erro de gravação).
+        """
+        futuro: Future = Future()
+        with self._trava:
+            if self._fechado:
+                raise RuntimeError("WriteBehindService já foi encerrado.")
+            self._fila.put((futuro, (tipo, dados_entrada, resultado)))
+        return futuro
+
+    def flush(self, timeout: Optional[float] = None) -> bool:
+        """
+        Força a gravação de todos os cálculos enfileirados até o momento.
+
+        :param timeout: Tempo máximo de espera em segundos (None espera indefinidamente).
+        :return: True se a descarga terminou dentro do tempo.
+        """
+        pedido = _Flush()
+        with self._trava:
+            if self._fechado:
+                raise RuntimeError("WriteBehindService já foi encerrado.")
+            self._fila.put(pedido)
+        return pedido.evento.wait(timeout)
+
+    def close(self):
+        """Grava os cálculos pendentes e encerra a thread de gravação"""
+        with self._trava:
+            if self._fechado:
+                return
+            self._fechado = True
+            self._fila.put(_PARAR)
+        atexit.unregister(self.close)
+        self._thread.join()
+        logging.info("Escritor write-behind encerrado.")
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        self.close()
+
+    def _executar(self):
+        """Laço da thread de gravação: acumula um lote e grava em uma transação"""
+        lote: List[Tuple[Future, Tuple]] = []
+        item = None
+        try:
+            db_service = DatabaseService(self.db_path)
+            prazo = None
+            while True:
+                espera = None if prazo is None else max(prazo - time.monotonic(), 0)
+                try:
+                    item = self._fila.get(timeout=espera)
+                except queue.Empty:
+                    item = None
+
+                if item is None or item is _PARAR or isinstance(item, _Flush):
+                    self._gravar(db_service, lote)
+                    lote, prazo = [], None
+                    if isinstance(item, _Flush):
+                        item.evento.set()
+                    elif item is _PARAR:
+                        return
+                    continue
+
+                lote.append(item)
+                if prazo is None:
+                    prazo = time.monotonic() + self.intervalo
+                if len(lote) >= self.tamanho_lote:
+                    self._gravar(db_service, lote)
+                    lote, prazo = [], None
+        except Exception as e:
+            logging.exception("Falha na thread de gravação write-behind; os cálculos pendentes serão rejeitados.")
+            for futuro, _ in lote:
+                if not futuro.done():
+                    futuro.set_exception(e)
+            if isinstance(item, _Flush):
+                item.evento.set()
+            elif item is not _PARAR:
+                self._rejeitar(e)
+
+    def _rejeitar(self, erro: Exception):
+        """Após uma falha da thread, resolve cada pedido restante com o erro até o encerramento"""
+        while True:
+            item = self._fila.get()
+            if item is _PARAR:
+                return
+            if isinstance(item, _Flush):
+                item.evento.set()
+            elif item[0].set_running_or_notify_cancel():
+                item[0].set_exception(erro)
+
+    def _gravar(self, db_service: DatabaseService, lote: List[Tuple[Future, Tuple]]):
+        """Grava o lote em uma transação; em caso de falha, isola o erro regravando linha a linha"""
+        # Cálculos cancelados pelo chamador antes da gravação são descartados
+        lote = [(futuro, calculo) for futuro, calculo in lote if futuro.set_running_or_notify_cancel()]
+        if not lote:
+            return
+        try:
+            ids = db_service.salvar_calculos_lote((calculo for _, calculo in lote), self.sincronizar_bim)
+        except Exception:
+            logging.warning("Falha ao gravar lote write-behind; regravando cálculos individualmente.")
+            for futuro, calculo in lote:
+                try:
+                    futuro.set_result(db_service.salvar_calculo(*calculo, sincronizar_bim=self.sincronizar_bim))
+                except Exception as e:
+                    futuro.set_exception(e)
+            return
+        for (futuro, _), id_fundacao in zip(lote, ids):
+            futuro.set_result(id_fundacao)
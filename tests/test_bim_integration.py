@@ -0,0 +1,176 @@
+import asyncio
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.lct_calculator.database import DatabaseService
+from src.lct_calculator.services.bim_integration import (
+    RESULTADO_ID_INVALIDO, RESULTADO_INEXISTENTE, RESULTADO_RESSINCRONIZADO, RESULTADO_SINCRONIZADO,
+    compactar_historico_bim, resumo_status_bim, selecionar_alteradas_bim, sincronizar_bim_delta,
+    sincronizar_bim_lote,
+)
+from src.lct_calculator.services.bim_sync_worker import BIMSyncWorker, ServidorBIMLocal
+
+
+class TestSincronizacaoBIM(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "teste.db")
+        self.ids = DatabaseService(self.db_path).salvar_calculos_lote([("sapata", {}, {})] * 3)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def _contar_status(self):
+        conn = sqlite3.connect(self.db_path)
+        try:
+            return conn.execute("SELECT COUNT(*) FROM sincronizacao_bim").fetchone()[0]
+        finally:
+            conn.close()
+
+    def test_lote_idempotente_com_resultado_por_id(self):
+        primeiro = sincronizar_bim_lote(self.ids[:2], self.db_path)
+        self.assertEqual(set(primeiro.values()), {RESULTADO_SINCRONIZADO})
+
+        segundo = sincronizar_bim_lote(self.ids + [999, "x"], self.db_path)
+        self.assertEqual(segundo, {
+            self.ids[0]: RESULTADO_RESSINCRONIZADO,
+            self.ids[1]: RESULTADO_RESSINCRONIZADO,
+            self.ids[2]: RESULTADO_SINCRONIZADO,
+            999: RESULTADO_INEXISTENTE,
+            "x": RESULTADO_ID_INVALIDO,
+        })
+        self.assertEqual(self._contar_status(), 3)
+
+    def _drenar(self):
+        async def executar():
+            async with ServidorBIMLocal() as servidor:
+                await BIMSyncWorker(servidor.adaptador(), self.db_path).drenar()
+                return servidor.recebidos
+
+        return asyncio.run(executar())
+
+    def test_delta_envia_apenas_alteradas(self):
+        self.assertEqual(sincronizar_bim_delta(self.db_path), self.ids)
+        # Enfileirar não marca como sincronizado nem duplica as mensagens pendentes
+        self.assertEqual(selecionar_alteradas_bim(self.db_path), self.ids)
+        self.assertEqual(sincronizar_bim_delta(self.db_path), [])
+        self.assertEqual(sorted(p["fundacao_id"] for p in self._drenar()), self.ids)
+        self.assertEqual(selecionar_alteradas_bim(self.db_path), [])
+
+        db = DatabaseService(self.db_path)
+        self.assertFalse(db.atualizar_calculo(self.ids[1], {}, {}))
+        self.assertTrue(db.atualizar_calculo(self.ids[1], {"fck": 30}, {}))
+        self.assertEqual(sincronizar_bim_delta(self.db_path), [self.ids[1]])
+        self.assertEqual([p["dados_entrada"] for p in self._drenar()], [{"fck": 30}])
+        self.assertEqual(sincronizar_bim_delta(self.db_path), [])
+
+    def test_status_atual_e_compactacao_do_historico(self):
+        db = DatabaseService(self.db_path)
+        for fck in (25, 30, 35):
+            db.atualizar_calculo(self.ids[0], {"fck": fck}, {})
+            sincronizar_bim_lote([self.ids[0]], self.db_path)
+        sincronizar_bim_lote(self.ids, self.db_path)
+
+        self.assertEqual(self._contar_status(), 5)
+        self.assertEqual(resumo_status_bim(self.db_path), {"Sincronizado": 3})
+        self.assertEqual(compactar_historico_bim(manter_por_fundacao=1, db_path=self.db_path), 2)
+        self.assertEqual(self._contar_status(), 3)
+        self.assertEqual(selecionar_alteradas_bim(self.db_path), [])
+
+    def test_migracao_preserva_historico(self):
+        conn = sqlite3.connect(self.db_path)
+        with conn:
+            conn.executemany(
+                "INSERT INTO sincronizacao_bim (fundacao_id, status) VALUES (?, ?)",
+                [(self.ids[0], "Pendente"), (self.ids[0], "Sincronizado"), (self.ids[1], "Sincronizado")],
+            )
+            conn.execute("DELETE FROM sincronizacao_bim_atual")
+        conn.close()
+
+        DatabaseService(self.db_path)
+        self.assertEqual(self._contar_status(), 3)
+        self.assertEqual(resumo_status_bim(self.db_path), {"Sincronizado": 2})
+
+
+class TestBIMSyncWorker(unittest.TestCase):
+    def test_outbox_drenada_com_retentativa_e_dead_letter(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "teste.db")
+            ids = DatabaseService(db_path).salvar_calculos_lote([("sapata", {}, {})] * 4, sincronizar_bim=True)
+
+            async def executar():
+                async with ServidorBIMLocal() as servidor:
+                    servidor.falhas_programadas = {ids[0]: 1, ids[1]: -1}
+                    worker = BIMSyncWorker(servidor.adaptador(), db_path, concorrencia=2,
+                                           max_tentativas=3, backoff_base=0.01)
+                    metricas = await worker.drenar()
+                    return servidor.recebidos, metricas
+
+            recebidos, metricas = asyncio.run(executar())
+
+            self.assertEqual(sorted(p["fundacao_id"] for p in recebidos), [ids[0], ids[2], ids[3]])
+            self.assertEqual((metricas.enviados, metricas.dead_letters), (3, 1))
+            conn = sqlite3.connect(db_path)
+            try:
+                self.assertEqual(
+                    conn.execute("SELECT fundacao_id FROM outbox_bim WHERE status = 'dead_letter'").fetchall(),
+                    [(ids[1],)],
+                )
+                self.assertEqual(conn.execute("SELECT COUNT(*) FROM sincronizacao_bim").fetchone()[0], 3)
+            finally:
+                conn.close()
+
+    def test_apenas_a_mensagem_mais_recente_da_fundacao_e_enviada(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "teste.db")
+            db = DatabaseService(db_path)
+            fundacao_id = db.salvar_calculo("sapata", {"fck": 25}, {}, sincronizar_bim=True)
+
+            async def executar():
+                async with ServidorBIMLocal() as servidor:
+                    servidor.falhas_programadas = {fundacao_id: 1}
+                    worker = BIMSyncWorker(servidor.adaptador(), db_path, backoff_base=0.01)
+                    # A primeira versão falha e fica reagendada; depois chegam duas versões novas
+                    await worker.drenar(aguardar_retentativas=False)
+                    for fck in (30, 35):
+                        db.atualizar_calculo(fundacao_id, {"fck": fck}, {}, sincronizar_bim=True)
+                    metricas = await worker.drenar()
+                    return servidor.recebidos, metricas
+
+            recebidos, metricas = asyncio.run(executar())
+
+            self.assertEqual([p["dados_entrada"] for p in recebidos], [{"fck": 35}])
+            self.assertEqual((metricas.enviados, metricas.substituidas), (1, 2))
+            conn = sqlite3.connect(db_path)
+            try:
+                self.assertEqual(conn.execute("SELECT status FROM outbox_bim ORDER BY id").fetchall(),
+                                 [("substituido",), ("substituido",), ("enviado",)])
+            finally:
+                conn.close()
+            self.assertEqual(selecionar_alteradas_bim(db_path), [])
+
+    def test_payload_antigo_nao_marca_resultado_novo_como_sincronizado(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "teste.db")
+            db = DatabaseService(db_path)
+            fundacao_id = db.salvar_calculo("sapata", {"fck": 25}, {}, sincronizar_bim=True)
+            db.atualizar_calculo(fundacao_id, {"fck": 30}, {}, sincronizar_bim=False)
+
+            async def executar():
+                async with ServidorBIMLocal() as servidor:
+                    await BIMSyncWorker(servidor.adaptador(), db_path).drenar()
+                    return servidor.recebidos
+
+            recebidos = asyncio.run(executar())
+
+            self.assertEqual(recebidos[0]["dados_entrada"], {"fck": 25})
+            self.assertEqual(selecionar_alteradas_bim(db_path), [fundacao_id])
+            self.assertEqual(sincronizar_bim_delta(db_path), [fundacao_id])
+            self.assertEqual([p["dados_entrada"] for p in asyncio.run(executar())], [{"fck": 30}])
+            self.assertEqual(selecionar_alteradas_bim(db_path), [])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,40 @@
+import unittest
+
+import numpy as np
+
+from src.lct_calculator.helpers.data_validator import DataValidator
+
+
+class TestDataValidator(unittest.TestCase):
+    def test_reporta_todas_as_violacoes(self):
+        dados = {
+            "carga": np.array([100.0, -5.0, 200.0, 50.0]),
+            "fck": np.array([25.0, 25.0, 10.0, 30.0]),
+            "base": np.array([1.5, 0.0, 2.0, np.nan]),
+            "altura": np.array([0.6, 0.6, 0.8, 0.5]),
+            "capacidade_solo": np.array([200.0, 200.0, 200.0, 200.0]),
+        }
+
+        resultado = DataValidator.validar(dados, "sapata", linha_inicial=10)
+        self.assertFalse(resultado)
+        self.assertEqual(resultado.validas.tolist(), [True, False, False, False])
+        self.assertEqual(resultado.linhas_invalidas.tolist(), [11, 12, 13])
+        self.assertEqual([(e["linha"], e["colunas"]) for e in resultado.erros()],
+                         [(11, ("carga",)), (11, ("base",)), (12, ("fck",)), (13, ("base",))])
+
+    def test_regra_entre_colunas_e_colunas_ausentes(self):
+        # Cobrimento em mm e altura em m, como nos parâmetros de SapataCorrida
+        dados = {"largura_base": [1.5, 1.5], "altura_sapata": [0.6, 0.6], "comprimento_sapata": [10.0, 10.0],
+                 "fck": [25.0, 25.0], "carga_kN": [500.0, 500.0], "cobrimento": [50.0, 600.0],
+                 "diametro_aco": [10.0, 10.0], "angulo_atrito_solo": [30.0, 30.0], "peso_proprio_solo": [18.0, 18.0]}
+        resultado = DataValidator.validar(dados, "sapata_corrida")
+        self.assertEqual(resultado.validas.tolist(), [True, False])
+        self.assertEqual([(e["linha"], e["motivo"]) for e in resultado.erros()],
+                         [(1, "cobrimento (mm) deve ser menor que altura_sapata (m)")])
+
+        with self.assertRaises(ValueError):
+            DataValidator.validar({"carga": [1.0]}, "bloco")
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,179 @@
+import os
+import sqlite3
+import tempfile
+import unittest
+
+from src.lct_calculator.database import LIMITE_ANEXOS_PADRAO, CatalogoProjetos, DatabaseService, _limite_anexos
+from src.lct_calculator.services import sqlite_service
+from src.lct_calculator.services.write_behind_service import WriteBehindService
+
+
+def _resultado(volume, ruptura, barras, diametro):
+    return {
+        "Volume de Concreto (m³)": volume,
+        "Ruptura do Solo": ruptura,
+        "Armadura - Quantidade de Barras": barras,
+        "Armadura - Diâmetro das Barras (mm)": diametro,
+    }
+
+
+class TestDatabaseService(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.db_path = os.path.join(self.tmpdir.name, "teste.db")
+        self.db = DatabaseService(self.db_path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_resumos_acompanham_insercao_em_lote(self):
+        self.db.salvar_calculos_lote([
+            ("sapata", {"fck": 25}, _resultado(2.0, False, 10.0, 12.0)),
+            ("sapata", {"fck": 30}, _resultado(3.0, True, 5.0, 12.0)),
+            ("estaca", {"fck": 25}, _resultado(1.5, True, 4.0, 20.0)),
+        ])
+        self.db.salvar_calculo("estaca", {"fck": 25}, str(_resultado(0.5, False, 1.0, 20.0)))
+
+        por_tipo = {linha["tipo"]: linha for linha in self.db.resumo_por_tipo()}
+        self.assertEqual(por_tipo["sapata"]["quantidade"], 2)
+        self.assertAlmostEqual(por_tipo["sapata"]["volume_concreto"], 5.0)
+        self.assertEqual(por_tipo["estaca"]["rupturas"], 1)
+
+        armadura = {linha["diametro_barras"]: linha["quantidade_barras"] for linha in self.db.resumo_armadura()}
+        self.assertEqual(armadura, {12.0: 15.0, 20.0: 5.0})
+        self.assertEqual(self.db.resumo_projeto()["rupturas"], 2)
+
+        por_fck = {linha["fck"]: linha["quantidade"] for linha in self.db.agregar_calculos("fck")}
+        self.assertEqual(por_fck, {25.0: 3, 30.0: 1})
+
+    def test_resumos_acompanham_remocao(self):
+        ids = self.db.salvar_calculos_lote([
+            ("bloco", {}, _resultado(1.0, False, 2.0, 12.0)),
+            ("bloco", {}, _resultado(4.0, False, 3.0, 12.0)),
+        ])
+        self.db.connect()
+        with self.db.conn:
+            self.db.conn.execute("DELETE FROM fundacoes WHERE id = ?", (ids[0],))
+        self.db.close()
+
+        self.assertEqual(self.db.resumo_por_tipo(), [
+            {"tipo": "bloco", "quantidade": 1, "volume_concreto": 4.0, "rupturas": 0}
+        ])
+
+    def test_exportar_e_abrir_arquivo_colunar(self):
+        self.db.salvar_calculos_lote([
+            ("sapata", {"fck": 25}, _resultado(2.0, False, 10.0, 12.0)),
+            ("estaca", {}, {}),
+        ])
+        destino = self.db.exportar_colunar(os.path.join(self.tmpdir.name, "arquivo"), tamanho_bloco=1)
+
+        arquivo = DatabaseService.abrir_colunar(destino)
+        self.assertEqual(len(arquivo), 2)
+        self.assertEqual(list(arquivo.tipos()), ["sapata", "estaca"])
+        self.assertEqual(arquivo["volume_concreto"][0], 2.0)
+        self.assertEqual(list(arquivo["ruptura_solo"]), [0, -1])
+
+    def test_snapshot_atualiza_apenas_linhas_novas(self):
+        self.db.salvar_calculo("sapata", {}, _resultado(2.0, False, 1.0, 12.0))
+        with self.db.criar_snapshot() as snapshot:
+            self.db.salvar_calculos_lote([("sapata", {}, _resultado(3.0, True, 1.0, 12.0))])
+            self.assertEqual(snapshot.consultar("SELECT COUNT(*) FROM fundacoes"), [(1,)])
+
+            self.assertEqual(snapshot.atualizar(), 1)
+            self.assertEqual(snapshot.consultar("SELECT quantidade, rupturas FROM resumo_tipo"), [(2, 1)])
+            with self.assertRaises(sqlite3.OperationalError):
+                snapshot.consultar("DELETE FROM fundacoes")
+
+    def test_sqlite_service_usa_o_mesmo_esquema(self):
+        db_path = os.path.join(self.tmpdir.name, "servico.db")
+        sqlite_service.create_tables(db_path)
+        self.assertEqual(DatabaseService(db_path).salvar_calculo("sapata", {}, {}), 1)
+
+    def test_snapshot_acompanha_alteracoes_e_remocoes(self):
+        ids = self.db.salvar_calculos_lote([
+            ("sapata", {}, _resultado(2.0, False, 1.0, 12.0)),
+            ("bloco", {}, _resultado(1.0, False, 1.0, 12.0)),
+        ])
+        with self.db.criar_snapshot() as snapshot:
+            self.db.atualizar_calculo(ids[0], {"fck": 30}, _resultado(5.0, True, 1.0, 12.0))
+            conn = sqlite3.connect(self.db_path)
+            with conn:
+                conn.execute("DELETE FROM fundacoes WHERE id = ?", (ids[1],))
+            conn.close()
+
+            self.assertEqual(snapshot.atualizar(), 2)
+            self.assertEqual(snapshot.consultar("SELECT id, volume_concreto FROM fundacoes"), [(ids[0], 5.0)])
+            self.assertEqual(snapshot.consultar("SELECT tipo, quantidade, volume_concreto, rupturas FROM resumo_tipo"),
+                             [("sapata", 1, 5.0, 1)])
+            self.assertEqual(snapshot.atualizar(), 0)
+
+    def test_agrupamento_invalido(self):
+        with self.assertRaises(ValueError):
+            self.db.agregar_calculos("resultado; DROP TABLE fundacoes")
+
+
+class TestCatalogoProjetos(unittest.TestCase):
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.catalogo = CatalogoProjetos(self.tmpdir.name)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_um_banco_por_projeto_e_consulta_entre_projetos(self):
+        for nome, volume in (("Edifício A", 2.0), ("Edifício B", 3.0)):
+            self.catalogo.abrir_projeto(nome).salvar_calculo("sapata", {}, _resultado(volume, False, 1.0, 12.0))
+
+        self.assertNotEqual(self.catalogo.caminho_projeto("Edifício A"), self.catalogo.caminho_projeto("Edifício B"))
+        self.assertEqual(self.catalogo.resumo_por_tipo(), [
+            {"tipo": "sapata", "quantidade": 2, "volume_concreto": 5.0, "rupturas": 0}
+        ])
+
+    def test_limite_de_anexos_sem_getlimit(self):
+        # Python 3.10 não tem Connection.getlimit
+        self.assertEqual(_limite_anexos(object()), LIMITE_ANEXOS_PADRAO)
+
+    def test_arquivar_projeto(self):
+        self.catalogo.abrir_projeto("Antigo").salvar_calculo("bloco", {}, {})
+        arquivo = self.catalogo.arquivar_projeto("Antigo")
+
+        self.assertTrue(arquivo.exists())
+        self.assertEqual(self.catalogo.listar_projetos(), [])
+        with self.assertRaises(ValueError):
+            self.catalogo.abrir_projeto("Antigo")
+
+
+class TestWriteBehindService(unittest.TestCase):
+    def test_futuros_resolvem_com_ids_apos_flush(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            db_path = os.path.join(tmpdir, "teste.db")
+            with WriteBehindService(db_path, tamanho_lote=2, intervalo=10) as escritor:
+                futuros = [escritor.salvar_calculo("sapata", {}, _resultado(1.0, False, 1.0, 12.0)) for _ in range(3)]
+                self.assertTrue(escritor.flush(timeout=5))
+                self.assertEqual(sorted(f.result(timeout=0) for f in futuros), [1, 2, 3])
+            self.assertEqual(DatabaseService(db_path).resumo_projeto()["quantidade"], 3)
+            with self.assertRaises(RuntimeError):
+                escritor.flush()
+
+    def test_erro_de_gravacao_chega_ao_futuro(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            with WriteBehindService(os.path.join(tmpdir, "teste.db")) as escritor:
+                valido = escritor.salvar_calculo("bloco", {}, {})
+                invalido = escritor.salvar_calculo(None, {}, {})
+                escritor.flush()
+                self.assertEqual(valido.result(timeout=0), 1)
+                self.assertIsNotNone(invalido.exception(timeout=0))
+
+    def test_falha_ao_abrir_banco_rejeita_pendentes(self):
+        with tempfile.TemporaryDirectory() as tmpdir:
+            # Um diretório no lugar do arquivo impede o SQLite de abrir o banco
+            with WriteBehindService(tmpdir) as escritor:
+                futuro = escritor.salvar_calculo("bloco", {}, {})
+                self.assertTrue(escritor.flush(timeout=5))
+                self.assertIsInstance(futuro.exception(timeout=5), sqlite3.OperationalError)
+            with self.assertRaises(RuntimeError):
+                escritor.salvar_calculo("bloco", {}, {})
+
+
+if __name__ == '__main__':
+    unittest.main()
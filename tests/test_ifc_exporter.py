@@ -0,0 +1,87 @@
+import unittest
+
+import ifcopenshell
+import ifcopenshell.guid
+import numpy as np
+
+from src.lct_calculator.interfaces.ifc_exporter import IFCExporter, NOME_PSET_PADRAO
+
+
+class TestIFCExporter(unittest.TestCase):
+    def setUp(self):
+        self.modelo = ifcopenshell.file(schema="IFC4")
+        self.sapatas = [
+            self.modelo.create_entity("IfcFooting", GlobalId=ifcopenshell.guid.new(), Name=f"S{i}")
+            for i in range(3)
+        ]
+
+    def _psets(self, elemento):
+        return [
+            rel.RelatingPropertyDefinition for rel in elemento.IsDefinedBy
+            if rel.RelatingPropertyDefinition.Name == NOME_PSET_PADRAO
+        ]
+
+    def test_gravacao_em_lote_compartilha_entidades(self):
+        s0, s1, s2 = (s.GlobalId for s in self.sapatas)
+        estatisticas = IFCExporter.gravar_resultados(self.modelo, {
+            s0: {"Volume de Concreto (m³)": 2.0, "Ruptura do Solo": False},
+            s1: {"Volume de Concreto (m³)": 2.0, "Ruptura do Solo": False},
+            s2: {"Volume de Concreto (m³)": 3.0, "Ruptura do Solo": False},
+            "inexistente": {"Volume de Concreto (m³)": 1.0},
+        })
+
+        self.assertEqual(estatisticas["elementos"], 3)
+        self.assertEqual(estatisticas["nao_encontrados"], 1)
+        self.assertEqual(estatisticas["propriedades"], 3)
+        self.assertEqual(len(self.modelo.by_type("IfcRelDefinesByProperties")), 2)
+        self.assertEqual(self._psets(self.sapatas[0])[0].id(), self._psets(self.sapatas[1])[0].id())
+
+    def test_regravar_substitui_pset_anterior(self):
+        global_id = self.sapatas[0].GlobalId
+        IFCExporter.gravar_resultados(self.modelo, {global_id: {"Volume de Concreto (m³)": 1.0}})
+        IFCExporter.gravar_resultados(self.modelo, {global_id: {"Volume de Concreto (m³)": 4.0}})
+
+        psets = self._psets(self.sapatas[0])
+        self.assertEqual(len(psets), 1)
+        self.assertEqual(psets[0].HasProperties[0].NominalValue.wrappedValue, 4.0)
+        self.assertEqual(len(self.modelo.by_type("IfcPropertySet")), 1)
+        self.assertEqual(len(self.modelo.by_type("IfcPropertySingleValue")), 1)
+
+    def test_escalares_numpy_viram_tipos_numericos(self):
+        global_id = self.sapatas[0].GlobalId
+        IFCExporter.gravar_resultados(self.modelo, {global_id: {
+            "Quantidade de Barras": np.int64(8), "Volume de Concreto (m³)": np.float32(1.5),
+            "Ruptura do Solo": np.bool_(False),
+        }})
+
+        tipos = {p.Name: p.NominalValue.is_a() for p in self._psets(self.sapatas[0])[0].HasProperties}
+        self.assertEqual(tipos, {
+            "Quantidade de Barras": "IfcInteger", "Volume de Concreto (m³)": "IfcReal", "Ruptura do Solo": "IfcBoolean",
+        })
+
+    def test_gerar_fundacoes_compartilha_representacoes(self):
+        modelo = IFCExporter.criar_modelo("Teste")
+        elementos = IFCExporter.gerar_fundacoes(modelo, [
+            {"tipo": "sapata", "base": 1.5, "altura": 0.6, "x": 0.0},
+            {"tipo": "sapata", "base": 1.5, "altura": 0.6, "x": 5.0},
+            {"tipo": "estaca", "diametro": 0.4, "comprimento": 12.0, "x": 10.0},
+        ])
+
+        self.assertEqual([e.is_a() for e in elementos], ["IfcFooting", "IfcFooting", "IfcPile"])
+        self.assertEqual(len(modelo.by_type("IfcRepresentationMap")), 2)
+        self.assertEqual(len(modelo.by_type("IfcExtrudedAreaSolid")), 2)
+        self.assertEqual(elementos[0].Representation.id(), elementos[1].Representation.id())
+        self.assertEqual(elementos[1].ObjectPlacement.RelativePlacement.Location.Coordinates, (5.0, 0.0, 0.0))
+        self.assertEqual(len(modelo.by_type("IfcRelContainedInSpatialStructure")), 1)
+        self.assertEqual(elementos[2].IsTypedBy[0].RelatingType.is_a(), "IfcPileType")
+
+        # Entradas inválidas são rejeitadas antes de criar qualquer entidade
+        total = len(list(modelo))
+        for invalida in ({"tipo": "radier"}, {"tipo": "estaca", "diametro": 0.4}):
+            with self.assertRaises((ValueError, KeyError)):
+                IFCExporter.gerar_fundacoes(modelo, [{"tipo": "sapata", "base": 2.0, "altura": 0.8}, invalida])
+            self.assertEqual(len(list(modelo)), total)
+
+
+if __name__ == '__main__':
+    unittest.main()
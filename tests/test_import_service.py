@@ -0,0 +1,66 @@
+import json
+import os
+import tempfile
+import threading
+import unittest
+from concurrent.futures import ProcessPoolExecutor
+from unittest import mock
+
+from src.lct_calculator.interfaces.ifc_exporter import IFCExporter
+from src.lct_calculator.services.import_service import ImportService
+
+
+class TestImportService(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+        ambiente = mock.patch.dict(os.environ, {"LCT_CALCULATOR_DATA_DIR": os.path.join(self.diretorio.name, "dados")})
+        ambiente.start()
+        self.addCleanup(ambiente.stop)
+        entrada = os.path.join(self.diretorio.name, "entrada")
+        os.mkdir(entrada)
+        self.entrada = entrada
+
+        with open(os.path.join(entrada, "pilares.csv"), "w", encoding="utf-8") as arquivo:
+            arquivo.write("Nome,Carga\nP1,10\nP2,20\n")
+        with open(os.path.join(entrada, "elementos.json"), "w", encoding="utf-8") as arquivo:
+            json.dump([{"Nome": "S1"}], arquivo)
+        with open(os.path.join(entrada, "corrompido.json"), "w", encoding="utf-8") as arquivo:
+            arquivo.write("[{")
+        with open(os.path.join(entrada, "leia-me.txt"), "w", encoding="utf-8") as arquivo:
+            arquivo.write("ignorado")
+        modelo = IFCExporter.criar_modelo("Importação")
+        IFCExporter.gerar_fundacoes(modelo, [{"tipo": "estaca", "diametro": 0.4, "comprimento": 10.0}])
+        modelo.write(os.path.join(entrada, "modelo.ifc"))
+
+    def test_importar_diretorio_isola_erros(self):
+        eventos = []
+        servico = ImportService(max_processos=1, progresso=lambda n, total, r: eventos.append((n, total)))
+
+        lote = servico.importar_diretorio(self.entrada)
+        self.assertEqual(len(lote.arquivos), 4)
+        self.assertEqual(list(lote.erros), [os.path.join(self.entrada, "corrompido.json")])
+        self.assertEqual(sorted(r["Nome"] for r in lote.registros if "Nome" in r),
+                         ["P1", "P2", "S1", "estaca 1"])
+        self.assertEqual(sorted(eventos), [(1, 4), (2, 4), (3, 4), (4, 4)])
+        ifc = [r for r in lote.registros if r["Arquivo"].endswith(".ifc")]
+        self.assertEqual(ifc[0]["Classe"], "IfcPile")
+
+    def test_pool_de_processos_sem_fork_e_antes_das_threads(self):
+        criados = []
+
+        def criar_pool(*args, **kwargs):
+            criados.append((kwargs["mp_context"].get_start_method(),
+                            [t.name for t in threading.enumerate() if t.name.startswith("lct-import")]))
+            return ProcessPoolExecutor(*args, **kwargs)
+
+        with mock.patch("src.lct_calculator.services.import_service.ProcessPoolExecutor", side_effect=criar_pool):
+            lote = ImportService(max_processos=1).importar_diretorio(self.entrada)
+        self.assertEqual(len(criados), 1)
+        self.assertNotEqual(criados[0][0], "fork")
+        self.assertEqual(criados[0][1], [])
+        self.assertEqual(len(lote.registros), 4)
+
+
+if __name__ == '__main__':
+    unittest.main()
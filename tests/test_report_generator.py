@@ -0,0 +1,202 @@
+import csv
+import gzip
+import json
+import os
+import tempfile
+import re
+import unittest
+import zlib
+from unittest import mock
+
+from src.lct_calculator.database import COLUNAS_CALCULOS, DatabaseService
+from src.lct_calculator.helpers.cache_fragmentos import CacheFragmentos
+from src.lct_calculator.helpers.pdf_tabela import LayoutTabela, MotorPDFTabela
+from src.lct_calculator.interfaces.report_generator import ReportGenerator
+
+
+class TestReportGenerator(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+        self.db_service = DatabaseService(os.path.join(self.diretorio.name, "teste.db"))
+        self.db_service.salvar_calculos_lote([
+            ("sapata", {"carga": 100}, {"Volume de Concreto (m³)": 1.5}),
+            ("estaca", {"carga": 200}, {"Volume de Concreto (m³)": 2.0}),
+        ])
+
+    def _caminho(self, nome):
+        return os.path.join(self.diretorio.name, nome)
+
+    def test_relatorio_em_fluxo_a_partir_do_banco(self):
+        gerador = ReportGenerator(self.db_service.iterar_calculos, "Projeto", "Eng.", colunas=COLUNAS_CALCULOS)
+
+        gerador.gerar_relatorio("csv", self._caminho("relatorio.csv"))
+        with open(self._caminho("relatorio.csv"), encoding="utf-8") as arquivo:
+            linhas = list(csv.DictReader(arquivo))
+        self.assertEqual([linha["tipo"] for linha in linhas], ["sapata", "estaca"])
+
+        gerador.gerar_relatorio("json", self._caminho("relatorio.json"))
+        with open(self._caminho("relatorio.json"), encoding="utf-8") as arquivo:
+            relatorio = json.load(arquivo)
+        self.assertEqual(relatorio["nome_projeto"], "Projeto")
+        self.assertEqual(list(relatorio["dados"][1]), list(COLUNAS_CALCULOS))
+
+        gerador.gerar_relatorio("pdf", self._caminho("relatorio.pdf"))
+        self.assertGreater(os.path.getsize(self._caminho("relatorio.pdf")), 0)
+
+    def test_json_identico_ao_formato_anterior(self):
+        dados = [{"Fundação": "Sapata", "Volume": 12.5}, {"Fundação": "Estaca", "Volume": 10.0}]
+        for linhas in (dados, []):
+            ReportGenerator(iter(linhas), "P", "E").gerar_json(self._caminho("r.json"))
+            with open(self._caminho("r.json"), encoding="utf-8") as arquivo:
+                self.assertEqual(arquivo.read(), json.dumps(
+                    {"nome_projeto": "P", "engenheiro_responsavel": "E", "dados": linhas}, indent=4))
+
+        with self.assertRaises(ValueError):
+            ReportGenerator([(1, 2)], "P", "E").gerar_csv(self._caminho("r.csv"))
+
+    def test_json_compacto_e_ndjson(self):
+        dados = [{"Fundação": "Sapata", "Volume": 12.5}, {"Fundação": "Estaca", "Volume": None}]
+        cabecalho = {"nome_projeto": "P", "engenheiro_responsavel": "E"}
+        cache = CacheFragmentos(self._caminho("cache.db"))
+        self.addCleanup(cache.close)
+        for gerador in (ReportGenerator(dados, "P", "E"), ReportGenerator(dados, "P", "E", cache=cache)):
+            for linhas in (dados, []):
+                gerador.dados = linhas
+                gerador.gerar_json(self._caminho("r.json"), modo="compacto")
+                with open(self._caminho("r.json"), encoding="utf-8") as arquivo:
+                    self.assertEqual(arquivo.read(), json.dumps({**cabecalho, "dados": linhas}, separators=(",", ":")))
+
+            gerador.dados = dados
+            gerador.gerar_json(self._caminho("r.ndjson.gz"), modo="ndjson")
+            with gzip.open(self._caminho("r.ndjson.gz"), "rt", encoding="utf-8") as arquivo:
+                self.assertEqual([json.loads(linha) for linha in arquivo], [cabecalho] + dados)
+
+        with self.assertRaises(ValueError):
+            ReportGenerator(dados, "P", "E").gerar_json(self._caminho("r.json"), modo="xml")
+
+
+class TestRegeneracaoIncremental(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+        self.colunas = ["id", "tipo", "volume"]
+        self.linhas = [[i, "sapata", 1.5 * i] for i in range(1000)]
+
+    def _gerar(self, formato, cache=None, nome="relatorio"):
+        caminho = os.path.join(self.diretorio.name, f"{nome}.{formato}")
+        ReportGenerator(self.linhas, "P", "E", colunas=self.colunas, cache=cache).gerar_relatorio(formato, caminho)
+        with open(caminho, 'rb') as arquivo:
+            return arquivo.read()
+
+    def test_apenas_linhas_alteradas_sao_renderizadas(self):
+        for formato in ("csv", "json", "pdf"):
+            with self.subTest(formato=formato):
+                self.linhas = [[i, "sapata", 1.5 * i] for i in range(1000)]
+                cache = CacheFragmentos(os.path.join(self.diretorio.name, f"cache_{formato}.db"))
+                self.addCleanup(cache.close)
+                self.assertEqual(self._gerar(formato, cache), self._gerar(formato, nome="referencia"))
+
+                self.linhas[500][2] = -1.0
+                self.linhas.insert(10, [1000, "estaca", 2.0])
+                cache.acertos = cache.renderizados = 0
+                regenerado = self._gerar(formato, cache)
+                self.assertEqual(cache.renderizados, 2)
+                self.assertEqual(cache.acertos + cache.renderizados, len(self.linhas))
+                if formato != "pdf":
+                    # No PDF, as larguras das colunas da primeira geração são mantidas de propósito
+                    self.assertEqual(regenerado, self._gerar(formato, nome="referencia"))
+
+    def test_larguras_reajustadas_quando_valores_nao_cabem(self):
+        cache = CacheFragmentos(os.path.join(self.diretorio.name, "cache.db"))
+        self.addCleanup(cache.close)
+        larguras = {}
+        longo = "tubulão com base alargada " * 6
+        for projeto, tipo in (("P1", "sapata"), ("P2", longo), ("P1", longo)):
+            layout = LayoutTabela(self.colunas, titulo=f"Relatório do Projeto: {projeto}")
+            linhas = [[i, tipo, 1.5 * i] for i in range(100)]
+            MotorPDFTabela(layout, processos=1, cache=cache).gravar(os.path.join(self.diretorio.name, "t.pdf"), linhas)
+            larguras[projeto, tipo] = layout.larguras
+            self.assertGreaterEqual(layout.larguras[1], layout.larguras_naturais(linhas)[1])
+        self.assertEqual(larguras["P2", longo], larguras["P1", longo])
+        self.assertGreater(larguras["P1", longo][1], larguras["P1", "sapata"][1])
+        self.assertEqual(cache.conexao.execute("SELECT COUNT(*) FROM metadados").fetchone()[0], 2)
+
+    def test_cache_remove_fragmentos_antigos(self):
+        caminho = os.path.join(self.diretorio.name, "cache.db")
+        cache = CacheFragmentos(caminho)
+        self._gerar("csv", cache)
+        total, = cache.conexao.execute("SELECT COUNT(*) FROM fragmentos").fetchone()
+        with cache.conexao:
+            cache.conexao.execute("""
+                UPDATE fragmentos SET acesso = 0
+                WHERE (assinatura, chave) IN (SELECT assinatura, chave FROM fragmentos LIMIT 100)
+            """)
+        cache.close()
+
+        cache = CacheFragmentos(caminho)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.conexao.execute("SELECT COUNT(*) FROM fragmentos").fetchone()[0], total - 100)
+        cache = CacheFragmentos(caminho, tamanho_maximo=0)
+        self.addCleanup(cache.close)
+        self.assertEqual(cache.conexao.execute("SELECT COUNT(*) FROM fragmentos").fetchone()[0], 0)
+
+
+class TestMotorPDFTabela(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.addCleanup(self.diretorio.cleanup)
+        self.colunas = ["id", "tipo", "volume"]
+        self.linhas = [(i, "tubulão (T)", 1.25 * i) for i in range(250)]
+
+    def _ler(self, caminho):
+        with open(caminho, 'rb') as arquivo:
+            conteudo = arquivo.read()
+        # Cada entrada da tabela xref aponta para o início do respectivo objeto
+        inicio_xref = int(conteudo.rsplit(b"startxref", 1)[1].split()[0])
+        entradas = re.findall(rb"(\d{10}) 00000 n", conteudo[inicio_xref:])
+        for numero, deslocamento in enumerate(entradas, start=1):
+            self.assertTrue(conteudo[int(deslocamento):].startswith(b"%d 0 obj" % numero))
+        return conteudo
+
+    def test_paginas_e_estrutura(self):
+        layout = LayoutTabela(self.colunas, titulo="Relatório")
+        caminho = os.path.join(self.diretorio.name, "tabela.pdf")
+        paginas = MotorPDFTabela(layout, processos=1).gravar(caminho, self.linhas)
+
+        self.assertEqual(paginas, -(-len(self.linhas) // layout.linhas_por_pagina))
+        conteudo = self._ler(caminho)
+        self.assertIn(b"/Count %d" % paginas, conteudo)
+        primeira = zlib.decompress(re.search(rb"/FlateDecode.*?stream\n(.*?)\nendstream", conteudo, re.S).group(1))
+        self.assertIn(b"/Cab Do", primeira)
+        self.assertIn("(tubulão \\(T\\))".encode("cp1252"), primeira)
+
+        vazio = os.path.join(self.diretorio.name, "vazio.pdf")
+        self.assertEqual(MotorPDFTabela(LayoutTabela(self.colunas), processos=1).gravar(vazio, []), 1)
+        self._ler(vazio)
+
+    def test_paralelo_igual_ao_sequencial(self):
+        caminhos = [os.path.join(self.diretorio.name, f"{processos}.pdf") for processos in (1, 2)]
+        for processos, caminho in zip((1, 2), caminhos):
+            MotorPDFTabela(LayoutTabela(self.colunas), processos, paginas_por_bloco=2).gravar(caminho, iter(self.linhas))
+        self.assertEqual(self._ler(caminhos[0]), self._ler(caminhos[1]))
+
+    def test_bloco_unico_renderizado_sem_pool(self):
+        caminho = os.path.join(self.diretorio.name, "curto.pdf")
+        with mock.patch("src.lct_calculator.helpers.pdf_tabela.ProcessPoolExecutor") as pool:
+            MotorPDFTabela(LayoutTabela(self.colunas), processos=4).gravar(caminho, iter(self.linhas))
+        pool.assert_not_called()
+        self._ler(caminho)
+
+    def test_relatorios_por_edificio(self):
+        geradores = {f"Torre {letra}": ReportGenerator([{"id": 1, "tipo": "sapata"}], f"Torre {letra}", "Eng.")
+                     for letra in "AB"}
+        caminhos = ReportGenerator.gerar_relatorios_paralelo(geradores, self.diretorio.name, max_processos=2)
+        self.assertEqual(sorted(os.path.basename(caminho) for caminho in caminhos.values()),
+                         ["Torre_A.pdf", "Torre_B.pdf"])
+        for caminho in caminhos.values():
+            self._ler(caminho)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import csv
+import math
+import os
+import tempfile
+import unittest
+
+from src.lct_calculator.calculators.sapata import Sapata
+from src.lct_calculator.calculators.tubulão import Tubulao
+from src.lct_calculator.database import DatabaseService
+from src.lct_calculator.services.takeoff_service import MASSA_ESPECIFICA_ACO, TakeoffService
+
+
+class TestTakeoffService(unittest.TestCase):
+    def setUp(self):
+        self.entrada_sapata = {"carga": 500, "fck": 25, "base": 2.0, "altura": 0.6, "capacidade_solo": 200}
+        self.entrada_tubulao = {"carga": 900, "fck": 30, "diametro": 1.0, "altura": 8.0, "tipo": "Céu Aberto",
+                                "escavacao_prof": 8.5, "profundidade_agua": 0}
+        self.sapata = Sapata(**self.entrada_sapata)
+        self.tubulao = Tubulao(**self.entrada_tubulao)
+        self.calculos = [
+            ("sapata", self.entrada_sapata, self.sapata.gerar_relatorio()),
+            ("sapata", self.entrada_sapata, self.sapata.gerar_relatorio()),
+            ("tubulão", self.entrada_tubulao, self.tubulao.gerar_relatorio()),
+            ("bloco", {"fck": 25}, {}),
+        ]
+
+    def test_agregacao(self):
+        levantamento = TakeoffService.agregar(TakeoffService.colunas_de_resultados(self.calculos))
+
+        self.assertEqual([grupo["Classe"] for grupo in levantamento.concreto_por_fck], ["C25", "C30"])
+        self.assertAlmostEqual(levantamento.concreto_por_fck[0]["Volume de Concreto (m³)"],
+                               2 * self.sapata.calcular_volume_concreto())
+
+        # Barras fracionárias arredondadas para cima em cada elemento
+        barras = math.ceil(self.sapata.calcular_armacao()["quantidade_barras"])
+        massa = 2 * barras * 2.0 * MASSA_ESPECIFICA_ACO * math.pi * 0.012 ** 2 / 4
+        aco = {grupo["Diâmetro (mm)"]: grupo for grupo in levantamento.aco_por_diametro}
+        self.assertEqual(aco[12.0]["Barras"], 2 * barras)
+        self.assertAlmostEqual(aco[12.0]["Massa (kg)"], massa)
+        self.assertEqual(levantamento.elementos_com_aco, 3)
+
+        self.assertEqual(levantamento.escavacao_por_tipo, [
+            {"Tipo": "tubulão", "Elementos": 1, "Volume de Escavação (m³)": self.tubulao.calcular_escavacao()}])
+        self.assertEqual(levantamento.elementos, 4)
+
+    def test_exportacao_a_partir_do_banco(self):
+        with tempfile.TemporaryDirectory() as diretorio:
+            db_service = DatabaseService(os.path.join(diretorio, "teste.db"))
+            db_service.salvar_calculos_lote(self.calculos)
+            levantamento = TakeoffService.agregar(TakeoffService.colunas_do_banco(db_service))
+
+            caminho = os.path.join(diretorio, "levantamento.csv")
+            levantamento.gerador_relatorio("Projeto", "Eng.").gerar_relatorio("csv", caminho)
+            with open(caminho, encoding="utf-8") as arquivo:
+                linhas = list(csv.DictReader(arquivo))
+        totais = {linha["Item"]: float(linha["Quantidade"]) for linha in linhas if linha["Grupo"] == "Total"}
+        self.assertAlmostEqual(totais["Escavação"], self.tubulao.calcular_escavacao())
+        self.assertAlmostEqual(totais["Aço"], levantamento.totais["massa_aco"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,224 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+import zipfile
+from unittest import mock
+
+import ifcopenshell.guid
+import ifcopenshell.util.element
+
+from src.lct_calculator.helpers.compression import detectar_compressao
+from src.lct_calculator.helpers.file_helper import FileHelper
+from src.lct_calculator.helpers.ifc_cache import CacheExtracaoIFC
+from src.lct_calculator.helpers.typed_csv_reader import ColunaCSV
+from src.lct_calculator.interfaces.ifc_exporter import IFCExporter
+from src.lct_calculator.interfaces.tqs_data_importer import TQSDataImporter
+
+
+class TestTQSDataImporter(unittest.TestCase):
+    def setUp(self):
+        self.diretorio = tempfile.TemporaryDirectory()
+        self.esquema = [
+            ColunaCSV("Nome", str),
+            ColunaCSV("Largura"),
+            ColunaCSV("Carga", unidade="tf"),
+            ColunaCSV("Estacas", int, obrigatoria=False, padrao=0),
+        ]
+
+    def tearDown(self):
+        self.diretorio.cleanup()
+
+    def _arquivo(self, conteudo, nome="exportacao.csv"):
+        caminho = os.path.join(self.diretorio.name, nome)
+        with open(caminho, "w", encoding="utf-8") as arquivo:
+            arquivo.write(conteudo)
+        return caminho
+
+    def test_iterar_csv_tipado_com_unidades(self):
+        caminho = self._arquivo(
+            'Nome;Largura (cm);Carga;fck\n'
+            '"S1; canto";150,0;10;25\n'
+            'S2;;20,5;25\n'
+            'S3;80;30;25\n'
+        )
+
+        registros = list(TQSDataImporter.iterar_csv(caminho, self.esquema, decimal=","))
+        self.assertEqual([r["Nome"] for r in registros], ["S1; canto", "S2", "S3"])
+        self.assertAlmostEqual(registros[0]["Largura"], 1.5)
+        self.assertTrue(math.isnan(registros[1]["Largura"]))
+        self.assertAlmostEqual(registros[1]["Carga"], 20.5 * 9.80665)
+        self.assertEqual(registros[2]["Estacas"], 0)
+
+        blocos = list(TQSDataImporter.iterar_csv(caminho, self.esquema, tamanho_bloco=2, decimal=","))
+        self.assertEqual([len(bloco["Largura"]) for bloco in blocos], [2, 1])
+        self.assertEqual(blocos[0]["Largura"].dtype.kind, "f")
+
+    def test_iterar_csv_textos_com_cerquilha_virgula_e_longos(self):
+        nome_longo = "Sapata " + "x" * 100
+        caminho = self._arquivo(
+            'Nome;Largura (cm);Carga;Obs\n'
+            'S#1;"150,5";10;"a,b"\n'
+            f'{nome_longo};80;30;c\n'
+        )
+
+        registros = list(TQSDataImporter.iterar_csv(caminho, self.esquema + [ColunaCSV("Obs", str)], decimal=","))
+        self.assertEqual([r["Nome"] for r in registros], ["S#1", nome_longo])
+        self.assertEqual([r["Obs"] for r in registros], ["a,b", "c"])
+        self.assertAlmostEqual(registros[0]["Largura"], 1.505)
+        with self.assertRaises(ValueError):
+            list(TQSDataImporter.iterar_csv(caminho, [ColunaCSV("Nome", str, tamanho=20)], decimal=","))
+
+    def test_colunas_opcionais_ausentes_e_vazias(self):
+        caminho = self._arquivo('Nome;Largura;Carga;Estacas;Obs\nS1;1;10;;\nS2;2;20;4;x\n')
+        esquema = self.esquema + [
+            ColunaCSV("Obs", str, obrigatoria=False, padrao="sem obs"),
+            ColunaCSV("Tipo", str, obrigatoria=False),
+            ColunaCSV("Bloco", str, obrigatoria=False, padrao="B1"),
+            ColunaCSV("Recalque", obrigatoria=False),
+        ]
+
+        bloco, = TQSDataImporter.iterar_csv(caminho, esquema, tamanho_bloco=10)
+        self.assertEqual(bloco["Estacas"].tolist(), [0, 4])
+        self.assertEqual(bloco["Obs"].tolist(), ["sem obs", "x"])
+        self.assertEqual(bloco["Tipo"].tolist(), ["", ""])
+        self.assertEqual(bloco["Bloco"].tolist(), ["B1", "B1"])
+        self.assertTrue(all(math.isnan(valor) for valor in bloco["Recalque"]))
+        with self.assertRaises(ValueError):
+            ColunaCSV("Estacas", int, obrigatoria=False)
+
+    def test_textos_longos_entre_blocos(self):
+        nomes = ["S1", "S" * 40, "S" * 100, "S" * 2000, "S2"]
+        caminho = self._arquivo("Nome;Largura;Carga\n" + "".join(f"{nome};1;1\n" for nome in nomes))
+        registros = list(TQSDataImporter.iterar_csv(caminho, self.esquema[:3], tamanho_bloco=1))
+        self.assertEqual([registro["Nome"] for registro in registros], nomes)
+
+    def test_coluna_obrigatoria_ausente(self):
+        caminho = self._arquivo("Nome,Carga\nS1,10\n")
+        with self.assertRaises(ValueError):
+            list(TQSDataImporter.iterar_csv(caminho, self.esquema))
+
+    def test_iterar_json_em_blocos(self):
+        documento = {"projeto": {"nome": "P1"}, "elementos": [{"id": i, "carga": i * 1.5} for i in range(5)]}
+        caminho = self._arquivo(json.dumps(documento), nome="exportacao.json")
+
+        self.assertEqual(list(TQSDataImporter.iterar_json(caminho, "elementos")), documento["elementos"])
+        blocos = list(TQSDataImporter.iterar_json(caminho, "elementos", tamanho_bloco=2))
+        self.assertEqual([len(bloco) for bloco in blocos], [2, 2, 1])
+        self.assertEqual(TQSDataImporter.carregar_json(caminho), documento)
+
+    def test_cache_de_extracao_ifc(self):
+        modelo = IFCExporter.criar_modelo("Cache")
+        sapata, = IFCExporter.gerar_fundacoes(modelo, [{"tipo": "sapata", "base": 1.5, "altura": 0.6, "x": 3.0}])
+        IFCExporter.gravar_resultados(modelo, {sapata.GlobalId: {"Volume de Concreto (m³)": 1.35}})
+        caminho = os.path.join(self.diretorio.name, "modelo.ifc")
+        modelo.write(caminho)
+        cache = CacheExtracaoIFC(os.path.join(self.diretorio.name, "cache"))
+
+        informacoes = TQSDataImporter.carregar_informacoes_ifc(caminho, cache=cache)
+        self.assertEqual(informacoes[sapata.GlobalId]["Posicao"], [3.0, 0.0, 0.0])
+        self.assertEqual(informacoes[sapata.GlobalId]["Largura"], 1.5)
+        self.assertEqual(informacoes[sapata.GlobalId]["Altura"], 0.6)
+        self.assertEqual(informacoes[sapata.GlobalId]["Propriedades"]["Pset_LCT_Calculo"]["Volume de Concreto (m³)"], 1.35)
+
+        # Modelo inalterado (inclusive apenas tocado): sem nova leitura pelo ifcopenshell
+        os.utime(caminho)
+        with mock.patch("ifcopenshell.open", side_effect=AssertionError("IFC reaberto")):
+            self.assertEqual(TQSDataImporter.carregar_informacoes_ifc(caminho, cache=cache), informacoes)
+
+        # Conteúdo alterado: nova extração
+        IFCExporter.gravar_resultados(modelo, {sapata.GlobalId: {"Volume de Concreto (m³)": 2.0}})
+        modelo.write(caminho)
+        informacoes = TQSDataImporter.carregar_informacoes_ifc(caminho, cache=cache)
+        self.assertEqual(informacoes[sapata.GlobalId]["Propriedades"]["Pset_LCT_Calculo"]["Volume de Concreto (m³)"], 2.0)
+
+    def test_extrair_dimensoes_pela_geometria(self):
+        modelo = IFCExporter.criar_modelo("Geometria")
+        sapata, estaca = IFCExporter.gerar_fundacoes(modelo, [
+            {"tipo": "bloco", "largura": 1.2, "comprimento": 2.4, "altura": 1.0},
+            {"tipo": "estaca", "diametro": 0.4, "comprimento": 12.0},
+        ])
+        chamadas = []
+
+        dimensoes = TQSDataImporter.extrair_dimensoes_ifc(modelo, progresso=lambda n, total: chamadas.append((n, total)))
+        self.assertEqual(dimensoes[sapata.GlobalId], {"Largura": 1.2, "Comprimento": 2.4, "Altura": 1.0})
+        self.assertAlmostEqual(dimensoes[estaca.GlobalId]["Altura"], 12.0)
+        self.assertAlmostEqual(dimensoes[estaca.GlobalId]["Largura"], 0.4, places=2)
+        self.assertEqual(chamadas[-1], (2, 2))
+
+    def test_extrair_relacoes_indexadas(self):
+        modelo = IFCExporter.criar_modelo("Relações")
+        sapata, estaca = IFCExporter.gerar_fundacoes(modelo, [
+            {"tipo": "sapata", "base": 1.5, "altura": 0.6},
+            {"tipo": "estaca", "diametro": 0.4, "comprimento": 12.0},
+        ])
+        pilar = modelo.create_entity("IfcColumn", GlobalId=ifcopenshell.guid.new(), Name="P1")
+        modelo.create_entity("IfcRelConnectsElements", GlobalId=ifcopenshell.guid.new(),
+                             RelatingElement=sapata, RelatedElement=pilar)
+        solto = modelo.create_entity("IfcColumn", GlobalId=ifcopenshell.guid.new(), Name="P2")
+        concreto = modelo.create_entity("IfcMaterial", Name="Concreto C30")
+        modelo.create_entity("IfcRelAssociatesMaterial", GlobalId=ifcopenshell.guid.new(),
+                             RelatedObjects=[sapata, pilar], RelatingMaterial=concreto)
+        IFCExporter.gravar_resultados(modelo, {sapata.GlobalId: {"Volume de Concreto (m³)": 1.35}})
+
+        informacoes = TQSDataImporter.extrair_informacoes_ifc(modelo)
+        self.assertEqual(set(informacoes), {sapata.GlobalId, estaca.GlobalId, pilar.GlobalId})
+        self.assertNotIn(solto.GlobalId, informacoes)
+        self.assertEqual(informacoes[sapata.GlobalId]["Materiais"], ["Concreto C30"])
+        self.assertEqual(informacoes[pilar.GlobalId]["Materiais"], ["Concreto C30"])
+        self.assertEqual(informacoes[estaca.GlobalId]["Pavimento"], "Fundações")
+        self.assertEqual(informacoes[pilar.GlobalId]["Largura"], 'N/A')
+        self.assertEqual(informacoes[sapata.GlobalId]["Propriedades"],
+                         ifcopenshell.util.element.get_psets(sapata))
+
+    def test_arquivos_comprimidos(self):
+        dados = [{"Nome": "S1", "Largura": "150"}, {"Nome": "S2", "Largura": "80"}]
+        for nome, formato in (("dados.csv.gz", "gzip"), ("dados.csv.bz2", "bz2"), ("dados.csv.xz", "xz"),
+                              ("dados.csv.zip", "zip")):
+            caminho = os.path.join(self.diretorio.name, nome)
+            FileHelper.salvar_arquivo(caminho, dados, formato="csv")
+            self.assertEqual(detectar_compressao(caminho), formato)
+            self.assertEqual(FileHelper.carregar_arquivo(caminho), dados)
+            self.assertEqual(TQSDataImporter.carregar_csv(caminho), dados)
+            registros = list(TQSDataImporter.iterar_csv(caminho, [ColunaCSV("Largura", unidade="cm")]))
+            self.assertEqual([r["Largura"] for r in registros], [1.5, 0.8])
+
+        # Compressão detectada pelo conteúdo, não pela extensão
+        caminho = os.path.join(self.diretorio.name, "exportacao.json")
+        FileHelper.salvar_arquivo(caminho, {"elementos": dados}, compressao="gzip")
+        self.assertEqual(TQSDataImporter.carregar_json(caminho), {"elementos": dados})
+        self.assertEqual(list(TQSDataImporter.iterar_json(caminho, "elementos")), dados)
+
+        modelo = IFCExporter.criar_modelo("Comprimido")
+        estaca, = IFCExporter.gerar_fundacoes(modelo, [{"tipo": "estaca", "diametro": 0.4, "comprimento": 10.0}])
+        caminho = os.path.join(self.diretorio.name, "modelo.ifczip")
+        with zipfile.ZipFile(caminho, "w", zipfile.ZIP_DEFLATED) as arquivo_zip:
+            arquivo_zip.writestr("modelo.ifc", modelo.to_string())
+        self.assertEqual(TQSDataImporter.carregar_dados_ifc(caminho).by_guid(estaca.GlobalId).Name, "estaca 1")
+
+    def test_csv_indexado_acesso_aleatorio(self):
+        linhas = "".join(f"S{i};{i * 10}\n" for i in range(1000))
+        caminho = self._arquivo("Nome;Carga\n" + linhas)
+
+        with TQSDataImporter.abrir_csv_indexado(caminho) as leitor:
+            self.assertEqual(len(leitor), 1000)
+            self.assertEqual(leitor[500], {"Nome": "S500", "Carga": "5000"})
+            self.assertEqual(leitor[-1]["Nome"], "S999")
+            self.assertEqual([r["Nome"] for r in leitor[10:13]], ["S10", "S11", "S12"])
+            inicio, fim = leitor.intervalo_bytes(*leitor.particoes(4)[1])
+        with open(caminho, "rb") as arquivo:
+            arquivo.seek(inicio)
+            trecho = arquivo.read(fim - inicio).decode().splitlines()
+        self.assertEqual((trecho[0], trecho[-1]), ("S250;2500", "S499;4990"))
+
+        # Índice persistido é reaproveitado; arquivo alterado invalida o índice
+        self.assertTrue(os.path.exists(caminho + ".idx.npy"))
+        with open(caminho, "a", encoding="utf-8") as arquivo:
+            arquivo.write("S1000;10000")
+        with TQSDataImporter.abrir_csv_indexado(caminho) as leitor:
+            self.assertEqual(leitor[-1], {"Nome": "S1000", "Carga": "10000"})
+
+
+if __name__ == '__main__':
+    unittest.main()